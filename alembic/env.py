@@ -7,7 +7,7 @@ from sqlalchemy import pool
 from alembic import context
 
 from src.core.config import settings
-from src.models import Base, Client, Payment  # Import all models for autogenerate
+from src.models import Base, Client, DeadLetter, MonthlySummary, OutboxEvent, Payment, ReminderDelivery  # Import all models for autogenerate
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
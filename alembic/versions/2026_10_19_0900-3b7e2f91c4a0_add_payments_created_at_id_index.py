@@ -0,0 +1,25 @@
+"""Add payments (created_at, id) index
+
+Revision ID: 3b7e2f91c4a0
+Revises: 10d03d55a001
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e2f91c4a0'
+down_revision: Union[str, None] = '10d03d55a001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_payments_created_at_id', 'payments', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payments_created_at_id', table_name='payments')
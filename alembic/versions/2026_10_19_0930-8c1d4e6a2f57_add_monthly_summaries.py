@@ -0,0 +1,54 @@
+"""Add monthly_summaries table
+
+Revision ID: 8c1d4e6a2f57
+Revises: 3b7e2f91c4a0
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1d4e6a2f57'
+down_revision: Union[str, None] = '3b7e2f91c4a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('monthly_summaries',
+    sa.Column('condo', sa.String(length=255), nullable=False),
+    sa.Column('month_ref', sa.String(length=7), nullable=False, comment='Format: YYYY-MM'),
+    sa.Column('billed_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('billed_amount', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'),
+    sa.Column('paid_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('paid_amount', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0', comment='Amount collected'),
+    sa.Column('pending_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('expired_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('condo', 'month_ref')
+    )
+
+    # Backfill from existing payments
+    op.execute(
+        """
+        INSERT INTO monthly_summaries (
+            condo, month_ref, billed_count, billed_amount, paid_count,
+            paid_amount, pending_count, expired_count
+        )
+        SELECT c.condo, p.month_ref, count(*), coalesce(sum(p.amount), 0),
+               count(*) FILTER (WHERE p.status = 'approved'),
+               coalesce(sum(p.amount) FILTER (WHERE p.status = 'approved'), 0),
+               count(*) FILTER (WHERE p.status = 'pending'),
+               count(*) FILTER (WHERE p.status = 'expired')
+        FROM payments p JOIN clients c ON c.id = p.client_id
+        GROUP BY c.condo, p.month_ref
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('monthly_summaries')
@@ -0,0 +1,28 @@
+"""Add payments pix_code and pix_expires_at
+
+Revision ID: 5e9a7c3b1d24
+Revises: 8c1d4e6a2f57
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a7c3b1d24'
+down_revision: Union[str, None] = '8c1d4e6a2f57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('payments', sa.Column('pix_code', sa.Text(), nullable=True, comment='PIX copy-paste code'))
+    op.add_column('payments', sa.Column('pix_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('payments', 'pix_expires_at')
+    op.drop_column('payments', 'pix_code')
@@ -0,0 +1,28 @@
+"""Add payments qr_media_id and qr_media_uploaded_at
+
+Revision ID: a4f2d8e6b913
+Revises: 5e9a7c3b1d24
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f2d8e6b913'
+down_revision: Union[str, None] = '5e9a7c3b1d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('payments', sa.Column('qr_media_id', sa.String(length=255), nullable=True, comment='WhatsApp media ID of the PIX QR image'))
+    op.add_column('payments', sa.Column('qr_media_uploaded_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('payments', 'qr_media_uploaded_at')
+    op.drop_column('payments', 'qr_media_id')
@@ -0,0 +1,145 @@
+"""Partition payments by month_ref
+
+Turns ``payments`` into a table partitioned by LIST (month_ref), one
+partition per month (``payments_YYYY_MM``) plus ``payments_default`` for
+anything without one. The primary key becomes (id, month_ref) and the
+request_id unique index becomes (request_id, month_ref), as Postgres
+requires the partition key in every unique constraint; ids still come from
+the same sequence and stay globally unique.
+
+``ensure_payments_partition(month_ref)`` creates a month's partition,
+moving any rows that already landed in the default partition. The
+scheduler calls it for the current and next month.
+
+Revision ID: e7b3c9d1f482
+Revises: a4f2d8e6b913
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3c9d1f482'
+down_revision: Union[str, None] = 'a4f2d8e6b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_payments_client_id', ['client_id'], False),
+    ('ix_payments_month_ref', ['month_ref'], False),
+    ('ix_payments_mp_payment_id', ['mp_payment_id'], False),
+    ('ix_payments_status', ['status'], False),
+    ('ix_payments_created_at_id', ['created_at', 'id'], False),
+]
+
+ENSURE_PARTITION_FUNCTION = r"""
+CREATE OR REPLACE FUNCTION ensure_payments_partition(p_month_ref text)
+RETURNS boolean
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    partition_name text := 'payments_' || replace(p_month_ref, '-', '_');
+BEGIN
+    IF p_month_ref !~ '^\d{4}-\d{2}$' THEN
+        RAISE EXCEPTION 'invalid month_ref: %', p_month_ref;
+    END IF;
+
+    -- Serialize concurrent callers
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_payments_partition'));
+
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE payments INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        partition_name
+    );
+    -- Rows written before the partition existed sit in the default partition
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM payments_default WHERE month_ref = %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        p_month_ref, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE payments ATTACH PARTITION %I FOR VALUES IN (%L)',
+        partition_name, p_month_ref
+    );
+    RETURN true;
+END
+$$;
+"""
+
+
+def _current_and_next_month() -> list[str]:
+    now = datetime.now(timezone.utc)
+    following = (now.year + 1, 1) if now.month == 12 else (now.year, now.month + 1)
+    return [f"{now.year:04d}-{now.month:02d}", f"{following[0]:04d}-{following[1]:02d}"]
+
+
+def upgrade() -> None:
+    # Keep the old table (and its sequence) aside while the new one is built
+    op.rename_table('payments', 'payments_unpartitioned')
+    op.execute('ALTER TABLE payments_unpartitioned RENAME CONSTRAINT payments_pkey TO payments_unpartitioned_pkey')
+    for name, _, _ in INDEXES:
+        op.drop_index(name, table_name='payments_unpartitioned')
+    op.drop_index('ix_payments_request_id', table_name='payments_unpartitioned')
+
+    op.execute(
+        'CREATE TABLE payments '
+        '(LIKE payments_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS) '
+        'PARTITION BY LIST (month_ref)'
+    )
+    op.create_primary_key('payments_pkey', 'payments', ['id', 'month_ref'])
+    op.create_foreign_key(
+        'payments_client_id_fkey', 'payments', 'clients', ['client_id'], ['id'], ondelete='CASCADE'
+    )
+    for name, columns, unique in INDEXES:
+        op.create_index(name, 'payments', columns, unique=unique)
+    op.create_index('ix_payments_request_id', 'payments', ['request_id', 'month_ref'], unique=True)
+    op.execute('ALTER SEQUENCE payments_id_seq OWNED BY payments.id')
+
+    op.execute('CREATE TABLE payments_default PARTITION OF payments DEFAULT')
+    op.execute(ENSURE_PARTITION_FUNCTION)
+
+    months = {
+        row[0]
+        for row in op.get_bind().execute(sa.text('SELECT DISTINCT month_ref FROM payments_unpartitioned'))
+    }
+    months.update(_current_and_next_month())
+    for month_ref in sorted(months):
+        op.execute(sa.text('SELECT ensure_payments_partition(:m)').bindparams(m=month_ref))
+
+    op.execute('INSERT INTO payments SELECT * FROM payments_unpartitioned')
+    op.drop_table('payments_unpartitioned')
+
+
+def downgrade() -> None:
+    op.rename_table('payments', 'payments_partitioned')
+    op.execute('ALTER TABLE payments_partitioned RENAME CONSTRAINT payments_pkey TO payments_partitioned_pkey')
+    for name, _, _ in INDEXES:
+        op.drop_index(name, table_name='payments_partitioned')
+    op.drop_index('ix_payments_request_id', table_name='payments_partitioned')
+
+    op.execute(
+        'CREATE TABLE payments '
+        '(LIKE payments_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS)'
+    )
+    op.execute('INSERT INTO payments SELECT * FROM payments_partitioned')
+    op.create_primary_key('payments_pkey', 'payments', ['id'])
+    op.create_foreign_key(
+        'payments_client_id_fkey', 'payments', 'clients', ['client_id'], ['id'], ondelete='CASCADE'
+    )
+    for name, columns, unique in INDEXES:
+        op.create_index(name, 'payments', columns, unique=unique)
+    op.create_index('ix_payments_request_id', 'payments', ['request_id'], unique=True)
+    op.execute('ALTER SEQUENCE payments_id_seq OWNED BY payments.id')
+
+    op.drop_table('payments_partitioned')  # drops every partition with it
+    op.execute('DROP FUNCTION ensure_payments_partition(text)')
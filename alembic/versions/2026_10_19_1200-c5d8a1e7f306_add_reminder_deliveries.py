@@ -0,0 +1,41 @@
+"""Add reminder_deliveries table
+
+Revision ID: c5d8a1e7f306
+Revises: e7b3c9d1f482
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8a1e7f306'
+down_revision: Union[str, None] = 'e7b3c9d1f482'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('reminder_deliveries',
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('month_ref', sa.String(length=7), nullable=False, comment='Format: YYYY-MM'),
+    sa.Column('status', sa.String(length=20), nullable=False, server_default='pending', comment='pending, sending, sent, failed, skipped'),
+    sa.Column('template', sa.String(length=255), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('message_id', sa.String(length=255), nullable=True, comment='WhatsApp message ID'),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('client_id', 'month_ref')
+    )
+    op.create_index('ix_reminder_deliveries_month_ref_status', 'reminder_deliveries', ['month_ref', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reminder_deliveries_month_ref_status', table_name='reminder_deliveries')
+    op.drop_table('reminder_deliveries')
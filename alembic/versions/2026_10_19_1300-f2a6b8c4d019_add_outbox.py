@@ -0,0 +1,41 @@
+"""Add outbox table
+
+Revision ID: f2a6b8c4d019
+Revises: c5d8a1e7f306
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6b8c4d019'
+down_revision: Union[str, None] = 'c5d8a1e7f306'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False, comment='Handler name, e.g. payment_confirmation'),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False, server_default='pending', comment='pending, processing, done, failed'),
+    sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_available_at', 'outbox', ['available_at'], unique=False, postgresql_where=sa.text("status IN ('pending', 'processing')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_available_at', table_name='outbox', postgresql_where=sa.text("status IN ('pending', 'processing')"))
+    op.drop_table('outbox')
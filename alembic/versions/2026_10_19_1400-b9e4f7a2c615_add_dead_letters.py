@@ -0,0 +1,43 @@
+"""Add dead_letters table
+
+Revision ID: b9e4f7a2c615
+Revises: f2a6b8c4d019
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4f7a2c615'
+down_revision: Union[str, None] = 'f2a6b8c4d019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('dead_letters',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('source', sa.String(length=50), nullable=False, comment='mercadopago, whatsapp'),
+    sa.Column('event_key', sa.String(length=255), nullable=False, comment='Notification or message ID'),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('error', sa.Text(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False, server_default='1'),
+    sa.Column('status', sa.String(length=20), nullable=False, server_default='pending', comment='pending, resolved, discarded'),
+    sa.Column('request_id', sa.String(length=100), nullable=True),
+    sa.Column('last_failed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'event_key', name='uq_dead_letters_source_event_key')
+    )
+    op.create_index('ix_dead_letters_status_source', 'dead_letters', ['status', 'source'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dead_letters_status_source', table_name='dead_letters')
+    op.drop_table('dead_letters')
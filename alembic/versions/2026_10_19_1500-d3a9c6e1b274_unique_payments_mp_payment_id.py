@@ -0,0 +1,45 @@
+"""Make mp_payment_id unique per month
+
+Replaces the plain ``ix_payments_mp_payment_id`` index with a unique index
+on (mp_payment_id, month_ref), so two requests recording the same Mercado
+Pago charge cannot both insert it. The partition key is part of the index
+as Postgres requires; a charge always belongs to the month it was created
+for. NULLs (local fallback PIX) stay allowed any number of times.
+
+Revision ID: d3a9c6e1b274
+Revises: b9e4f7a2c615
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a9c6e1b274'
+down_revision: Union[str, None] = 'b9e4f7a2c615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT mp_payment_id, month_ref, count(*) FROM payments "
+        "WHERE mp_payment_id IS NOT NULL "
+        "GROUP BY mp_payment_id, month_ref HAVING count(*) > 1"
+    )).fetchall()
+    if duplicates:
+        raise RuntimeError(
+            "Payments share a Mercado Pago payment ID; resolve them before upgrading: "
+            + ", ".join(f"{row[0]} ({row[1]}, {row[2]} rows)" for row in duplicates)
+        )
+
+    op.drop_index('ix_payments_mp_payment_id', table_name='payments')
+    op.create_index('ix_payments_mp_payment_id', 'payments', ['mp_payment_id', 'month_ref'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payments_mp_payment_id', table_name='payments')
+    op.create_index('ix_payments_mp_payment_id', 'payments', ['mp_payment_id'], unique=False)
@@ -0,0 +1,29 @@
+"""Add available_at to reminder_deliveries
+
+Failed reminders wait until ``available_at`` (exponential backoff) before
+they are claimed again, instead of being re-sent right away.
+
+Revision ID: a7c2e5f9d318
+Revises: d3a9c6e1b274
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c2e5f9d318'
+down_revision: Union[str, None] = 'd3a9c6e1b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('reminder_deliveries', sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Not claimed before this time (retry backoff)'))
+
+
+def downgrade() -> None:
+    op.drop_column('reminder_deliveries', 'available_at')
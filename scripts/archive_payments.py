@@ -0,0 +1,69 @@
+"""Archive closed months of payments to compressed files, or restore them.
+
+Usage:
+    python scripts/archive_payments.py archive 2025-01 [2025-02 ...]
+    python scripts/archive_payments.py archive 2025-01 --keep        # export only
+    python scripts/archive_payments.py archive 2025-01 --detach-only # keep detached table
+    python scripts/archive_payments.py verify 2025-01
+    python scripts/archive_payments.py restore 2025-01
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import settings
+from src.services.archive_service import ArchiveError, payment_archiver
+
+
+def main() -> int:
+    """Run the requested archive command for each month."""
+    parser = argparse.ArgumentParser(description="Archive or restore months of payments")
+    parser.add_argument("command", choices=["archive", "verify", "restore"])
+    parser.add_argument("months", nargs="+", help="Month references (YYYY-MM)")
+    parser.add_argument("--dir", default=settings.archive_dir, help="Archive directory")
+    parser.add_argument("--keep", action="store_true", help="Archive without removing from Postgres")
+    parser.add_argument(
+        "--detach-only",
+        action="store_true",
+        help="Detach the month's partition instead of dropping it",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Archive open months or months with pending payments",
+    )
+    args = parser.parse_args()
+
+    directory = Path(args.dir)
+    failed = 0
+    for month_ref in args.months:
+        _, manifest_path = payment_archiver.paths(directory, month_ref)
+        try:
+            if args.command == "archive":
+                manifest = payment_archiver.archive_month(
+                    month_ref,
+                    directory,
+                    prune=not args.keep,
+                    detach_only=args.detach_only,
+                    force=args.force,
+                )
+                print(json.dumps(manifest, indent=2))
+            elif args.command == "verify":
+                manifest = payment_archiver.verify_archive(manifest_path)
+                print(f"✅ {month_ref}: {manifest['rows']} rows, checksum OK")
+            else:
+                rows = payment_archiver.restore_month(manifest_path)
+                print(f"✅ {month_ref}: restored {rows} rows")
+        except (ArchiveError, FileNotFoundError) as e:
+            print(f"❌ {month_ref}: {e}")
+            failed += 1
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
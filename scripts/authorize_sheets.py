@@ -0,0 +1,41 @@
+"""Authorize Google Sheets access with OAuth (development alternative).
+
+Opens a browser once to authorize the OAuth client in
+GOOGLE_SHEETS_CREDENTIALS_FILE and saves the resulting token to
+GOOGLE_SHEETS_TOKEN_FILE. The application only reads (and refreshes in the
+background) that token; it never starts an interactive flow itself.
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from google_auth_oauthlib.flow import InstalledAppFlow
+
+from src.core.config import settings
+from src.services.sheets_credentials import SCOPES
+
+
+def authorize() -> None:
+    """Run the OAuth installed-app flow and save the token."""
+    credentials_file = settings.google_sheets_credentials_file
+    token_file = settings.google_sheets_token_file
+
+    if not os.path.exists(credentials_file):
+        print(f"❌ Error: OAuth client file not found: {credentials_file}")
+        print("\nPlease follow the setup guide in docs/GOOGLE_SHEETS_SETUP.md")
+        sys.exit(1)
+
+    flow = InstalledAppFlow.from_client_secrets_file(credentials_file, SCOPES)
+    creds = flow.run_local_server(port=0)
+
+    with open(token_file, "w") as token:
+        token.write(creds.to_json())
+
+    print(f"✅ Token saved to {token_file}")
+
+
+if __name__ == "__main__":
+    authorize()
@@ -0,0 +1,66 @@
+"""
+BR Code benchmark.
+
+Generates and parses PIX payloads with ``src.utils.brcode`` and reports
+codes per second for each operation. Output is JSON.
+
+Usage:
+    python scripts/bench_brcode.py --count 20000 --min-rate 5000
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import brcode
+
+
+def measure(label: str, func, count: int) -> dict:
+    """Run ``func(i)`` ``count`` times and return the rate."""
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    elapsed = time.perf_counter() - start
+    return {"operation": label, "count": count, "per_second": round(count / elapsed)}
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="BR Code benchmark")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--min-rate", type=float, help="Fail if any operation is slower than this")
+    args = parser.parse_args()
+
+    sample = brcode.build(
+        "Condominio Exemplo", "Sao Paulo", url="pix.example.com/qr/v2/abc123", amount=70
+    )
+    payload = sample.encode()
+
+    results = [
+        measure(
+            "build_static",
+            lambda i: brcode.build(
+                "Condominio Exemplo",
+                "Sao Paulo",
+                key="123e4567-e12b-12d1-a456-426655440000",
+                amount=70 + i % 30,
+                txid=f"req{i}",
+            ),
+            args.count,
+        ),
+        measure("parse", lambda i: brcode.parse(sample), args.count),
+        measure("crc16", lambda i: brcode.crc16(payload), args.count),
+    ]
+    print(json.dumps(results, indent=2))
+
+    if args.min_rate is not None and any(r["per_second"] < args.min_rate for r in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Startup import-time benchmark.
+
+Imports ``src.main`` in fresh interpreters with ``-X importtime`` and reports
+wall time, the cumulative import time of ``src.main``, the slowest modules
+and whether any module that should be imported lazily slipped back into the
+startup path. Output is JSON.
+
+Usage:
+    python scripts/bench_startup.py --runs 5 --max-ms 1500
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Provider modules that must only be imported on first use or at startup
+LAZY_MODULES = [
+    "googleapiclient.discovery",
+    "google_auth_oauthlib",
+    "google.oauth2.service_account",
+]
+
+CHECK_LAZY = (
+    "import sys, json, src.main; "
+    f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+)
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Parse ``-X importtime`` output into {module: cumulative microseconds}."""
+    cumulative: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            _, cumulative_us, name = line[len("import time:"):].split("|")
+            cumulative[name.strip()] = int(cumulative_us)
+        except ValueError:
+            continue
+    return cumulative
+
+
+def run_once() -> tuple[float, dict[str, int]]:
+    """Import src.main in a fresh interpreter."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return (time.perf_counter() - start) * 1000, parse_importtime(result.stderr)
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Startup import-time benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--max-ms", type=float, help="Fail if median import time exceeds this")
+    args = parser.parse_args()
+
+    run_once()  # warm the filesystem and bytecode caches
+
+    walls: list[float] = []
+    imports: list[float] = []
+    last: dict[str, int] = {}
+    for _ in range(args.runs):
+        wall_ms, last = run_once()
+        walls.append(wall_ms)
+        imports.append(last.get("src.main", 0) / 1000)
+
+    eager = json.loads(
+        subprocess.run(
+            [sys.executable, "-c", CHECK_LAZY],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    )
+
+    slowest = sorted(last.items(), key=lambda item: item[1], reverse=True)[: args.top]
+    report = {
+        "runs": args.runs,
+        "wall_ms_median": round(statistics.median(walls), 1),
+        "import_ms_median": round(statistics.median(imports), 1),
+        "import_ms_min": round(min(imports), 1),
+        "slowest_modules_ms": {name: round(us / 1000, 1) for name, us in slowest},
+        "eager_lazy_modules": eager,
+    }
+    print(json.dumps(report, indent=2))
+
+    if eager:
+        return 1
+    if args.max_ms is not None and report["import_ms_median"] > args.max_ms:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
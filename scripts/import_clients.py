@@ -0,0 +1,50 @@
+"""Import clients from a CSV file (name, phone, condo, block, apartment).
+
+Usage:
+    python scripts/import_clients.py moradores.csv
+    python scripts/import_clients.py moradores.csv --condo "Residencial Sol"   # fills blank condo
+    python scripts/import_clients.py moradores.csv --dry-run                   # report only
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.client_import import ClientImportError, client_importer
+
+
+def main() -> int:
+    """Import the file and print the result."""
+    parser = argparse.ArgumentParser(description="Bulk import clients from CSV")
+    parser.add_argument("file", type=Path, help="CSV file (UTF-8, with header)")
+    parser.add_argument("--condo", help="Condo for rows that leave it blank")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change, then roll back")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        with args.file.open(encoding="utf-8-sig", newline="") as f:
+            result = client_importer.import_csv(f, default_condo=args.condo, dry_run=args.dry_run)
+    except (ClientImportError, OSError, UnicodeDecodeError) as e:
+        print(f"❌ {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    prefix = "🔎 Dry run:" if args.dry_run else "✅"
+    print(
+        f"{prefix} {result.total} rows in {elapsed:.2f}s — {result.inserted} inserted, "
+        f"{result.updated} updated, {result.unchanged} unchanged, {result.rejected} rejected"
+    )
+    if result.errors:
+        print(json.dumps(result.errors, indent=2, ensure_ascii=False))
+        if result.rejected > len(result.errors):
+            print(f"... and {result.rejected - len(result.errors)} more")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+End-to-end load test harness.
+
+Starts fake Graph API, Mercado Pago and Google Sheets servers, boots the
+application against them (or targets one already running) and drives three
+scenarios: full conversations, PIX creation bursts and approval webhook
+storms. Prints throughput and p50/p95/p99 latency as JSON.
+
+The application still needs a migrated Postgres (DB_* environment variables).
+
+Usage:
+    python -m scripts.loadtest --conversations 50 --pix 200 --latency-ms 80
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+import uvicorn
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from scripts.loadtest.fakes import (
+    FakeConfig,
+    create_graph_app,
+    create_mercadopago_app,
+    create_sheets_app,
+)
+from scripts.loadtest.scenarios import run_approval_storm, run_conversations, run_pix_burst
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="PIX WhatsApp load test harness")
+    parser.add_argument("--app-url", help="Target a running app instead of starting one")
+    parser.add_argument("--app-port", type=int, default=0, help="Port for the spawned app")
+    parser.add_argument("--conversations", type=int, default=20, help="Virtual users")
+    parser.add_argument("--pix", type=int, default=50, help="POST /pix/create requests")
+    parser.add_argument("--duplicates", type=int, default=3, help="Webhooks per payment")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fake provider latency")
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0.0 - 1.0")
+    parser.add_argument("--mp-latency-ms", type=float, help="Override latency for Mercado Pago")
+    parser.add_argument("--sheets-latency-ms", type=float, help="Override latency for Sheets")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--seed", type=int, help="Random seed")
+    return parser.parse_args()
+
+
+def free_port() -> int:
+    """Ask the OS for an unused TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def write_service_account(path: Path, token_uri: str) -> None:
+    """Write a throwaway service account key whose token URI is the fake."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    path.write_text(
+        json.dumps(
+            {
+                "type": "service_account",
+                "project_id": "loadtest",
+                "private_key_id": "loadtest",
+                "private_key": pem,
+                "client_email": "loadtest@loadtest.iam.gserviceaccount.com",
+                "client_id": "0",
+                "token_uri": token_uri,
+            }
+        )
+    )
+
+
+async def start_fake(app: Any, port: int) -> uvicorn.Server:
+    """Serve a fake app on ``port`` in the current event loop."""
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    )
+    asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server
+
+
+async def wait_healthy(url: str, process: subprocess.Popen | None, timeout: float = 60) -> None:
+    """Poll ``/health`` until the app answers."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"App exited with code {process.returncode}")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise TimeoutError(f"App at {url} did not become healthy")
+
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the harness and return the report."""
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    base = FakeConfig(args.latency_ms, args.jitter_ms, args.error_rate)
+    mp_config = FakeConfig(
+        args.mp_latency_ms if args.mp_latency_ms is not None else args.latency_ms,
+        args.jitter_ms,
+        args.error_rate,
+    )
+    sheets_config = FakeConfig(
+        args.sheets_latency_ms if args.sheets_latency_ms is not None else args.latency_ms,
+        args.jitter_ms,
+        args.error_rate,
+    )
+
+    fakes = {
+        "graph": create_graph_app(base),
+        "mercadopago": create_mercadopago_app(mp_config),
+        "sheets": create_sheets_app(sheets_config),
+    }
+    ports = {name: free_port() for name in fakes}
+    servers = [await start_fake(app, ports[name]) for name, app in fakes.items()]
+
+    process = None
+    workdir = tempfile.TemporaryDirectory(prefix="loadtest_")
+    app_url = args.app_url
+
+    try:
+        if not app_url:
+            credentials_file = Path(workdir.name) / "credentials.json"
+            write_service_account(credentials_file, f"http://127.0.0.1:{ports['sheets']}/token")
+            app_port = args.app_port or free_port()
+            app_url = f"http://127.0.0.1:{app_port}"
+            env = {
+                **os.environ,
+                "APP_ENV": "loadtest",
+                "DEBUG": "false",
+                "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+                "BASE_URL": app_url,
+                "WHATSAPP_API_URL": f"http://127.0.0.1:{ports['graph']}",
+                "WHATSAPP_PHONE_NUMBER_ID": "loadtest",
+                "WHATSAPP_ACCESS_TOKEN": "loadtest",
+                "MERCADOPAGO_ACCESS_TOKEN": "loadtest",
+                "MERCADOPAGO_API_URL": f"http://127.0.0.1:{ports['mercadopago']}/v1",
+                "GOOGLE_SHEETS_API_ENDPOINT": f"http://127.0.0.1:{ports['sheets']}/",
+                "GOOGLE_SHEETS_CREDENTIALS_FILE": str(credentials_file),
+                "GOOGLE_SHEETS_SPREADSHEET_ID": "loadtest",
+            }
+            process = subprocess.Popen(
+                [
+                    sys.executable, "-m", "uvicorn", "src.main:app",
+                    "--host", "127.0.0.1", "--port", str(app_port),
+                    "--log-level", "warning", "--no-access-log",
+                ],
+                cwd=ROOT_DIR,
+                env=env,
+            )
+
+        await wait_healthy(app_url, process)
+
+        # Unique phones per run so clients and payments never collide
+        run_id = random.randint(0, 9999)
+        limits = httpx.Limits(max_connections=args.concurrency * 2)
+        async with httpx.AsyncClient(base_url=app_url, timeout=120, limits=limits) as client:
+            scenarios: dict[str, Any] = {}
+
+            scenarios["conversation"] = await run_conversations(
+                client, args.conversations, args.concurrency, f"5591{run_id:04d}"
+            )
+
+            pix_summary, _ = await run_pix_burst(
+                client, args.pix, args.concurrency, f"5592{run_id:04d}"
+            )
+            scenarios["pix_burst"] = pix_summary
+
+            # Approve every charge the fake knows about, including conversation ones
+            async with httpx.AsyncClient() as fake_client:
+                listing = await fake_client.get(
+                    f"http://127.0.0.1:{ports['mercadopago']}/_fake/payments"
+                )
+            scenarios["approval_storm"] = await run_approval_storm(
+                client, listing.json()["ids"], args.duplicates, args.concurrency
+            )
+
+        return {
+            "config": {
+                "app_url": app_url,
+                "conversations": args.conversations,
+                "pix": args.pix,
+                "duplicates": args.duplicates,
+                "concurrency": args.concurrency,
+                "latency_ms": args.latency_ms,
+                "mp_latency_ms": mp_config.latency_ms,
+                "sheets_latency_ms": sheets_config.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "error_rate": args.error_rate,
+            },
+            "scenarios": scenarios,
+            "fakes": {name: app.state.stats.as_dict() for name, app in fakes.items()},
+        }
+
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        for server in servers:
+            server.should_exit = True
+        await asyncio.sleep(0.2)
+        workdir.cleanup()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = asyncio.run(main(arguments))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if arguments.output:
+        Path(arguments.output).write_text(output + "\n")
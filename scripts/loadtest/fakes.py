@@ -0,0 +1,241 @@
+"""Fake Graph API, Mercado Pago and Google Sheets servers for load tests.
+
+Each fake is a small ASGI app that mimics just enough of the real API for the
+application to run end-to-end. Latency and error rate are configurable so the
+harness can reproduce slow or flaky providers.
+"""
+import asyncio
+import itertools
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+from src.utils import brcode
+
+# Header row written by scripts/setup_sheets.py
+SHEET_HEADERS = [
+    "request_id", "nome", "telefone", "condominio", "bloco", "apartamento",
+    "mes", "valor", "status", "data_criacao", "data_pagamento", "mp_payment_id",
+]
+
+
+@dataclass
+class FakeConfig:
+    """Behaviour knobs shared by every fake server."""
+
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+
+
+@dataclass
+class FakeStats:
+    """Counters collected by a fake server."""
+
+    requests: int = 0
+    injected_errors: int = 0
+    by_route: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return counters as a JSON-serializable dict."""
+        return {
+            "requests": self.requests,
+            "injected_errors": self.injected_errors,
+            "by_route": dict(self.by_route),
+        }
+
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+")
+
+
+def _install_behaviour(app: FastAPI, config: FakeConfig, stats: FakeStats) -> None:
+    """Add latency and error injection to every route of a fake app."""
+
+    @app.middleware("http")
+    async def behaviour(
+        request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        stats.requests += 1
+        route = f"{request.method} {_NUMERIC_SEGMENT.sub('/{id}', request.url.path)}"
+        stats.by_route[route] = stats.by_route.get(route, 0) + 1
+
+        delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if request.url.path.startswith("/_fake") or random.random() >= config.error_rate:
+            return await call_next(request)
+
+        stats.injected_errors += 1
+        return JSONResponse(
+            status_code=random.choice([500, 502, 503]),
+            content={"error": {"message": "injected failure"}},
+        )
+
+
+def create_graph_app(config: FakeConfig) -> FastAPI:
+    """Create a fake WhatsApp Cloud (Graph) API."""
+    app = FastAPI()
+    app.state.stats = FakeStats()
+    _install_behaviour(app, config, app.state.stats)
+    counter = itertools.count(1)
+
+    @app.post("/{phone_number_id}/messages")
+    async def send_message(phone_number_id: str, request: Request) -> dict:
+        payload = await request.json()
+        if payload.get("status") == "read":
+            return {"success": True}
+        return {
+            "messaging_product": "whatsapp",
+            "contacts": [{"input": payload.get("to"), "wa_id": payload.get("to")}],
+            "messages": [{"id": f"wamid.fake{next(counter)}"}],
+        }
+
+    @app.post("/{phone_number_id}/media")
+    async def upload_media(phone_number_id: str) -> dict:
+        return {"id": f"media.fake{next(counter)}"}
+
+    return app
+
+
+def create_mercadopago_app(config: FakeConfig, approve: bool = True) -> FastAPI:
+    """
+    Create a fake Mercado Pago payments API.
+
+    Payments are kept in memory. Requests reusing an ``X-Idempotency-Key``
+    get the original payment back, like the real API.
+    """
+    app = FastAPI()
+    app.state.stats = FakeStats()
+    _install_behaviour(app, config, app.state.stats)
+    payments: dict[str, dict] = {}
+    idempotency: dict[str, str] = {}
+    # Unique across runs: the app treats a known mp_payment_id as a retry
+    counter = itertools.count(int(time.time() * 1000))
+
+    @app.post("/v1/payments")
+    async def create_payment(request: Request) -> dict:
+        key = request.headers.get("x-idempotency-key")
+        if key and key in idempotency:
+            return payments[idempotency[key]]
+
+        payload = await request.json()
+        payment_id = str(next(counter))
+        payments[payment_id] = {
+            "id": int(payment_id),
+            "status": "pending",
+            "status_detail": "pending_waiting_transfer",
+            "transaction_amount": payload.get("transaction_amount"),
+            "external_reference": payload.get("external_reference"),
+            "date_of_expiration": payload.get("date_of_expiration"),
+            "point_of_interaction": {
+                "transaction_data": {
+                    "qr_code": brcode.build(
+                        "Mercado Pago Fake",
+                        "SAO PAULO",
+                        url=f"pix.fake.local/qr/v2/{payment_id}",
+                        amount=payload.get("transaction_amount"),
+                    ),
+                    "qr_code_base64": "iVBORw0KGgo=",
+                }
+            },
+        }
+        if key:
+            idempotency[key] = payment_id
+        return payments[payment_id]
+
+    @app.get("/v1/payments/{payment_id}")
+    async def get_payment(payment_id: str) -> Response:
+        payment = payments.get(payment_id)
+        if not payment:
+            return JSONResponse(status_code=404, content={"message": "not found"})
+        if approve:
+            payment["status"] = "approved"
+            payment["status_detail"] = "accredited"
+        return JSONResponse(content=payment)
+
+    @app.get("/_fake/payments")
+    async def list_payments() -> dict:
+        return {"ids": list(payments)}
+
+    return app
+
+
+_A1_CELL = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+def _column_index(letters: str) -> int:
+    """Convert a column name (A, B, ..., AA) to a 0-based index."""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - ord("A") + 1)
+    return index - 1
+
+
+def create_sheets_app(config: FakeConfig) -> FastAPI:
+    """
+    Create a fake Google Sheets ``values`` API plus an OAuth token endpoint.
+
+    The sheet is a single in-memory grid; ranges are only parsed as far as
+    the application uses them (``Sheet!A:M`` and single-row cell ranges).
+    """
+    app = FastAPI()
+    app.state.stats = FakeStats()
+    _install_behaviour(app, config, app.state.stats)
+    grid: list[list[Any]] = [list(SHEET_HEADERS)]
+
+    def write_cells(a1_range: str, values: list[list[Any]]) -> None:
+        start = a1_range.split("!")[-1].split(":")[0]
+        match = _A1_CELL.match(start)
+        if not match:
+            return
+        col, row = _column_index(match.group(1)), int(match.group(2)) - 1
+        for r_offset, row_values in enumerate(values):
+            while len(grid) <= row + r_offset:
+                grid.append([])
+            target = grid[row + r_offset]
+            for c_offset, value in enumerate(row_values):
+                while len(target) <= col + c_offset:
+                    target.append("")
+                target[col + c_offset] = value
+
+    @app.post("/token")
+    async def token() -> dict:
+        return {"access_token": "fake-token", "expires_in": 3600, "token_type": "Bearer"}
+
+    @app.get("/v4/spreadsheets/{spreadsheet_id}/values/{a1_range:path}")
+    async def get_values(spreadsheet_id: str, a1_range: str) -> dict:
+        return {"range": a1_range, "majorDimension": "ROWS", "values": grid}
+
+    @app.post("/v4/spreadsheets/{spreadsheet_id}/values:batchUpdate")
+    async def batch_update(spreadsheet_id: str, request: Request) -> dict:
+        body = await request.json()
+        for item in body.get("data", []):
+            write_cells(item["range"], item["values"])
+        return {"spreadsheetId": spreadsheet_id, "totalUpdatedRows": len(body.get("data", []))}
+
+    @app.post("/v4/spreadsheets/{spreadsheet_id}/values/{a1_range:path}")
+    async def append_values(spreadsheet_id: str, a1_range: str, request: Request) -> Response:
+        if not a1_range.endswith(":append"):
+            return JSONResponse(status_code=404, content={"error": "unsupported"})
+        body = await request.json()
+        first_row = len(grid) + 1
+        grid.extend([list(row) for row in body.get("values", [])])
+        # Like the real API, the updated range is qualified with the sheet name
+        sheet = a1_range.split("!", 1)[0] if "!" in a1_range else "Sheet1"
+        return JSONResponse(
+            content={
+                "spreadsheetId": spreadsheet_id,
+                "updates": {
+                    "updatedRange": f"{sheet}!A{first_row}:L{len(grid)}",
+                    "updatedRows": len(body.get("values", [])),
+                },
+            }
+        )
+
+    return app
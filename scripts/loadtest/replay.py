@@ -0,0 +1,164 @@
+"""
+Replay recorded webhook traffic against a running instance.
+
+Reads one or more recordings written with ``TRAFFIC_RECORDING_DIR`` (merged
+by arrival time) and sends every request at its recorded offset divided by
+``--speed``, so bursts keep their shape. ``--speed 0`` sends back to back.
+Prints latency per webhook, how late requests left compared to the schedule
+and how many replayed statuses differ from the recorded ones, as JSON.
+
+The recording holds pseudonymous phones, so replay against a scratch
+database: a second replay on the same database hits the duplicate paths.
+
+Usage:
+    python -m scripts.loadtest.replay recordings/webhooks-*.jsonl.gz \\
+        --app-url http://127.0.0.1:8000 --speed 4 --output replay.json
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from scripts.loadtest.stats import LatencyRecorder, percentile
+from src.core.recording import read_recording
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Replay recorded webhook traffic")
+    parser.add_argument("recordings", nargs="+", type=Path, help="Recording files (.jsonl.gz)")
+    parser.add_argument("--app-url", required=True, help="Instance receiving the replay")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time compression (0 = no waits)")
+    parser.add_argument("--concurrency", type=int, default=100, help="Connections to the app")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def load(paths: list[Path]) -> list[dict[str, Any]]:
+    """Read recordings and merge them by arrival time."""
+    records = [record for path in paths for record in read_recording(path)]
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+
+def peak_rate(offsets: list[float], window: float = 1.0) -> int:
+    """Most requests in any ``window`` seconds of the recording."""
+    peak = start = 0
+    for end, offset in enumerate(offsets):
+        while offset - offsets[start] > window:
+            start += 1
+        peak = max(peak, end - start + 1)
+    return peak
+
+
+def describe(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Shape of the recorded traffic."""
+    offsets = [record["ts"] - records[0]["ts"] for record in records]
+    gaps = sorted(b - a for a, b in zip(offsets, offsets[1:]))
+    return {
+        "requests": len(records),
+        "duration_s": round(offsets[-1], 3),
+        "paths": dict(Counter(record["path"] for record in records)),
+        "peak_requests_per_second": peak_rate(offsets),
+        "gap_ms": {
+            "p50": round(percentile(gaps, 50) * 1000, 2),
+            "p95": round(percentile(gaps, 95) * 1000, 2),
+            "min": round(gaps[0] * 1000, 2) if gaps else 0.0,
+        },
+    }
+
+
+async def send(
+    client: httpx.AsyncClient,
+    record: dict[str, Any],
+    recorder: LatencyRecorder,
+    total: LatencyRecorder,
+) -> int | str:
+    """Send one recorded request and record its latency."""
+    body = record["body"]
+    content = json.dumps(body, ensure_ascii=False) if record.get("json", True) else body
+    start = time.perf_counter()
+    try:
+        response = await client.request(
+            record.get("method", "POST"),
+            record["path"],
+            content=content.encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        status: int | str = response.status_code
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    latency_ms = (time.perf_counter() - start) * 1000
+    recorder.record(latency_ms, status)
+    total.record(latency_ms, status)
+    return status
+
+
+async def replay(args: argparse.Namespace) -> dict[str, Any]:
+    """Replay the recordings and return the report."""
+    records = load(args.recordings)
+    if not records:
+        raise SystemExit("No recorded requests")
+
+    first = records[0]["ts"]
+    recorders = {path: LatencyRecorder(path) for path in sorted({r["path"] for r in records})}
+    total = LatencyRecorder("all")
+    lags_ms: list[float] = []
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.app_url, timeout=120, limits=limits) as client:
+        started = time.perf_counter()
+        tasks = []
+        for record in records:
+            if args.speed > 0:
+                due = started + (record["ts"] - first) / args.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                lags_ms.append(max(time.perf_counter() - due, 0.0) * 1000)
+            tasks.append(
+                asyncio.create_task(send(client, record, recorders[record["path"]], total))
+            )
+        statuses = await asyncio.gather(*tasks)
+
+    for recorder in (*recorders.values(), total):
+        recorder.finish()
+
+    lags_ms.sort()
+    return {
+        "config": {
+            "app_url": args.app_url,
+            "recordings": [str(path) for path in args.recordings],
+            "speed": args.speed,
+            "concurrency": args.concurrency,
+        },
+        "recording": describe(records),
+        "replay": {
+            **total.summary(),
+            "schedule_lag_ms": {
+                "p50": round(percentile(lags_ms, 50), 2),
+                "p99": round(percentile(lags_ms, 99), 2),
+                "max": round(lags_ms[-1], 2) if lags_ms else 0.0,
+            },
+            "status_mismatches": sum(
+                1
+                for record, status in zip(records, statuses)
+                if record.get("status") is not None and record["status"] != status
+            ),
+        },
+        "paths": {path: recorder.summary() for path, recorder in recorders.items()},
+    }
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = asyncio.run(replay(arguments))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if arguments.output:
+        Path(arguments.output).write_text(output + "\n")
@@ -0,0 +1,181 @@
+"""Load test scenarios built from the webhook fixtures in ``tests/``."""
+import asyncio
+import copy
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from scripts.loadtest.stats import LatencyRecorder
+
+FIXTURES_DIR = Path(__file__).resolve().parents[2] / "tests"
+
+# One complete onboarding, in the order ConversationHandler expects it
+CONVERSATION_STEPS = ["start", "name", "condo", "block", "apartment", "plan"]
+
+
+def load_fixture(name: str) -> dict:
+    """Load a JSON fixture from ``tests/``."""
+    with open(FIXTURES_DIR / name, encoding="utf-8") as fixture:
+        return json.load(fixture)
+
+
+def build_whatsapp_message(template: dict, phone: str, message_id: str, text: str) -> dict:
+    """Build a WhatsApp webhook carrying a single text message."""
+    payload = copy.deepcopy(template)
+    value = payload["entry"][0]["changes"][0]["value"]
+    value["contacts"][0]["wa_id"] = phone
+    message = value["messages"][0]
+    message["from"] = phone
+    message["id"] = message_id
+    message["timestamp"] = str(int(time.time()))
+    message["text"]["body"] = text
+    return payload
+
+
+def build_mp_notification(template: dict, notification_id: int, mp_payment_id: str) -> dict:
+    """Build a Mercado Pago payment notification."""
+    payload = copy.deepcopy(template)
+    payload["id"] = notification_id
+    payload["data"]["id"] = mp_payment_id
+    return payload
+
+
+def conversation_texts(index: int) -> list[str]:
+    """Answers sent by virtual user ``index``, one per conversation step."""
+    return [
+        "Olá",
+        f"Morador Carga {index}",
+        "Condomínio Carga",
+        random.choice(["A", "B", "C"]),
+        str(100 + index),
+        random.choice(["1", "2", "3"]),
+    ]
+
+
+async def _timed_post(
+    client: httpx.AsyncClient,
+    recorder: LatencyRecorder,
+    url: str,
+    payload: dict,
+) -> httpx.Response | None:
+    """POST a JSON payload and record its latency."""
+    start = time.perf_counter()
+    try:
+        response = await client.post(url, json=payload)
+    except httpx.HTTPError as e:
+        recorder.record((time.perf_counter() - start) * 1000, type(e).__name__)
+        return None
+    recorder.record((time.perf_counter() - start) * 1000, response.status_code)
+    return response
+
+
+async def run_conversations(
+    client: httpx.AsyncClient,
+    users: int,
+    concurrency: int,
+    phone_prefix: str,
+) -> dict[str, Any]:
+    """
+    Drive full onboarding conversations, confirmation included.
+
+    Each virtual user sends its messages sequentially (the conversation
+    state is per phone); users run concurrently.
+    """
+    template = load_fixture("test_whatsapp_webhook.json")
+    overall = LatencyRecorder("conversation")
+    per_step = {step: LatencyRecorder(step) for step in CONVERSATION_STEPS}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def user(index: int) -> None:
+        phone = f"{phone_prefix}{index:06d}"
+        async with semaphore:
+            for step, text in zip(CONVERSATION_STEPS, conversation_texts(index)):
+                payload = build_whatsapp_message(
+                    template, phone, f"wamid.load.{phone}.{step}", text
+                )
+                start = time.perf_counter()
+                response = await _timed_post(client, overall, "/webhooks/whatsapp/", payload)
+                status = response.status_code if response is not None else "error"
+                per_step[step].record((time.perf_counter() - start) * 1000, status)
+
+    await asyncio.gather(*(user(i) for i in range(users)))
+    overall.finish()
+    for recorder in per_step.values():
+        recorder.finish()
+
+    summary = overall.summary()
+    summary["steps"] = {step: rec.summary()["latency_ms"] for step, rec in per_step.items()}
+    return summary
+
+
+async def run_pix_burst(
+    client: httpx.AsyncClient,
+    count: int,
+    concurrency: int,
+    phone_prefix: str,
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    Fire ``count`` concurrent ``POST /pix/create`` requests.
+
+    Returns:
+        Tuple of (summary, Mercado Pago payment IDs created)
+    """
+    recorder = LatencyRecorder("pix_burst")
+    semaphore = asyncio.Semaphore(concurrency)
+    mp_payment_ids: list[str] = []
+
+    async def create(index: int) -> None:
+        payload = {
+            "phone": f"{phone_prefix}{index:06d}",
+            "name": f"Morador Burst {index}",
+            "condo": "Condomínio Carga",
+            "block": "A",
+            "apartment": str(100 + index),
+            "plan_value": random.choice([70.0, 90.0, 100.0]),
+        }
+        async with semaphore:
+            response = await _timed_post(client, recorder, "/pix/create", payload)
+        if response is not None and response.status_code == 200:
+            data = response.json().get("data") or {}
+            if data.get("mp_payment_id"):
+                mp_payment_ids.append(str(data["mp_payment_id"]))
+
+    await asyncio.gather(*(create(i) for i in range(count)))
+    recorder.finish()
+    return recorder.summary(), mp_payment_ids
+
+
+async def run_approval_storm(
+    client: httpx.AsyncClient,
+    mp_payment_ids: list[str],
+    duplicates: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """
+    Deliver approval webhooks for every payment, ``duplicates`` times each.
+
+    Mercado Pago retries and sends several notifications per payment, so
+    duplicates are shuffled into the stream rather than sent back to back.
+    """
+    template = load_fixture("test_mp_webhook.json")
+    recorder = LatencyRecorder("approval_storm")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    notifications = [
+        build_mp_notification(template, random.randint(1, 2**31), mp_payment_id)
+        for mp_payment_id in mp_payment_ids
+        for _ in range(duplicates)
+    ]
+    random.shuffle(notifications)
+
+    async def deliver(payload: dict) -> None:
+        async with semaphore:
+            await _timed_post(client, recorder, "/webhooks/mercadopago/", payload)
+
+    await asyncio.gather(*(deliver(payload) for payload in notifications))
+    recorder.finish()
+    return recorder.summary()
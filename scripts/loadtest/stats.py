@@ -0,0 +1,68 @@
+"""Latency bookkeeping for load tests."""
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        sorted_values: Values sorted in ascending order
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Percentile value (0.0 for an empty list)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class LatencyRecorder:
+    """Collect request latencies and outcomes for one scenario."""
+
+    name: str
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: dict[str, int] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float | None = None
+
+    def record(self, latency_ms: float, status: int | str) -> None:
+        """Record one request; any non-2xx status counts as an error."""
+        self.latencies_ms.append(latency_ms)
+        key = str(status)
+        self.status_codes[key] = self.status_codes.get(key, 0) + 1
+        if not (isinstance(status, int) and 200 <= status < 300):
+            self.errors += 1
+
+    def finish(self) -> None:
+        """Mark the end of the scenario."""
+        self.finished_at = time.perf_counter()
+
+    def summary(self) -> dict[str, Any]:
+        """Return throughput and latency percentiles."""
+        end = self.finished_at or time.perf_counter()
+        duration = max(end - self.started_at, 1e-9)
+        values = sorted(self.latencies_ms)
+        count = len(values)
+
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "status_codes": dict(sorted(self.status_codes.items())),
+            "duration_s": round(duration, 3),
+            "throughput_rps": round(count / duration, 2),
+            "latency_ms": {
+                "mean": round(sum(values) / count, 2) if count else 0.0,
+                "p50": round(percentile(values, 50), 2),
+                "p95": round(percentile(values, 95), 2),
+                "p99": round(percentile(values, 99), 2),
+                "max": round(values[-1], 2) if count else 0.0,
+            },
+        }
@@ -0,0 +1,45 @@
+"""Rebuild and verify the monthly collection summary table.
+
+Usage:
+    python scripts/rebuild_monthly_summary.py            # rebuild, then verify
+    python scripts/rebuild_monthly_summary.py --verify   # only verify
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.database import SessionLocal
+from src.services.summary_service import summary_service
+
+
+def main() -> int:
+    """Rebuild (unless --verify) and verify the summary table."""
+    parser = argparse.ArgumentParser(description="Rebuild monthly_summaries from payments")
+    parser.add_argument("--verify", action="store_true", help="Only compare, do not rebuild")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if not args.verify:
+            rows = summary_service.rebuild(db)
+            print(f"✅ Rebuilt {rows} summary rows")
+
+        mismatches = summary_service.verify(db)
+    finally:
+        db.close()
+
+    if mismatches:
+        print(f"❌ {len(mismatches)} mismatching rows:")
+        print(json.dumps(mismatches, indent=2, ensure_ascii=False))
+        return 1
+
+    print("✅ Summary matches payments")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
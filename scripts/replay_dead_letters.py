@@ -0,0 +1,85 @@
+"""List, replay or discard webhook events that failed (dead letters).
+
+Usage:
+    python scripts/replay_dead_letters.py list [--source mercadopago]
+    python scripts/replay_dead_letters.py replay [--source whatsapp] [--id 12 --id 15] [--limit 100] [--concurrency 8]
+        [--include-messages]
+    python scripts/replay_dead_letters.py discard --id 12
+
+WhatsApp messages are not replayed unless --include-messages is given: the
+conversation they belonged to is gone, so the client would get a prompt that
+does not follow from what they sent. They are listed instead; discard them
+or answer the client by hand.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# The webhook routes register the replay handler of their source
+import src.api.mercadopago  # noqa: F401
+from src.api.whatsapp import MESSAGE_KIND
+from src.services.dead_letters import dead_letters
+
+
+def main() -> int:
+    """Run the selected command."""
+    parser = argparse.ArgumentParser(description="Manage failed webhook events")
+    parser.add_argument("command", choices=["list", "replay", "discard"])
+    parser.add_argument("--source", choices=sorted(dead_letters.handlers), help="Only this source")
+    parser.add_argument("--id", dest="ids", type=int, action="append", help="Only this dead letter (repeatable)")
+    parser.add_argument("--limit", type=int, help="At most this many")
+    parser.add_argument("--concurrency", type=int, default=4, help="Replays running at the same time")
+    parser.add_argument(
+        "--include-messages",
+        action="store_true",
+        help="Also replay WhatsApp messages through the conversation flow",
+    )
+    args = parser.parse_args()
+
+    if args.command == "list":
+        letters = dead_letters.pending(args.source, args.ids, args.limit)
+        for letter in letters:
+            print(
+                f"{letter['id']:>6}  {letter['source']:<12} {letter['event_key']:<40} "
+                f"attempts={letter['attempts']}  {letter['last_failed_at']:%Y-%m-%d %H:%M}  "
+                f"{letter['error'][:80]}"
+            )
+        print(f"📋 {len(letters)} pending: {json.dumps(Counter(letter['source'] for letter in letters))}")
+        return 0
+
+    if args.command == "discard":
+        if not args.ids:
+            parser.error("discard needs --id")
+        print(f"🗑️  {dead_letters.discard(args.ids)} discarded")
+        return 0
+
+    exclude_kinds = () if args.include_messages else (MESSAGE_KIND,)
+    results = asyncio.run(
+        dead_letters.replay(args.source, args.ids, args.limit, args.concurrency, exclude_kinds)
+    )
+    failed = [result for result in results if not result["resolved"]]
+    if failed:
+        print(json.dumps(failed, indent=2, ensure_ascii=False))
+    print(f"✅ {len(results) - len(failed)} resolved, ❌ {len(failed)} still failing")
+
+    if exclude_kinds and args.source in (None, "whatsapp"):
+        skipped = [
+            letter
+            for letter in dead_letters.pending("whatsapp", args.ids)
+            if letter["payload"].get("kind") == MESSAGE_KIND
+        ]
+        for letter in skipped:
+            print(f"{letter['id']:>6}  {letter['event_key']:<40} {letter['error'][:80]}")
+        if skipped:
+            print(f"⏭️  {len(skipped)} WhatsApp messages not replayed (--include-messages to resend)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Send the monthly payment reminder to clients who have not paid yet.
+
+Safe to re-run: clients already reminded for the month are not messaged
+again, failed sends are retried and clients who paid meanwhile are skipped.
+
+Usage:
+    python scripts/send_reminders.py 2026-10
+    python scripts/send_reminders.py 2026-10 --condo "Residencial Sol" --limit 50
+    python scripts/send_reminders.py 2026-10 --status   # only show delivery counts
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.database import SessionLocal
+from src.services.reminder_campaign import reminder_campaign
+
+
+def month(value: str) -> str:
+    """Validate a YYYY-MM argument."""
+    if not re.match(r"^\d{4}-\d{2}$", value):
+        raise argparse.ArgumentTypeError("expected YYYY-MM")
+    return value
+
+
+def main() -> int:
+    """Run the campaign (unless --status) and print delivery counts."""
+    parser = argparse.ArgumentParser(description="Send WhatsApp payment reminders for a month")
+    parser.add_argument("month_ref", type=month, help="Month reference (YYYY-MM)")
+    parser.add_argument("--condo", help="Only clients of this condominium")
+    parser.add_argument("--limit", type=int, help="Send at most this many reminders in this run")
+    parser.add_argument("--status", action="store_true", help="Only show delivery counts")
+    args = parser.parse_args()
+
+    if not args.status:
+        totals = asyncio.run(
+            reminder_campaign.run(args.month_ref, condo=args.condo, limit=args.limit)
+        )
+        print(
+            f"✅ {totals['staged']} staged, {totals['sent']} sent, "
+            f"{totals['failed']} failed ({totals['throttled']} rate-limited), "
+            f"{totals['skipped']} skipped (paid meanwhile)"
+        )
+
+    db = SessionLocal()
+    try:
+        counts = reminder_campaign.counts(db, args.month_ref)
+    finally:
+        db.close()
+
+    print(f"📊 {args.month_ref}: {json.dumps(counts)}")
+    return 1 if counts.get("failed") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""Run one diff-based sync of payments from Postgres to Google Sheets."""
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.sheets_service import sheets_service
+from src.services.sheets_sync import sheets_sync
+
+
+def main() -> None:
+    """Prepare the Sheets client and run a single sync."""
+    if not sheets_service.prepare():
+        print("❌ Error: Google Sheets is not configured or credentials failed")
+        sys.exit(1)
+
+    result = sheets_sync.sync()
+    print(json.dumps(result.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
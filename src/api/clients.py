@@ -0,0 +1,79 @@
+"""Client administration endpoints."""
+import asyncio
+import io
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse
+
+from src.core.logging import get_logger
+from src.core.security import require_admin
+from src.schemas.responses import create_success_response
+from src.services.client_import import ClientImportError, client_importer
+
+logger = get_logger(__name__)
+router = APIRouter(
+    prefix="/clients",
+    tags=["Clients"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.post("/import")
+async def import_clients(
+    request: Request,
+    file: Annotated[UploadFile, File(description="CSV: name, phone, condo, block, apartment")],
+    condo: Optional[str] = Query(None, max_length=255, description="Condo for rows that leave it blank"),
+    dry_run: bool = Query(False, description="Report what would change without writing"),
+) -> JSONResponse:
+    """
+    Import clients from a CSV file.
+
+    New phones are inserted and known phones updated in one statement;
+    invalid rows are skipped and reported with their line number.
+
+    Args:
+        request: FastAPI request
+        file: Uploaded CSV (UTF-8)
+        condo: Condo for rows that leave it blank
+        dry_run: Roll back instead of committing
+
+    Returns:
+        Inserted, updated, unchanged and rejected counts
+
+    Raises:
+        HTTPException: 400 if the file is not UTF-8 or lacks required columns
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded") from e
+
+    try:
+        result = await asyncio.to_thread(
+            client_importer.import_csv,
+            io.StringIO(text, newline=""),
+            default_condo=condo,
+            dry_run=dry_run,
+        )
+    except ClientImportError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    logger.info(
+        "clients_import_request",
+        request_id=request_id,
+        filename=file.filename,
+        inserted=result.inserted,
+        updated=result.updated,
+        rejected=result.rejected,
+    )
+
+    response = create_success_response(
+        request_id=request_id,
+        action="clients_import",
+        data=result.as_dict(),
+    )
+
+    return JSONResponse(content=response.model_dump(mode="json"))
@@ -2,11 +2,13 @@
 from fastapi import APIRouter, Request, Header
 from fastapi.responses import JSONResponse, PlainTextResponse
 
-from src.core.database import DBSession
+from src.core.database import SessionLocal
 from src.core.logging import get_logger
 from src.schemas.mercadopago import MercadoPagoWebhook
 from src.schemas.responses import create_error_response, create_success_response
+from src.services.dead_letters import dead_letters
 from src.services.webhook_processor import webhook_processor
+from src.utils.payload import read_json_body, validate_body
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/webhooks/mercadopago", tags=["Mercado Pago"])
@@ -15,8 +17,6 @@ router = APIRouter(prefix="/webhooks/mercadopago", tags=["Mercado Pago"])
 @router.post("/", response_class=PlainTextResponse)
 async def receive_webhook(
     request: Request,
-    webhook: MercadoPagoWebhook,
-    db: DBSession,
     x_signature: str = Header(None, alias="x-signature"),
     x_request_id: str = Header(None, alias="x-request-id"),
 ) -> PlainTextResponse:
@@ -26,18 +26,38 @@ async def receive_webhook(
     This endpoint processes payment notifications from Mercado Pago.
     It validates the notification, updates payment status, and notifies the client.
 
+    Notifications for other topics are answered from the raw payload, before
+    model validation and without opening a database session.
+
     Args:
         request: FastAPI request
-        webhook: Mercado Pago webhook payload
-        db: Database session
         x_signature: Mercado Pago signature header (optional, for validation)
         x_request_id: Mercado Pago request ID header
 
     Returns:
         200 OK response (Mercado Pago expects plain text)
+
+    Raises:
+        RequestValidationError: If a payment notification is malformed
     """
     request_id = getattr(request.state, "request_id", "unknown")
 
+    payload = await read_json_body(request)
+    event_type = payload.get("type") if isinstance(payload, dict) else None
+
+    # Only process payment events
+    if event_type is not None and event_type != "payment":
+        logger.info(
+            "webhook_type_ignored",
+            request_id=request_id,
+            notification_id=payload.get("id"),
+            type=event_type,
+            mp_request_id=x_request_id,
+        )
+        return PlainTextResponse(content="OK", status_code=200)
+
+    webhook = validate_body(MercadoPagoWebhook, payload)
+
     logger.info(
         "mercadopago_webhook_received",
         request_id=request_id,
@@ -47,15 +67,7 @@ async def receive_webhook(
         mp_request_id=x_request_id,
     )
 
-    # Only process payment events
-    if webhook.type != "payment":
-        logger.info(
-            "webhook_type_ignored",
-            request_id=request_id,
-            type=webhook.type,
-        )
-        return PlainTextResponse(content="OK", status_code=200)
-
+    db = SessionLocal()
     try:
         # Process payment notification
         result = await webhook_processor.process_payment_notification(
@@ -84,11 +96,47 @@ async def receive_webhook(
             error=str(e),
             exc_info=True,
         )
+        dead_letters.record(
+            "mercadopago",
+            f"{webhook.id}_{webhook.data.id}",
+            payload,
+            str(e),
+            request_id,
+        )
 
         # Still return 200 to prevent Mercado Pago retries for permanent errors
-        # Mercado Pago will retry on 4xx/5xx errors
+        # (Mercado Pago retries on 4xx/5xx); the dead letter can be replayed
         return PlainTextResponse(content="OK", status_code=200)
 
+    finally:
+        db.close()
+
+
+async def replay_dead_letter(payload: dict) -> None:
+    """
+    Process a stored notification again (dead-letter replay handler).
+
+    Args:
+        payload: Raw webhook payload
+
+    Raises:
+        Exception: If processing fails again
+    """
+    webhook = MercadoPagoWebhook.model_validate(payload)
+    db = SessionLocal()
+    try:
+        await webhook_processor.process_payment_notification(
+            db=db,
+            mp_payment_id=webhook.data.id,
+            notification_id=str(webhook.id),
+            request_id=f"replay-{webhook.id}",
+        )
+    finally:
+        db.close()
+
+
+dead_letters.register("mercadopago", replay_dead_letter)
+
 
 @router.get("/test")
 async def test_endpoint(request: Request) -> JSONResponse:
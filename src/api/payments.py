@@ -0,0 +1,223 @@
+"""Payment read endpoints for administrators."""
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.core.database import ReadDBSession, ReadSessionLocal
+from src.core.logging import get_logger
+from src.core.security import require_admin
+from src.schemas.payment import PaymentWithClient
+from src.schemas.responses import create_success_response
+from src.services.payment_service import payment_service
+from src.utils.pagination import decode_cursor, encode_cursor
+
+logger = get_logger(__name__)
+router = APIRouter(
+    prefix="/payments",
+    tags=["Payments"],
+    dependencies=[Depends(require_admin)],
+)
+
+EXPORT_COLUMNS = [
+    "id",
+    "request_id",
+    "name",
+    "phone",
+    "condo",
+    "block",
+    "apartment",
+    "month_ref",
+    "amount",
+    "status",
+    "mp_payment_id",
+    "external_reference",
+    "created_at",
+    "paid_at",
+]
+
+# Rows serialized per chunk handed to the response
+EXPORT_CHUNK_ROWS = 500
+
+
+class ExportFormat(str, Enum):
+    """Supported export formats."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+def _export_value(value: Any) -> Any:
+    """Convert a DB value to a JSON/CSV friendly value."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int)):
+        return value
+    return str(value)  # Decimal amounts keep their exact representation
+
+
+def _export_chunks(
+    export_format: ExportFormat,
+    month_ref: Optional[str],
+    status: Optional[str],
+    condo: Optional[str],
+    request_id: str,
+) -> Iterator[str]:
+    """
+    Yield the export body in chunks.
+
+    The generator owns its session: FastAPI closes dependency sessions
+    before a streaming body is sent.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == ExportFormat.CSV else None
+    if writer:
+        writer.writerow(EXPORT_COLUMNS)
+
+    rows = 0
+    db = ReadSessionLocal()
+    try:
+        for row in payment_service.iter_export_rows(db, month_ref, status, condo):
+            values = [_export_value(getattr(row, column)) for column in EXPORT_COLUMNS]
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values, strict=True)), ensure_ascii=False))
+                buffer.write("\n")
+
+            rows += 1
+            if rows % EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+    finally:
+        db.close()
+        logger.info(
+            "payments_export_finished",
+            request_id=request_id,
+            format=export_format.value,
+            rows=rows,
+        )
+
+
+@router.get("")
+async def list_payments(
+    request: Request,
+    db: ReadDBSession,
+    month_ref: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    status: Optional[str] = None,
+    condo: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+) -> JSONResponse:
+    """
+    List payments with client fields, newest first.
+
+    Pagination is keyset-based: pass ``next_cursor`` from the previous page
+    as ``cursor`` to continue. Pages cost the same no matter how deep.
+
+    Args:
+        request: FastAPI request
+        db: Read-only database session (replica when available)
+        month_ref: Filter by month reference (YYYY-MM)
+        status: Filter by payment status
+        condo: Filter by client condominium
+        cursor: Cursor returned by the previous page
+        limit: Page size
+
+    Returns:
+        Page of payments and the cursor for the next one
+
+    Raises:
+        HTTPException: If the cursor is invalid
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    payments, has_more = payment_service.list_page(
+        db,
+        limit=limit,
+        after=after,
+        month_ref=month_ref,
+        status=status,
+        condo=condo,
+    )
+
+    next_cursor = None
+    if has_more:
+        last = payments[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    response = create_success_response(
+        request_id=request_id,
+        action="list_payments",
+        data={
+            "payments": [
+                PaymentWithClient.model_validate(payment).model_dump(mode="json")
+                for payment in payments
+            ],
+            "next_cursor": next_cursor,
+        },
+    )
+
+    return JSONResponse(content=response.model_dump(mode="json"))
+
+
+@router.get("/export")
+async def export_payments(
+    request: Request,
+    format: ExportFormat = ExportFormat.CSV,
+    month_ref: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    status: Optional[str] = None,
+    condo: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Stream payments as CSV or NDJSON.
+
+    Rows come from a server-side cursor and are written out as they are
+    fetched, so memory use does not grow with the size of the export.
+
+    Args:
+        request: FastAPI request
+        format: ``csv`` or ``ndjson``
+        month_ref: Filter by month reference (YYYY-MM)
+        status: Filter by payment status
+        condo: Filter by client condominium
+
+    Returns:
+        Streaming response with the export body
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+
+    logger.info(
+        "payments_export_started",
+        request_id=request_id,
+        format=format.value,
+        month_ref=month_ref,
+        status=status,
+        condo=condo,
+    )
+
+    if format == ExportFormat.CSV:
+        media_type = "text/csv"
+    else:
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(
+        _export_chunks(format, month_ref, status, condo, request_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="payments.{format.value}"'},
+    )
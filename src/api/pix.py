@@ -1,10 +1,12 @@
 """PIX endpoints for payment generation."""
-from datetime import datetime
+import base64
+from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 
-from src.core.database import DBSession
+from src.core.config import settings
+from src.core.database import DBSession, release_connection
 from src.core.logging import get_logger
 from src.schemas.client import ClientCreate
 from src.schemas.payment import PaymentCreate
@@ -13,6 +15,8 @@ from src.schemas.responses import create_error_response, create_success_response
 from src.services.client_service import client_service
 from src.services.mercadopago_service import mercadopago_service
 from src.services.payment_service import payment_service
+from src.services.qr_renderer import qr_renderer
+from src.utils.brcode import BRCodeError
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/pix", tags=["PIX"])
@@ -93,7 +97,52 @@ async def create_pix(
                 detail=f"Client already has an approved payment for {month_ref}",
             )
 
-        # 4. Generate external reference
+        # 4. Return a still-valid pending PIX instead of charging again
+        reusable = payment_service.get_reusable_pending(
+            db,
+            client.id,
+            month_ref,
+            pix_request.plan_value,
+            timedelta(minutes=settings.pix_reuse_min_validity_minutes),
+        )
+
+        if reusable:
+            logger.info(
+                "pending_pix_reused",
+                request_id=request_id,
+                client_id=client.id,
+                payment_id=reusable.id,
+                mp_payment_id=reusable.mp_payment_id,
+            )
+
+            release_connection(db)
+
+            remaining = reusable.pix_expires_at - datetime.now(timezone.utc)
+            pix_response = PIXCreateResponse(
+                client_id=client.id,
+                payment_id=reusable.id,
+                mp_payment_id=reusable.mp_payment_id,
+                pix_code=reusable.pix_code,
+                qr_code_base64=base64.b64encode(
+                    await qr_renderer.render(reusable.pix_code)
+                ).decode(),
+                amount=pix_request.plan_value,
+                expiration_hours=int(remaining.total_seconds() // 3600),
+                expires_at=reusable.pix_expires_at,
+                reused=True,
+                external_reference=reusable.external_reference,
+                month_ref=month_ref,
+            )
+
+            response = create_success_response(
+                request_id=request_id,
+                action="create_pix",
+                data=pix_response.model_dump(mode="json"),
+            )
+
+            return JSONResponse(content=response.model_dump(mode="json"))
+
+        # 5. Generate external reference
         external_reference = mercadopago_service.generate_external_reference(
             month_ref=month_ref,
             amount=pix_request.plan_value,
@@ -101,24 +150,38 @@ async def create_pix(
             apartment=pix_request.apartment,
         )
 
-        # 5. Create PIX payment in Mercado Pago
+        # 6. Create PIX payment in Mercado Pago (key derived from the charge)
         description = (
             f"Pagamento PIX - {pix_request.condo} - "
             f"Bloco {pix_request.block} - Apto {pix_request.apartment} - "
             f"{month_ref}"
         )
 
+        idempotency_key = mercadopago_service.generate_idempotency_key(
+            client_id=client.id,
+            month_ref=month_ref,
+            amount=pix_request.plan_value,
+            generation=payment_service.count_attempts(
+                db, client.id, month_ref, pix_request.plan_value
+            ),
+        )
+
+        # Don't hold a pooled connection while Mercado Pago answers
+        release_connection(db)
+
         mp_response = await mercadopago_service.create_pix_payment(
             amount=pix_request.plan_value,
             description=description,
             external_reference=external_reference,
             request_id=request_id,
+            idempotency_key=idempotency_key,
         )
 
-        # 6. Extract PIX data
+        # 7. Extract PIX data
         mp_payment_id = str(mp_response.get("id"))
         pix_code = mercadopago_service.extract_pix_code(mp_response)
         qr_code_base64 = mercadopago_service.extract_qr_code_base64(mp_response)
+        pix_expires_at = mercadopago_service.extract_expiration(mp_response)
 
         if not pix_code:
             logger.error(
@@ -131,23 +194,32 @@ async def create_pix(
                 detail="Failed to generate PIX code from Mercado Pago",
             )
 
-        # 7. Create payment record
+        try:
+            mercadopago_service.validate_pix_code(pix_code, pix_request.plan_value, request_id)
+        except BRCodeError as e:
+            raise HTTPException(
+                status_code=502,
+                detail="Mercado Pago returned an invalid PIX code",
+            ) from e
+
+        # 8. Create payment record with the Mercado Pago ID and PIX code,
+        # unless a concurrent retry with the same idempotency key already
+        # recorded this charge
         payment_data = PaymentCreate(
             client_id=client.id,
             month_ref=month_ref,
             amount=pix_request.plan_value,
             external_reference=external_reference,
         )
-
-        payment = payment_service.create(db, payment_data, request_id)
-
-        # 8. Update payment with Mercado Pago ID
-        payment_service.update_status(
+        payment, created = payment_service.record_charge(
             db,
-            payment,
-            status="pending",
+            payment_data,
+            request_id,
             mp_payment_id=mp_payment_id,
+            pix_code=pix_code,
+            pix_expires_at=pix_expires_at,
         )
+        reused = not created
 
         logger.info(
             "pix_created_successfully",
@@ -165,7 +237,9 @@ async def create_pix(
             pix_code=pix_code,
             qr_code_base64=qr_code_base64,
             amount=pix_request.plan_value,
-            expiration_hours=6,
+            expiration_hours=settings.pix_expiration_hours,
+            expires_at=pix_expires_at,
+            reused=reused,
             external_reference=external_reference,
             month_ref=month_ref,
         )
@@ -173,7 +247,7 @@ async def create_pix(
         response = create_success_response(
             request_id=request_id,
             action="create_pix",
-            data=pix_response.model_dump(),
+            data=pix_response.model_dump(mode="json"),
         )
 
         return JSONResponse(content=response.model_dump(mode="json"))
@@ -0,0 +1,59 @@
+"""Report endpoints for administrators."""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse
+
+from src.core.database import ReadDBSession
+from src.core.logging import get_logger
+from src.core.security import require_admin
+from src.schemas.report import MonthlySummaryResponse
+from src.schemas.responses import create_success_response
+from src.services.summary_service import summary_service
+
+logger = get_logger(__name__)
+router = APIRouter(
+    prefix="/reports",
+    tags=["Reports"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.get("/monthly")
+async def monthly_report(
+    request: Request,
+    db: ReadDBSession,
+    month_ref: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    condo: Optional[str] = None,
+) -> JSONResponse:
+    """
+    Collection totals per condo and month.
+
+    Reads the incrementally maintained summary table, so the cost does not
+    grow with the number of payments.
+
+    Args:
+        request: FastAPI request
+        db: Read-only database session (replica when available)
+        month_ref: Filter by month reference (YYYY-MM)
+        condo: Filter by condominium
+
+    Returns:
+        Summary rows, latest month first
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+
+    summaries = summary_service.list_summaries(db, month_ref=month_ref, condo=condo)
+
+    response = create_success_response(
+        request_id=request_id,
+        action="monthly_report",
+        data={
+            "summaries": [
+                MonthlySummaryResponse.model_validate(summary).model_dump(mode="json")
+                for summary in summaries
+            ],
+        },
+    )
+
+    return JSONResponse(content=response.model_dump(mode="json"))
@@ -1,20 +1,123 @@
 """WhatsApp webhook endpoints."""
+from typing import Any, Optional
+
 from fastapi import APIRouter, Request, Query, HTTPException
 from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.orm import Session
 
 from src.core.config import settings
-from src.core.database import DBSession
+from src.core.database import SessionLocal
 from src.core.logging import get_logger
 from src.schemas.responses import create_error_response, create_success_response
-from src.schemas.whatsapp import WhatsAppWebhook
+from src.schemas.whatsapp import WhatsAppMessage, WhatsAppWebhook
 from src.services.conversation_handler import conversation_handler
+from src.services.dead_letters import dead_letters
 from src.services.message_parser import MessageParser
 from src.services.pix_handler import pix_handler
+from src.utils.payload import read_json_body, validate_body
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/webhooks/whatsapp", tags=["WhatsApp"])
 parser = MessageParser()
 
+# Dead-letter kind of a failed incoming message (vs. a failed PIX generation)
+MESSAGE_KIND = "message"
+
+
+def _has_text_messages(payload: Any) -> bool:
+    """
+    Check a raw webhook payload for at least one text message.
+
+    Status callbacks (sent, delivered, read) and non-text messages carry
+    nothing for the conversation flow.
+    """
+    if not isinstance(payload, dict):
+        return True  # Let validation report it
+    for entry in payload.get("entry") or []:
+        for change in entry.get("changes") or []:
+            for message in (change.get("value") or {}).get("messages") or []:
+                if message.get("type") == "text" and (message.get("text") or {}).get("body"):
+                    return True
+    return False
+
+
+async def _generate_pix(db: Session, data: dict, request_id: Optional[str]) -> None:
+    """
+    Generate and send the PIX requested by a finished conversation.
+
+    Args:
+        db: Database session
+        data: Conversation data (phone, name, condo, block, apartment, amount)
+        request_id: Request ID for tracking
+
+    Raises:
+        Exception: If PIX generation fails (the client is already notified)
+    """
+    await pix_handler.generate_and_send_pix(
+        db=db,
+        phone=data["phone"],
+        name=data["name"],
+        condo=data["condo"],
+        block=data["block"],
+        apartment=data["apartment"],
+        amount=data["amount"],
+        request_id=request_id,
+    )
+
+    logger.info(
+        "pix_generated_for_conversation",
+        request_id=request_id,
+        phone=data["phone"],
+    )
+
+    # Reset conversation state after successful PIX generation
+    conversation_handler.reset_state(data["phone"])
+
+
+async def replay_dead_letter(payload: dict) -> None:
+    """
+    Process a stored message again (dead-letter replay handler).
+
+    A failed PIX generation is retried with the data the conversation had
+    collected. A failed message goes through the conversation flow again;
+    conversation state lives in the process, so outside the worker that
+    received it the message is handled as the start of a conversation and
+    the client gets a prompt that does not follow from what they sent.
+    Message dead letters are therefore only replayed on request
+    (``MESSAGE_KIND``, ``--include-messages``).
+
+    Args:
+        payload: {"kind": "generate_pix", "data": ...} or
+            {"kind": "message", "message": ...}
+
+    Raises:
+        Exception: If processing fails again
+    """
+    if payload["kind"] == "generate_pix":
+        data = payload["data"]
+        request_id = f"replay-pix-{data['phone']}"
+    else:
+        message = WhatsAppMessage.model_validate(payload["message"])
+        request_id = f"replay-{message.id}"
+        result = await conversation_handler.handle_message(
+            phone=parser.extract_phone(message),
+            message_text=parser.extract_text(message) or "",
+            message_id=message.id,
+            request_id=request_id,
+        )
+        if result.get("action") != "generate_pix" or not result.get("data"):
+            return
+        data = result["data"]
+
+    db = SessionLocal()
+    try:
+        await _generate_pix(db, data, request_id)
+    finally:
+        db.close()
+
+
+dead_letters.register("whatsapp", replay_dead_letter)
+
 
 @router.get("/", response_class=PlainTextResponse)
 async def verify_webhook(
@@ -78,40 +181,36 @@ async def verify_webhook(
 
 
 @router.post("/")
-async def receive_webhook(
-    request: Request,
-    webhook: WhatsAppWebhook,
-    db: DBSession,
-) -> JSONResponse:
+async def receive_webhook(request: Request) -> JSONResponse:
     """
     Receive WhatsApp webhook messages.
 
     This endpoint receives incoming messages from WhatsApp users.
     It processes the message through the conversation flow.
 
+    Most callbacks are delivery statuses, so the raw payload is checked
+    first and those return before model validation. The database session
+    is only opened when a message actually needs it.
+
     Args:
         request: FastAPI request
-        webhook: WhatsApp webhook payload
 
     Returns:
         Success response
+
+    Raises:
+        RequestValidationError: If the payload is not a valid webhook
     """
     request_id = getattr(request.state, "request_id", "unknown")
 
-    logger.info(
-        "webhook_received",
-        request_id=request_id,
-        object=webhook.object,
-        entries=len(webhook.entry),
-    )
+    payload = await read_json_body(request)
 
-    # Extract messages from webhook
-    messages = parser.extract_messages(webhook)
-
-    if not messages:
+    if not _has_text_messages(payload):
         logger.info(
             "webhook_no_messages",
             request_id=request_id,
+            object=payload.get("object"),
+            entries=len(payload.get("entry") or []),
         )
         return JSONResponse(
             content=create_success_response(
@@ -121,91 +220,110 @@ async def receive_webhook(
             ).model_dump(mode='json')
         )
 
-    # Process each message
-    processed_count = 0
-    for message in messages:
-        try:
-            # Extract message data
-            phone = parser.extract_phone(message)
-            text = parser.extract_text(message)
-
-            if not text:
-                logger.warning(
-                    "message_no_text",
-                    request_id=request_id,
-                    message_type=message.type,
-                )
-                continue
+    webhook = validate_body(WhatsAppWebhook, payload)
 
-            logger.info(
-                "processing_message",
-                request_id=request_id,
-                phone=phone,
-                message_id=message.id,
-                text_length=len(text),
-            )
-
-            # Handle conversation
-            result = await conversation_handler.handle_message(
-                phone=phone,
-                message_text=text,
-                message_id=message.id,
-                request_id=request_id,
-            )
+    logger.info(
+        "webhook_received",
+        request_id=request_id,
+        object=webhook.object,
+        entries=len(webhook.entry),
+    )
 
-            logger.info(
-                "message_processed",
-                request_id=request_id,
-                phone=phone,
-                step=result.get("step"),
-                action=result.get("action"),
-            )
-
-            # If action is "generate_pix", trigger PIX generation
-            if result.get("action") == "generate_pix" and result.get("data"):
-                data = result["data"]
-                try:
-                    await pix_handler.generate_and_send_pix(
-                        db=db,
-                        phone=data["phone"],
-                        name=data["name"],
-                        condo=data["condo"],
-                        block=data["block"],
-                        apartment=data["apartment"],
-                        amount=data["amount"],
-                        request_id=request_id,
-                    )
+    # Extract messages from webhook
+    messages = parser.extract_messages(webhook)
 
-                    logger.info(
-                        "pix_generated_for_conversation",
+    # Opened on the first message that needs the database
+    db: Optional[Session] = None
+
+    # Process each message
+    processed_count = 0
+    try:
+        for message in messages:
+            try:
+                # Extract message data
+                phone = parser.extract_phone(message)
+                text = parser.extract_text(message)
+
+                if not text:
+                    logger.warning(
+                        "message_no_text",
                         request_id=request_id,
-                        phone=phone,
+                        message_type=message.type,
                     )
+                    continue
 
-                    # Reset conversation state after successful PIX generation
-                    conversation_handler.reset_state(phone)
+                logger.info(
+                    "processing_message",
+                    request_id=request_id,
+                    phone=phone,
+                    message_id=message.id,
+                    text_length=len(text),
+                )
 
-                except Exception as pix_error:
-                    logger.error(
-                        "pix_generation_failed_in_webhook",
-                        request_id=request_id,
-                        phone=phone,
-                        error=str(pix_error),
-                        exc_info=True,
-                    )
-                    # Error message already sent by pix_handler
+                # Handle conversation
+                result = await conversation_handler.handle_message(
+                    phone=phone,
+                    message_text=text,
+                    message_id=message.id,
+                    request_id=request_id,
+                )
 
-            processed_count += 1
+                logger.info(
+                    "message_processed",
+                    request_id=request_id,
+                    phone=phone,
+                    step=result.get("step"),
+                    action=result.get("action"),
+                )
 
-        except Exception as e:
-            logger.error(
-                "message_processing_error",
-                request_id=request_id,
-                error=str(e),
-                message_id=message.id,
-                exc_info=True,
-            )
-            # Continue processing other messages even if one fails
+                # If action is "generate_pix", trigger PIX generation
+                if result.get("action") == "generate_pix" and result.get("data"):
+                    data = result["data"]
+                    if db is None:
+                        db = SessionLocal()
+                    try:
+                        await _generate_pix(db, data, request_id)
+
+                    except Exception as pix_error:
+                        logger.error(
+                            "pix_generation_failed_in_webhook",
+                            request_id=request_id,
+                            phone=phone,
+                            error=str(pix_error),
+                            exc_info=True,
+                        )
+                        # Keep the session usable for the next message
+                        db.rollback()
+                        # Error message already sent by pix_handler
+                        dead_letters.record(
+                            "whatsapp",
+                            message.id,
+                            {"kind": "generate_pix", "data": data},
+                            str(pix_error),
+                            request_id,
+                        )
+
+                processed_count += 1
+
+            except Exception as e:
+                logger.error(
+                    "message_processing_error",
+                    request_id=request_id,
+                    error=str(e),
+                    message_id=message.id,
+                    exc_info=True,
+                )
+                dead_letters.record(
+                    "whatsapp",
+                    message.id,
+                    {"kind": MESSAGE_KIND, "message": message.model_dump(mode="json")},
+                    str(e),
+                    request_id,
+                )
+                # Continue processing other messages even if one fails
+    finally:
+        if db is not None:
+            db.close()
 
     response = create_success_response(
         request_id=request_id,
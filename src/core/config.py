@@ -31,6 +31,27 @@ class Settings(BaseSettings):
     db_user: str = "postgres"
     db_password: str = "postgres"
 
+    # Connection pool (per worker process); see the pix_db_pool_* metrics
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    # Log every SQL statement (very verbose)
+    db_echo: bool = False
+
+    # Optional read replica for reports/exports/reconciliation; read-only
+    # sessions fall back to the primary while it lags more than the bound
+    db_replica_url: Optional[str] = None
+    db_replica_max_lag_seconds: float = 30
+    db_replica_lag_check_seconds: float = 5
+
+    # Monthly payments partitions are created this many months in advance
+    payments_partition_months_ahead: int = 1
+
+    # Where scripts/archive_payments.py writes archived months
+    archive_dir: str = "archive"
+
     @property
     def database_url(self) -> str:
         """Construct database URL."""
@@ -44,25 +65,93 @@ class Settings(BaseSettings):
     whatsapp_business_account_id: str = ""
 
     # Mercado Pago
+    mercadopago_api_url: str = "https://api.mercadopago.com/v1"
     mercadopago_access_token: str = ""
     mercadopago_public_key: str = ""
     mercadopago_webhook_secret: Optional[str] = None
 
     # PIX Configuration
     pix_expiration_hours: int = 6
+    # A pending PIX is resent instead of creating a new charge while it is
+    # still valid for at least this long
+    pix_reuse_min_validity_minutes: int = 30
+    # QR image sent after the PIX code; media IDs are reused until they age out
+    pix_send_qr_image: bool = True
+    qr_render_workers: int = 2
+    whatsapp_media_max_age_days: int = 25
+
+    # Static PIX generated locally when Mercado Pago fails (disabled if no key;
+    # name and city are checked at startup when a key is set)
+    pix_fallback_key: Optional[str] = None
+    pix_merchant_name: str = ""
+    pix_merchant_city: str = ""
+
+    # Payment reminder campaigns (scripts/send_reminders.py). The template
+    # must be approved in WhatsApp Manager with {{1}} = name, {{2}} = month
+    reminder_template_name: str = "lembrete_pagamento"
+    reminder_template_language: str = "pt_BR"
+    reminder_concurrency: int = 5
+    reminder_rate_per_second: float = 10.0
+    reminder_batch_size: int = 200
+    reminder_max_attempts: int = 3
+    # A failed reminder waits base * 2^(attempt-1) seconds before its retry
+    reminder_retry_base_seconds: float = 300.0
 
     # Google Sheets API
     google_sheets_credentials_file: str = "credentials.json"
     google_sheets_spreadsheet_id: str = ""
     google_sheets_sheet_name: str = "Pagamentos"
+    google_sheets_api_endpoint: Optional[str] = None
+    google_sheets_token_file: str = "token.json"
+    google_sheets_refresh_margin_seconds: int = 300
+
+    # Sheets mirror: when enabled, a periodic job pushes DB diffs to the sheet
+    # and the per-event Sheets writes are skipped
+    sheets_sync_enabled: bool = False
+    sheets_sync_interval_seconds: int = 300
+
+    # Client cache (per worker); NOTIFY propagates invalidations between
+    # workers, so only turn it off when a single worker runs
+    client_cache_size: int = 1024
+    client_cache_ttl_seconds: int = 300
+    client_cache_notify: bool = True
+
+    # Scheduler: each periodic job runs on the node holding its advisory lock
+    scheduler_enabled: bool = True
+    scheduler_heartbeat_seconds: int = 10
+    scheduler_election_seconds: int = 15
+
+    # Side effects after a commit (WhatsApp, Sheets) run concurrently, each
+    # bounded by this timeout
+    side_effect_timeout_seconds: float = 30.0
+
+    # Outbox relay (every worker): side effects recorded with the change that
+    # causes them, retried with exponential backoff until they succeed
+    outbox_batch_size: int = 50
+    outbox_poll_seconds: float = 2.0
+    outbox_max_attempts: int = 8
+    outbox_retry_base_seconds: float = 10.0
+    # A claimed event is retried by another worker after this long
+    outbox_lease_seconds: int = 120
+    outbox_retention_days: int = 7
 
     # Security
     secret_key: str = "change-this-secret-key-in-production"
+    admin_secret: Optional[str] = None
     allowed_origins: str = "http://localhost:3000,http://localhost:8000"
 
     # Monitoring
     sentry_dsn: Optional[str] = None
 
+    # Profiling (per request, triggered by X-Profile-Secret header)
+    profiling_output_dir: str = "profiles"
+    profiling_interval_ms: float = 5.0
+
+    # Webhook traffic recording for replay benchmarks (empty dir = disabled);
+    # phones are pseudonymized with this salt (random per process when empty)
+    traffic_recording_dir: str = ""
+    traffic_recording_salt: str = ""
+
     @property
     def allowed_origins_list(self) -> list[str]:
         """Get allowed origins as list."""
@@ -1,24 +1,102 @@
 """Database session management."""
+import threading
+import time
+import traceback
 from collections.abc import AsyncGenerator
-from typing import Annotated
+from contextvars import ContextVar
+from typing import Annotated, Any, Optional
 
 from fastapi import Depends
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event, exc, text
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from src.core.config import settings
 from src.core.logging import get_logger
+from src.core.metrics import metrics
 
 logger = get_logger(__name__)
 
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    ``QueuePool`` that records how long checkouts take and how often they fail.
+
+    The time measured covers waiting for a free connection and, when the pool
+    grows, opening a new one: exactly what a request pays before its first
+    query.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize pool and counters."""
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_sum = 0.0
+        self._wait_max = 0.0
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            logger.warning(
+                "db_pool_timeout",
+                pool_size=self.size(),
+                overflow=self.overflow(),
+                timeout_seconds=self.timeout(),
+            )
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_sum += wait
+                self._wait_max = max(self._wait_max, wait)
+
+    def stats(self) -> dict[str, float]:
+        """Pool gauges and checkout counters."""
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts_total": self._checkouts,
+            "checkout_timeouts_total": self._timeouts,
+            "checkout_wait_seconds_sum": round(self._wait_sum, 6),
+            "checkout_wait_seconds_max": round(self._wait_max, 6),
+        }
+
+
+def _create_engine(url: str) -> Engine:
+    """Create an engine with the configured pool settings."""
+    return create_engine(
+        url,
+        echo=settings.db_echo,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+    )
+
+
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-)
+engine = _create_engine(settings.database_url)
+
+# engine.pool is replaced on dispose(), so look it up on every scrape
+metrics.register("db_pool", lambda: engine.pool.stats())
+
+# Optional streaming replica for read-only queries
+replica_engine: Optional[Engine] = None
+if settings.db_replica_url:
+    replica_engine = _create_engine(settings.db_replica_url)
+    metrics.register("db_replica_pool", lambda: replica_engine.pool.stats())
 
 # Create session factory
 SessionLocal = sessionmaker(
@@ -28,6 +106,156 @@ SessionLocal = sessionmaker(
 )
 
 
+class ReplicaRouter:
+    """
+    Session factory for read-only work: replica when fresh enough, else primary.
+
+    Replication lag is measured on the replica at most every
+    ``DB_REPLICA_LAG_CHECK_SECONDS``. While it exceeds
+    ``DB_REPLICA_MAX_LAG_SECONDS``, or the replica cannot be reached,
+    sessions are bound to the primary instead. Sessions from this factory
+    must not write.
+    """
+
+    def __init__(self, replica: Optional[Engine], primary: Engine) -> None:
+        """Initialize router."""
+        self.replica = replica
+        self.primary = primary
+        self.max_lag = settings.db_replica_max_lag_seconds
+        self.check_interval = settings.db_replica_lag_check_seconds
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._lag: Optional[float] = None
+        self.replica_sessions = 0
+        self.primary_sessions = 0
+
+    def _measure_lag(self) -> Optional[float]:
+        """Seconds the replica is behind, 0 if caught up, None if unreachable."""
+        try:
+            with self.replica.connect() as conn:
+                return float(
+                    conn.execute(
+                        text(
+                            "SELECT CASE "
+                            "WHEN NOT pg_is_in_recovery() THEN 0 "
+                            "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                            "ELSE COALESCE(EXTRACT(EPOCH FROM now() "
+                            "- pg_last_xact_replay_timestamp()), 0) END"
+                        )
+                    ).scalar()
+                )
+        except Exception as e:
+            logger.warning("db_replica_unavailable", error=str(e))
+            return None
+
+    def lag(self) -> Optional[float]:
+        """Replication lag, measured again if the last reading is too old."""
+        with self._lock:
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                was_lagging = self._lag is not None and self._lag > self.max_lag
+                self._lag = self._measure_lag()
+                self._checked_at = time.monotonic()
+                if self._lag is not None and self._lag > self.max_lag and not was_lagging:
+                    logger.warning(
+                        "db_replica_lagging",
+                        lag_seconds=round(self._lag, 3),
+                        max_lag_seconds=self.max_lag,
+                    )
+            return self._lag
+
+    def bind(self) -> Engine:
+        """Engine for the next read-only session."""
+        if self.replica is not None:
+            lag = self.lag()
+            if lag is not None and lag <= self.max_lag:
+                self.replica_sessions += 1
+                return self.replica
+        self.primary_sessions += 1
+        return self.primary
+
+    def __call__(self) -> Session:
+        """Open a read-only session."""
+        return Session(bind=self.bind(), autoflush=False)
+
+    def stats(self) -> dict[str, float]:
+        """Routing counters and last measured lag (-1 when unknown)."""
+        return {
+            "configured": int(self.replica is not None),
+            "lag_seconds": round(self._lag, 3) if self._lag is not None else -1,
+            "sessions_on_replica_total": self.replica_sessions,
+            "sessions_on_primary_total": self.primary_sessions,
+        }
+
+
+# Read-only sessions (reports, exports, reconciliation). Falls back to the
+# primary when no replica is configured.
+ReadSessionLocal = ReplicaRouter(replica_engine, engine)
+metrics.register("db_replica", ReadSessionLocal.stats)
+
+
+def release_connection(db: Session) -> None:
+    """
+    End the session's transaction so its connection goes back to the pool.
+
+    Call this before awaiting network I/O (Mercado Pago, WhatsApp, Sheets).
+    Pending changes are committed; loaded objects keep their state instead
+    of being expired, so reading them afterwards does not check out a new
+    connection.
+
+    Args:
+        db: Database session
+    """
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
+# Connections checked out by the current task (debug only), with the
+# application frame that checked each one out
+_held_connections: ContextVar[Optional[dict[int, str]]] = ContextVar(
+    "held_connections", default=None
+)
+
+
+def _checkout_site() -> str:
+    """First application frame outside SQLAlchemy in the current stack."""
+    for frame in reversed(traceback.extract_stack()):
+        if "/src/" in frame.filename and "/src/core/database.py" not in frame.filename:
+            return f"{frame.filename.rsplit('/src/', 1)[-1]}:{frame.lineno} ({frame.name})"
+    return "unknown"
+
+
+def _on_checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+    held = _held_connections.get()
+    if held is None:
+        held = {}
+        _held_connections.set(held)
+    held[id(record)] = _checkout_site()
+
+
+def _on_checkin(dbapi_connection: Any, record: Any) -> None:
+    held = _held_connections.get()
+    if held:
+        held.pop(id(record), None)
+
+
+def held_connections() -> list[str]:
+    """
+    Checkout sites of connections the current task still holds.
+
+    Only tracked in debug mode; always empty otherwise.
+    """
+    return list((_held_connections.get() or {}).values())
+
+
+if settings.debug:
+    event.listen(engine, "checkout", _on_checkout)
+    event.listen(engine, "checkin", _on_checkin)
+
+
 def get_db() -> Session:
     """
     Get database session.
@@ -51,5 +279,20 @@ def get_db() -> Session:
         db.close()
 
 
+def get_read_db() -> Session:
+    """
+    Get a read-only session, on the replica when it is fresh enough.
+
+    Yields:
+        Session: SQLAlchemy database session (must not write)
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 # Type alias for dependency injection
 DBSession = Annotated[Session, Depends(get_db)]
+ReadDBSession = Annotated[Session, Depends(get_read_db)]
@@ -0,0 +1,104 @@
+"""Timeout and failure isolation for outbox handlers.
+
+The outbox relay runs each event's handler through
+:meth:`SideEffectExecutor.execute`, which bounds it with a timeout and turns
+an exception into a "failed" outcome instead of letting it escape the batch.
+Outcomes and durations are counted per event kind for the metrics endpoint.
+
+An effect is a coroutine function or a plain callable (run in a worker
+thread). Effects must not share a database session.
+"""
+import asyncio
+import inspect
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Effect:
+    """A named side effect with its own timeout."""
+
+    name: str
+    func: Callable[[], Any]
+    timeout: Optional[float] = None
+
+
+class SideEffectExecutor:
+    """Run side effects with per-effect timeout and isolation."""
+
+    def __init__(self, default_timeout: float) -> None:
+        """Initialize executor."""
+        self.default_timeout = default_timeout
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+        self._durations: dict[str, float] = {}
+
+    def _record(self, name: str, outcome: str, duration: float) -> None:
+        with self._lock:
+            key = f"{name}_{outcome}_total"
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._durations[name] = self._durations.get(name, 0.0) + duration
+
+    async def execute(self, effect: Effect, request_id: Optional[str] = None) -> tuple[str, Optional[str]]:
+        """
+        Run one effect with its timeout; never raises.
+
+        Args:
+            effect: Effect to run
+            request_id: Request ID for tracking
+
+        Returns:
+            Outcome ("succeeded", "failed" or "timed_out") and error text
+        """
+        timeout = effect.timeout or self.default_timeout
+        start = time.perf_counter()
+        error = None
+        try:
+            if inspect.iscoroutinefunction(effect.func):
+                await asyncio.wait_for(effect.func(), timeout)
+            else:
+                # On timeout the thread finishes in the background
+                await asyncio.wait_for(asyncio.to_thread(effect.func), timeout)
+            outcome = "succeeded"
+        except asyncio.TimeoutError:
+            outcome = "timed_out"
+            error = f"timed out after {timeout}s"
+            logger.error(
+                "side_effect_timeout",
+                request_id=request_id,
+                effect=effect.name,
+                timeout_seconds=timeout,
+            )
+        except Exception as e:
+            outcome = "failed"
+            error = str(e) or type(e).__name__
+            logger.error(
+                "side_effect_failed",
+                request_id=request_id,
+                effect=effect.name,
+                error=error,
+                exc_info=True,
+            )
+        self._record(effect.name, outcome, time.perf_counter() - start)
+        return outcome, error
+
+    def stats(self) -> dict[str, float]:
+        """Outcome counters and total duration per effect."""
+        with self._lock:
+            values: dict[str, float] = dict(self._counts)
+            for name, duration in self._durations.items():
+                values[f"{name}_duration_seconds_sum"] = round(duration, 6)
+            return values
+
+
+# Global instance
+side_effects = SideEffectExecutor(default_timeout=settings.side_effect_timeout_seconds)
+metrics.register("side_effects", side_effects.stats)
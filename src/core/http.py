@@ -0,0 +1,44 @@
+"""Outbound HTTP client factory."""
+from typing import Any
+
+import httpx
+
+from src.core.config import settings
+from src.core.database import held_connections
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+async def _warn_held_connections(request: httpx.Request) -> None:
+    """Flag requests sent while the task holds a database connection."""
+    held = held_connections()
+    if held:
+        logger.warning(
+            "db_connection_held_during_http",
+            method=request.method,
+            url=str(request.url.copy_with(query=None)),
+            connections=len(held),
+            checked_out_at=held,
+        )
+
+
+def http_client(**kwargs: Any) -> httpx.AsyncClient:
+    """
+    Create an ``httpx.AsyncClient`` for calls to external services.
+
+    In debug mode every request is checked for database connections held by
+    the calling task: a slow provider would otherwise keep them out of the
+    pool for the whole call. Release them first with
+    :func:`src.core.database.release_connection`.
+
+    Args:
+        **kwargs: Passed to ``httpx.AsyncClient``
+
+    Returns:
+        HTTP client (use as an async context manager)
+    """
+    if settings.debug:
+        hooks = kwargs.setdefault("event_hooks", {})
+        hooks.setdefault("request", []).append(_warn_held_connections)
+    return httpx.AsyncClient(**kwargs)
@@ -0,0 +1,57 @@
+"""In-process metrics exposed in Prometheus text format.
+
+Components register a collector returning ``{metric_name: value}``; the
+registry calls every collector when ``GET /metrics`` is scraped, so there is
+no per-event bookkeeping beyond the counters each component already keeps.
+"""
+from typing import Callable, Union
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+Number = Union[int, float]
+Collector = Callable[[], dict[str, Number]]
+
+
+class MetricsRegistry:
+    """Registry of metric collectors."""
+
+    def __init__(self, prefix: str = "pix") -> None:
+        """Initialize registry."""
+        self.prefix = prefix
+        self._collectors: dict[str, Collector] = {}
+
+    def register(self, name: str, collector: Collector) -> None:
+        """
+        Register (or replace) a collector.
+
+        Args:
+            name: Collector name, used as metric name prefix
+            collector: Callable returning metric values
+        """
+        self._collectors[name] = collector
+
+    def collect(self) -> dict[str, Number]:
+        """
+        Collect all metrics.
+
+        Returns:
+            Fully qualified metric name -> value
+        """
+        values: dict[str, Number] = {}
+        for name, collector in self._collectors.items():
+            try:
+                for metric, value in collector().items():
+                    values[f"{self.prefix}_{name}_{metric}"] = value
+            except Exception as e:
+                logger.error("metrics_collector_failed", collector=name, error=str(e))
+        return values
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        return "".join(f"{metric} {value}\n" for metric, value in sorted(self.collect().items()))
+
+
+# Global instance
+metrics = MetricsRegistry()
@@ -1,16 +1,29 @@
 """Middleware for request tracking and logging."""
+import asyncio
 import hashlib
+import hmac
+import re
 import time
 from datetime import datetime
+from pathlib import Path
 from typing import Callable
 
 from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src.core.config import settings
 from src.core.logging import get_logger
+from src.core.profiling import SamplingProfiler
+from src.core.recording import RECORDED_PATHS, traffic_recorder
 
 logger = get_logger(__name__)
 
+# Profile files are named after the request ID, restricted to these characters
+UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+MAX_PROFILE_NAME_LENGTH = 100
+
 
 def generate_request_id() -> str:
     """
@@ -66,3 +79,129 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         )
 
         return response
+
+
+class ProfilerMiddleware:
+    """
+    Profile a single request on demand.
+
+    A request carrying ``X-Profile-Secret`` equal to ``ADMIN_SECRET`` runs
+    under :class:`SamplingProfiler` and its collapsed stacks are written to
+    ``PROFILING_OUTPUT_DIR/<request_id>.collapsed``. Other requests only pay
+    for a header lookup, and nothing at all when no admin secret is set.
+
+    Implemented as plain ASGI middleware so the downstream app runs in the
+    same task that is being profiled.
+    """
+
+    header_name = "x-profile-secret"
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize middleware."""
+        self.app = app
+
+    @staticmethod
+    def _finish(profiler: SamplingProfiler, output: Path) -> int:
+        """Stop the profiler and write its samples (blocking, off the event loop)."""
+        profiler.stop()
+        return profiler.write_collapsed(output)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the request, under the profiler if requested."""
+        if scope["type"] != "http" or not settings.admin_secret:
+            await self.app(scope, receive, send)
+            return
+
+        provided = Headers(scope=scope).get(self.header_name)
+        # Bytes: compare_digest rejects non-ASCII str, and the header is client input
+        if not provided or not hmac.compare_digest(
+            provided.encode(), settings.admin_secret.encode()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # The request ID may come from the client (X-Request-ID): keep it a file name
+        request_id = scope.get("state", {}).get("request_id") or generate_request_id()
+        file_stem = (
+            UNSAFE_FILENAME_CHARS.sub("_", request_id)[:MAX_PROFILE_NAME_LENGTH]
+            or generate_request_id()
+        )
+        output = Path(settings.profiling_output_dir) / f"{file_stem}.collapsed"
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-File"] = output.name
+            await send(message)
+
+        profiler = SamplingProfiler(
+            asyncio.current_task(),
+            interval=settings.profiling_interval_ms / 1000,
+        )
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            samples = await asyncio.to_thread(self._finish, profiler, output)
+            logger.info(
+                "request_profile_written",
+                request_id=request_id,
+                path=scope.get("path"),
+                file=str(output),
+                samples=samples,
+            )
+
+
+class TrafficRecorderMiddleware:
+    """
+    Record webhook requests for offline replay.
+
+    When ``TRAFFIC_RECORDING_DIR`` is set, POSTs to the WhatsApp and Mercado
+    Pago webhooks are written by :data:`traffic_recorder` (body with phone
+    numbers anonymized, arrival time, inter-arrival gap and response status)
+    after the response is sent. Other requests pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize middleware."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the request, capturing its body if it is recorded."""
+        if (
+            not traffic_recorder.enabled
+            or scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in RECORDED_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        arrived_at, gap = traffic_recorder.arrival()
+        chunks: list[bytes] = []
+        status: list[int] = []
+
+        async def receive_and_capture() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                chunks.append(message.get("body", b""))
+            return message
+
+        async def send_and_capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive_and_capture, send_and_capture)
+        finally:
+            try:
+                traffic_recorder.record(
+                    arrived_at,
+                    gap,
+                    scope["method"],
+                    scope["path"],
+                    status[0] if status else None,
+                    b"".join(chunks),
+                )
+            except Exception as e:
+                logger.error("traffic_recording_failed", path=scope["path"], error=str(e))
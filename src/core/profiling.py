@@ -0,0 +1,143 @@
+"""Sampling profiler for single requests.
+
+Samples the event loop thread at a fixed interval and attributes each sample
+to the request's asyncio task. When the task is running, the thread stack is
+recorded; when it is suspended (awaiting Mercado Pago, WhatsApp, the thread
+pool...), the chain of awaiting coroutines is recorded instead, so the
+profile is wall-clock and covers the whole path of the request.
+
+Output is in collapsed-stack format (``frame;frame;frame count``), which
+speedscope, flamegraph.pl and inferno read directly.
+"""
+import asyncio
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any, Optional
+
+PROJECT_ROOT = str(Path(__file__).resolve().parents[2]) + os.sep
+
+
+def _short_filename(filename: str) -> str:
+    """Shorten a source path to something readable in a flamegraph."""
+    if filename.startswith(PROJECT_ROOT):
+        return filename[len(PROJECT_ROOT):]
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Label a frame as ``qualname (file:line)``."""
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    label = f"{name} ({_short_filename(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+
+def _coroutine_frame(awaitable: Any) -> Optional[FrameType]:
+    """Return the frame of a coroutine, generator or async generator."""
+    for attr in ("cr_frame", "gi_frame", "ag_frame"):
+        frame = getattr(awaitable, attr, None)
+        if frame is not None:
+            return frame
+    return None
+
+
+def _awaited(awaitable: Any) -> Any:
+    """Return what a suspended coroutine or generator is waiting on."""
+    for attr in ("cr_await", "gi_yieldfrom", "ag_await"):
+        target = getattr(awaitable, attr, None)
+        if target is not None:
+            return target
+    return None
+
+
+class SamplingProfiler:
+    """Statistical wall-clock profiler for one asyncio task."""
+
+    def __init__(self, task: asyncio.Task, interval: float = 0.005) -> None:
+        """
+        Initialize profiler.
+
+        Args:
+            task: Task running the request
+            interval: Seconds between samples
+        """
+        self.task = task
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        self._sampler.join()
+
+    def _run(self) -> None:
+        """Sampler loop."""
+        while not self._stop.wait(self.interval):
+            if self.task.done():
+                break
+            stack = self._sample()
+            if stack:
+                self.samples[";".join(stack)] += 1
+
+    def _sample(self) -> list[str]:
+        """Take one sample of the task, outermost frame first."""
+        root = _coroutine_frame(self.task.get_coro())
+        if root is None:
+            return []
+
+        # Running: the task's root frame is on the loop thread's stack
+        frame = sys._current_frames().get(self._thread_id)
+        thread_stack: list[FrameType] = []
+        while frame is not None:
+            thread_stack.append(frame)
+            if frame is root:
+                return [_frame_label(f) for f in reversed(thread_stack)]
+            frame = frame.f_back
+
+        # Suspended: follow the chain of awaiting coroutines
+        labels: list[str] = []
+        awaitable: Any = self.task.get_coro()
+        while awaitable is not None:
+            coro_frame = _coroutine_frame(awaitable)
+            if coro_frame is not None:
+                labels.append(_frame_label(coro_frame))
+                awaitable = _awaited(awaitable)
+            elif isinstance(awaitable, asyncio.Task):
+                awaitable = awaitable.get_coro()
+            else:
+                labels.append(f"[await {type(awaitable).__name__}]")
+                break
+
+        return labels
+
+    def write_collapsed(self, path: Path) -> int:
+        """
+        Write samples in collapsed-stack format.
+
+        Args:
+            path: Output file
+
+        Returns:
+            Number of samples written
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as output:
+            for stack, count in self.samples.most_common():
+                output.write(f"{stack} {count}\n")
+        return sum(self.samples.values())
@@ -0,0 +1,302 @@
+"""Recording of webhook traffic for offline replay.
+
+Each recorded request is one JSON line in a gzip file: arrival wall-clock
+time, gap since the previous recorded request, path, response status and the
+request body. Phone numbers are replaced by pseudonyms before anything is
+written, both in phone fields and inside free text such as message bodies;
+the same phone always gets the same pseudonym within a recording (HMAC with
+``TRAFFIC_RECORDING_SALT``, or a random per-process salt), so a replayed
+conversation still reaches the same client.
+
+The request path only queues the raw request; a writer thread anonymizes,
+compresses and writes the queue, flushing every ``FLUSH_INTERVAL_SECONDS``
+so the file stays readable while the app runs.
+
+``scripts/loadtest/replay.py`` reads these files back.
+"""
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Only these routes are recorded
+RECORDED_PATHS = frozenset({"/webhooks/whatsapp/", "/webhooks/mercadopago/"})
+
+# JSON keys whose values are phone numbers (WhatsApp contacts, messages, statuses)
+PHONE_KEYS = frozenset({"wa_id", "from", "recipient_id", "phone", "phone_number"})
+
+# JSON keys whose string values are identifiers or times, never free text
+# (Mercado Pago payment IDs and WhatsApp timestamps look like phones)
+OPAQUE_KEYS = frozenset({"id", "timestamp", "user_id"})
+
+# Phone-like digit runs in free text (message bodies, bodies that are not JSON)
+PHONE_PATTERN = re.compile(r"(?<!\d)\d{10,13}(?!\d)")
+
+# Queued requests are written and flushed at least this often
+FLUSH_INTERVAL_SECONDS = 1.0
+
+# Requests queued while the writer is behind; more are dropped
+MAX_QUEUED_RECORDS = 10000
+
+# Queued after the last request to stop the writer
+_STOP = object()
+
+
+class PhoneAnonymizer:
+    """Replace phone numbers with stable pseudonyms of the same shape."""
+
+    def __init__(self, salt: str) -> None:
+        """
+        Initialize anonymizer.
+
+        Args:
+            salt: HMAC key; the same salt maps a phone to the same pseudonym
+        """
+        self._key = salt.encode()
+        self._cache: dict[str, str] = {}
+
+    def phone(self, value: str) -> str:
+        """
+        Pseudonym for one phone number.
+
+        Keeps the length and the ``55`` country code, so the pseudonym is
+        still accepted wherever the original was.
+
+        Args:
+            value: Phone number (digits)
+
+        Returns:
+            Pseudonymous phone number
+        """
+        cached = self._cache.get(value)
+        if cached is not None:
+            return cached
+        digest = hmac.new(self._key, value.encode(), hashlib.sha256).hexdigest()
+        digits = str(int(digest, 16))
+        prefix = "55" if value.startswith("55") else ""
+        pseudonym = (prefix + digits)[: len(value)]
+        self._cache[value] = pseudonym
+        return pseudonym
+
+    def payload(self, value: Any, key: Optional[str] = None) -> Any:
+        """
+        Copy of a JSON value with phone fields and phones in text replaced.
+
+        Args:
+            value: Parsed JSON
+            key: Key under which ``value`` was found
+
+        Returns:
+            Anonymized copy
+        """
+        if isinstance(value, dict):
+            return {k: self.payload(v, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.payload(item, key) for item in value]
+        if key in PHONE_KEYS and isinstance(value, (str, int)) and str(value).isdigit():
+            anonymized = self.phone(str(value))
+            return anonymized if isinstance(value, str) else int(anonymized)
+        if isinstance(value, str) and key not in OPAQUE_KEYS:
+            # Free text, e.g. a client typing a phone in text.body
+            return self.text(value)
+        return value
+
+    def text(self, value: str) -> str:
+        """Replace phone-like digit runs in free text."""
+        return PHONE_PATTERN.sub(lambda match: self.phone(match.group()), value)
+
+
+class TrafficRecorder:
+    """Append anonymized webhook requests to a compressed JSONL file."""
+
+    def __init__(self, output_dir: str, salt: Optional[str] = None) -> None:
+        """
+        Initialize recorder.
+
+        Args:
+            output_dir: Directory of the recordings; empty disables recording
+            salt: Pseudonym salt; random per process when empty
+        """
+        self.output_dir = output_dir
+        self.anonymizer = PhoneAnonymizer(salt or secrets.token_hex(16))
+        self.recorded = 0
+        self.dropped = 0
+        self._file: Optional[IO[bytes]] = None
+        self.path: Optional[Path] = None
+        self._last_arrival: Optional[float] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=MAX_QUEUED_RECORDS)
+        self._writer: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether requests are recorded."""
+        return bool(self.output_dir)
+
+    def arrival(self) -> tuple[float, float]:
+        """
+        Mark the arrival of a recorded request.
+
+        Returns:
+            Wall-clock time and seconds since the previous arrival
+        """
+        now = time.monotonic()
+        gap = 0.0 if self._last_arrival is None else now - self._last_arrival
+        self._last_arrival = now
+        return time.time(), gap
+
+    def _open(self) -> IO[bytes]:
+        """Open this process's recording file on first use."""
+        directory = Path(self.output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        self.path = directory / f"webhooks-{stamp}-{os.getpid()}.jsonl.gz"
+        self._file = gzip.open(self.path, "ab")
+        logger.info("traffic_recording_started", file=str(self.path))
+        return self._file
+
+    def record(
+        self,
+        arrived_at: float,
+        gap: float,
+        method: str,
+        path: str,
+        status: Optional[int],
+        body: bytes,
+    ) -> None:
+        """
+        Queue one request for the writer thread; never blocks.
+
+        Args:
+            arrived_at: Wall-clock arrival time
+            gap: Seconds since the previous recorded request
+            method: HTTP method
+            path: Request path
+            status: Response status (None if the app failed)
+            body: Raw request body
+        """
+        if self._writer is None:
+            self._start()
+        try:
+            self._queue.put_nowait((arrived_at, gap, method, path, status, body))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1:
+                logger.warning("traffic_recording_behind", queued=MAX_QUEUED_RECORDS)
+
+    def _start(self) -> None:
+        """Start the writer thread on first use."""
+        with self._start_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run, name="traffic-recorder", daemon=True
+                )
+                self._writer.start()
+
+    def _line(self, item: tuple) -> bytes:
+        """Anonymized JSON line of a queued request."""
+        arrived_at, gap, method, path, status, body = item
+        try:
+            payload: Any = self.anonymizer.payload(json.loads(body))
+            is_json = True
+        except ValueError:
+            payload = self.anonymizer.text(body.decode("utf-8", errors="replace"))
+            is_json = False
+
+        line = json.dumps(
+            {
+                "ts": round(arrived_at, 6),
+                "gap": round(gap, 6),
+                "method": method,
+                "path": path,
+                "status": status,
+                "json": is_json,
+                "body": payload,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return line.encode() + b"\n"
+
+    def _run(self) -> None:
+        """Writer loop: write what is queued, flush at most once per interval."""
+        output = self._file or self._open()
+        last_flush = time.monotonic()
+        unflushed = False
+        while True:
+            try:
+                item = self._queue.get(timeout=FLUSH_INTERVAL_SECONDS)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                break
+            if item is not None:
+                try:
+                    output.write(self._line(item))
+                    self.recorded += 1
+                    unflushed = True
+                except Exception as e:
+                    logger.error("traffic_recording_failed", path=item[3], error=str(e))
+            if unflushed and time.monotonic() - last_flush >= FLUSH_INTERVAL_SECONDS:
+                output.flush()
+                last_flush = time.monotonic()
+                unflushed = False
+
+    def close(self) -> None:
+        """Write what is still queued and finish the recording file."""
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(
+                "traffic_recording_closed",
+                file=str(self.path),
+                requests=self.recorded,
+                dropped=self.dropped,
+            )
+
+
+def read_recording(path: Path) -> list[dict[str, Any]]:
+    """
+    Read a recording, including one whose writer did not close it.
+
+    Args:
+        path: Recording file
+
+    Returns:
+        Recorded requests in file order
+    """
+    records = []
+    with gzip.open(path, "rt", encoding="utf-8") as recording:
+        try:
+            for line in recording:
+                if line.strip():
+                    records.append(json.loads(line))
+        except (EOFError, json.JSONDecodeError):
+            # Writer still running or killed: keep the complete lines
+            pass
+    return records
+
+
+# Global instance
+traffic_recorder = TrafficRecorder(
+    settings.traffic_recording_dir,
+    settings.traffic_recording_salt,
+)
@@ -0,0 +1,251 @@
+"""Periodic background jobs with leader election across nodes.
+
+Every node registers the same jobs, but each job only runs on the node
+holding its Postgres advisory lock. Locks are session-level and live on one
+dedicated connection per node: if the node dies or loses its connection,
+Postgres releases the locks and another node takes over on its next
+election attempt.
+
+A heartbeat keeps the lock connection alive and notices when it is gone;
+leadership is also re-checked right before every run, so a node that lost
+its connection never runs a job another node already owns.
+"""
+import asyncio
+import inspect
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+# First key of the two-key advisory lock form, so our locks never collide
+# with advisory locks taken by other applications on the same database
+LOCK_NAMESPACE = 0x504958  # "PIX"
+
+
+def lock_key(name: str) -> int:
+    """Stable signed 32-bit advisory lock key for a job name."""
+    value = zlib.crc32(name.encode())
+    return value - 2**32 if value >= 2**31 else value
+
+
+@dataclass
+class Job:
+    """A periodic job and its run statistics."""
+
+    name: str
+    interval: float
+    func: Callable[[], Any]
+    on_elected: Optional[Callable[[], Any]] = None
+    key: int = 0
+    is_leader: bool = False
+    runs: int = 0
+    failures: int = 0
+    last_run_at: float = 0.0
+    last_success_at: float = 0.0
+    last_duration: float = 0.0
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class Scheduler:
+    """Run registered jobs on exactly one node each."""
+
+    def __init__(self) -> None:
+        """Initialize scheduler."""
+        self.heartbeat_interval = settings.scheduler_heartbeat_seconds
+        self.election_interval = settings.scheduler_election_seconds
+        self.jobs: dict[str, Job] = {}
+        self._conn: Any = None
+        self._conn_lock = asyncio.Lock()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    def register(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Any],
+        on_elected: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """
+        Register a periodic job.
+
+        Args:
+            name: Unique job name (also the advisory lock identity)
+            interval: Seconds between runs
+            func: Coroutine function, or plain function run in a thread
+            on_elected: Called when this node becomes leader, e.g. to drop
+                state another leader may have made stale
+        """
+        self.jobs[name] = Job(
+            name=name,
+            interval=interval,
+            func=func,
+            on_elected=on_elected,
+            key=lock_key(name),
+        )
+
+    # Lock connection -------------------------------------------------------
+
+    def _connect(self) -> Any:
+        """Open the dedicated autocommit connection that holds the locks."""
+        import psycopg2
+
+        conn = psycopg2.connect(settings.database_url)
+        conn.autocommit = True
+        return conn
+
+    def _query(self, sql: str, params: tuple = ()) -> Any:
+        """Run a single-value query on the lock connection (blocking)."""
+        if self._conn is None or self._conn.closed:
+            self._conn = self._connect()
+        with self._conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+
+    async def _execute(self, sql: str, params: tuple = ()) -> Any:
+        """Run a query on the lock connection, dropping leadership on error."""
+        async with self._conn_lock:
+            try:
+                return await asyncio.to_thread(self._query, sql, params)
+            except Exception:
+                self._lose_connection()
+                raise
+
+    def _lose_connection(self) -> None:
+        """Forget the connection; the server has released (or will release) our locks."""
+        for job in self.jobs.values():
+            if job.is_leader:
+                logger.warning("scheduler_leadership_lost", job=job.name)
+            job.is_leader = False
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    async def _try_acquire(self, job: Job) -> bool:
+        """Try to become leader for a job."""
+        acquired = await self._execute(
+            "SELECT pg_try_advisory_lock(%s, %s)", (LOCK_NAMESPACE, job.key)
+        )
+        if acquired and not job.is_leader:
+            logger.info("scheduler_leader_elected", job=job.name)
+            if job.on_elected is not None:
+                job.on_elected()
+        job.is_leader = bool(acquired)
+        return job.is_leader
+
+    async def _still_leader(self, job: Job) -> bool:
+        """Confirm this node's session still holds the job's lock."""
+        held = await self._execute(
+            "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' "
+            "AND pid = pg_backend_pid() AND classid = %s::oid AND objid = %s::oid "
+            "AND objsubid = 2 AND granted",
+            (LOCK_NAMESPACE, job.key & 0xFFFFFFFF),
+        )
+        job.is_leader = bool(held)
+        return job.is_leader
+
+    async def _heartbeat(self) -> None:
+        """Keep the lock connection alive and detect when it drops."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if self._conn is None:
+                continue
+            try:
+                await self._execute("SELECT 1")
+            except Exception as e:
+                logger.error("scheduler_heartbeat_failed", error=str(e))
+
+    # Job loop --------------------------------------------------------------
+
+    async def _run_once(self, job: Job) -> None:
+        """Run a job once and record its statistics."""
+        start = time.perf_counter()
+        job.last_run_at = time.time()
+        job.runs += 1
+        try:
+            if inspect.iscoroutinefunction(job.func):
+                await job.func()
+            else:
+                await asyncio.to_thread(job.func)
+            job.last_success_at = time.time()
+        except Exception as e:
+            job.failures += 1
+            logger.error(
+                "scheduler_job_failed",
+                job=job.name,
+                error=str(e),
+                exc_info=True,
+            )
+        finally:
+            job.last_duration = time.perf_counter() - start
+
+    async def _loop(self, job: Job) -> None:
+        """Elect, run and wait, forever."""
+        while True:
+            try:
+                if job.is_leader:
+                    leader = await self._still_leader(job)
+                else:
+                    leader = await self._try_acquire(job)
+            except Exception as e:
+                logger.error("scheduler_election_failed", job=job.name, error=str(e))
+                leader = False
+
+            if leader:
+                await self._run_once(job)
+                await asyncio.sleep(job.interval)
+            else:
+                await asyncio.sleep(self.election_interval)
+
+    def start(self) -> None:
+        """Start the heartbeat and one loop per registered job."""
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(
+                self._heartbeat(), name="scheduler-heartbeat"
+            )
+        for job in self.jobs.values():
+            if job.task is None or job.task.done():
+                job.task = asyncio.create_task(self._loop(job), name=f"job-{job.name}")
+        logger.info("scheduler_started", jobs=list(self.jobs))
+
+    async def stop(self) -> None:
+        """Stop all jobs and release every lock by closing the connection."""
+        tasks = [job.task for job in self.jobs.values() if job.task is not None]
+        if self._heartbeat_task is not None:
+            tasks.append(self._heartbeat_task)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for job in self.jobs.values():
+            job.task = None
+            job.is_leader = False
+        self._heartbeat_task = None
+        self._lose_connection()
+        logger.info("scheduler_stopped")
+
+    def stats(self) -> dict[str, float]:
+        """Per-job metrics."""
+        values: dict[str, float] = {}
+        for job in self.jobs.values():
+            values[f"{job.name}_leader"] = int(job.is_leader)
+            values[f"{job.name}_runs_total"] = job.runs
+            values[f"{job.name}_failures_total"] = job.failures
+            values[f"{job.name}_last_duration_seconds"] = round(job.last_duration, 6)
+            values[f"{job.name}_last_run_timestamp_seconds"] = round(job.last_run_at, 3)
+            values[f"{job.name}_last_success_timestamp_seconds"] = round(job.last_success_at, 3)
+        return values
+
+
+# Global instance
+scheduler = Scheduler()
+metrics.register("scheduler", scheduler.stats)
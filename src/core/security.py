@@ -0,0 +1,31 @@
+"""Security dependencies for administrative endpoints."""
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from src.core.config import settings
+
+
+def require_admin(
+    x_admin_secret: Optional[str] = Header(None, alias="x-admin-secret"),
+) -> None:
+    """
+    Require the ``X-Admin-Secret`` header to match ``ADMIN_SECRET``.
+
+    Admin endpoints are disabled entirely while no admin secret is set.
+
+    Args:
+        x_admin_secret: Secret sent by the caller
+
+    Raises:
+        HTTPException: If the secret is missing or wrong
+    """
+    if not settings.admin_secret:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+
+    # Bytes: compare_digest rejects non-ASCII str, and the header is client input
+    if not x_admin_secret or not hmac.compare_digest(
+        x_admin_secret.encode(), settings.admin_secret.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin secret")
@@ -1,16 +1,33 @@
 """Main FastAPI application."""
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from src.api import mercadopago, pix, whatsapp
+from src.api import clients, mercadopago, payments, pix, reports, whatsapp
 from src.core.config import settings
 from src.core.logging import configure_logging, get_logger
-from src.core.middleware import RequestIDMiddleware
+from src.core.metrics import metrics
+from src.core.middleware import (
+    ProfilerMiddleware,
+    RequestIDMiddleware,
+    TrafficRecorderMiddleware,
+)
+from src.core.recording import traffic_recorder
+from src.core.scheduler import scheduler
+from src.core.security import require_admin
 from src.schemas.responses import create_error_response, create_success_response
+from src.services.client_cache import client_cache
+from src.services.outbox import outbox_relay
+from src.services.partitions import CHECK_INTERVAL_SECONDS, ensure_payment_partitions
+from src.services.pix_handler import check_local_pix_config
+from src.services.qr_renderer import qr_renderer
+from src.services.sheets_credentials import sheets_credentials
+from src.services.sheets_service import sheets_service
+from src.services.sheets_sync import sheets_sync
 
 # Configure logging
 configure_logging()
@@ -28,9 +45,52 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         version="0.1.0",
     )
 
+    # A misconfigured PIX fallback must not wait for a Mercado Pago outage
+    check_local_pix_config()
+
+    # QR workers start before the app's threads and first request
+    if settings.pix_send_qr_image:
+        qr_renderer.start()
+
+    # Drop cached clients when another worker changes them
+    if settings.client_cache_notify:
+        client_cache.start()
+
+    # Build the Sheets client off the event loop, before traffic arrives,
+    # then keep its token fresh in the background. If startup fails, the
+    # refresher keeps retrying the credentials and requests build the client.
+    if sheets_service.spreadsheet_id:
+        await asyncio.to_thread(sheets_service.prepare)
+        sheets_credentials.start()
+        if settings.sheets_sync_enabled:
+            scheduler.register(
+                "sheets_sync",
+                settings.sheets_sync_interval_seconds,
+                sheets_sync.sync,
+                # The previous leader may have changed the sheet since our snapshot
+                on_elected=sheets_sync.invalidate,
+            )
+
+    # Execute outbox events (every worker; claims never overlap)
+    outbox_relay.start()
+    scheduler.register("outbox_purge", 3600, outbox_relay.purge)
+
+    # Next month's payments partition exists before its first payment
+    scheduler.register("payment_partitions", CHECK_INTERVAL_SECONDS, ensure_payment_partitions)
+
+    # Periodic jobs, each run by whichever node wins its leader election
+    if settings.scheduler_enabled:
+        scheduler.start()
+
     yield
 
     # Shutdown
+    await scheduler.stop()
+    await outbox_relay.stop()
+    await sheets_credentials.stop()
+    await client_cache.stop()
+    qr_renderer.shutdown()
+    traffic_recorder.close()
     logger.info("application_shutdown", app_name=settings.app_name)
 
 
@@ -53,6 +113,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record webhook traffic when TRAFFIC_RECORDING_DIR is set
+app.add_middleware(TrafficRecorderMiddleware)
+
+# Add on-demand profiler (inside request ID so profiles are named after it)
+app.add_middleware(ProfilerMiddleware)
+
 # Add request ID middleware
 app.add_middleware(RequestIDMiddleware)
 
@@ -60,6 +126,9 @@ app.add_middleware(RequestIDMiddleware)
 app.include_router(pix.router)
 app.include_router(whatsapp.router)
 app.include_router(mercadopago.router)
+app.include_router(payments.router)
+app.include_router(reports.router)
+app.include_router(clients.router)
 
 
 # Health check endpoint
@@ -81,6 +150,13 @@ async def health_check(request: Request) -> JSONResponse:
     return JSONResponse(content=response.model_dump(mode='json'))
 
 
+# Metrics endpoint
+@app.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def metrics_endpoint() -> PlainTextResponse:
+    """In-process metrics in Prometheus text format."""
+    return PlainTextResponse(metrics.render())
+
+
 # Root endpoint
 @app.get("/")
 async def root(request: Request) -> JSONResponse:
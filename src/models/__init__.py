@@ -1,6 +1,10 @@
 """Database models."""
 from src.models.base import Base, TimestampMixin
 from src.models.client import Client
+from src.models.dead_letter import DeadLetter
+from src.models.monthly_summary import MonthlySummary
+from src.models.outbox import OutboxEvent
 from src.models.payment import Payment
+from src.models.reminder_delivery import ReminderDelivery
 
-__all__ = ["Base", "TimestampMixin", "Client", "Payment"]
+__all__ = ["Base", "TimestampMixin", "Client", "DeadLetter", "MonthlySummary", "OutboxEvent", "Payment", "ReminderDelivery"]
@@ -0,0 +1,54 @@
+"""Dead letter model."""
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base, TimestampMixin
+
+
+class DeadLetter(Base, TimestampMixin):
+    """
+    Webhook event whose processing failed, kept for replay.
+
+    Webhooks are always acknowledged with 200, so without this row a failed
+    event would not be delivered again. The same event failing again
+    increments ``attempts`` instead of adding a row.
+    """
+
+    __tablename__ = "dead_letters"
+    __table_args__ = (
+        UniqueConstraint("source", "event_key", name="uq_dead_letters_source_event_key"),
+        Index("ix_dead_letters_status_source", "status", "source"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    source: Mapped[str] = mapped_column(
+        String(50), nullable=False, comment="mercadopago, whatsapp"
+    )
+    event_key: Mapped[str] = mapped_column(
+        String(255), nullable=False, comment="Notification or message ID"
+    )
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    error: Mapped[str] = mapped_column(Text, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="pending",
+        comment="pending, resolved, discarded",
+    )
+    request_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_failed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    resolved_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<DeadLetter(id={self.id}, source='{self.source}', "
+            f"event_key='{self.event_key}', status='{self.status}')>"
+        )
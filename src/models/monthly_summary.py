@@ -0,0 +1,45 @@
+"""Monthly collection summary model."""
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, Integer, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class MonthlySummary(Base):
+    """
+    Per condo and month collection totals.
+
+    Maintained incrementally by PaymentService; rebuilt from payments with
+    ``scripts/rebuild_monthly_summary.py``.
+    """
+
+    __tablename__ = "monthly_summaries"
+
+    condo: Mapped[str] = mapped_column(String(255), primary_key=True)
+    month_ref: Mapped[str] = mapped_column(
+        String(7), primary_key=True, comment="Format: YYYY-MM"
+    )
+    billed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    billed_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+    paid_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    paid_amount: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2), nullable=False, default=0, comment="Amount collected"
+    )
+    pending_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    expired_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<MonthlySummary(condo='{self.condo}', month_ref='{self.month_ref}', "
+            f"billed={self.billed_count}, paid={self.paid_count})>"
+        )
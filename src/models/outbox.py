@@ -0,0 +1,53 @@
+"""Outbox model."""
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base, TimestampMixin
+
+
+class OutboxEvent(Base, TimestampMixin):
+    """
+    Side effect recorded in the same transaction as the change causing it.
+
+    The outbox relay executes pending events and retries failures, so an
+    effect survives a crash between the commit and its execution. There is
+    deliberately no foreign key to ``payments``: its primary key is
+    (id, month_ref) and events outlive archived months.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        # Relay claims: only rows still to be processed
+        Index(
+            "ix_outbox_available_at",
+            "available_at",
+            postgresql_where=text("status IN ('pending', 'processing')"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(
+        String(50), nullable=False, comment="Handler name, e.g. payment_confirmation"
+    )
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="pending",
+        comment="pending, processing, done, failed",
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<OutboxEvent(id={self.id}, kind='{self.kind}', status='{self.status}')>"
@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, String
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base, TimestampMixin
@@ -12,14 +12,27 @@ if TYPE_CHECKING:
 
 
 class Payment(Base, TimestampMixin):
-    """Payment model representing a PIX payment."""
+    """
+    Payment model representing a PIX payment.
+
+    In Postgres the table is partitioned by ``month_ref`` (see the
+    ``partition_payments_by_month`` migration), so its primary key is
+    (id, month_ref). ``id`` alone still identifies a row: it comes from a
+    single sequence shared by all partitions.
+    """
 
     __tablename__ = "payments"
+    __table_args__ = (
+        # Keyset pagination and ordered exports
+        Index("ix_payments_created_at_id", "created_at", "id"),
+        # Unique indexes on a partitioned table must include the partition key
+        Index("ix_payments_request_id", "request_id", "month_ref", unique=True),
+        # One row per Mercado Pago charge; concurrent retries cannot both insert it
+        Index("ix_payments_mp_payment_id", "mp_payment_id", "month_ref", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    request_id: Mapped[str] = mapped_column(
-        String(100), unique=True, nullable=False, index=True
-    )
+    request_id: Mapped[str] = mapped_column(String(100), nullable=False)
     client_id: Mapped[int] = mapped_column(
         ForeignKey("clients.id", ondelete="CASCADE"), nullable=False, index=True
     )
@@ -35,7 +48,7 @@ class Payment(Base, TimestampMixin):
         comment="pending, approved, expired, cancelled",
     )
     mp_payment_id: Mapped[Optional[str]] = mapped_column(
-        String(255), nullable=True, index=True, comment="Mercado Pago payment ID"
+        String(255), nullable=True, comment="Mercado Pago payment ID"
     )
     external_reference: Mapped[str] = mapped_column(
         String(500), nullable=False, comment="PIX|YYYY-MM|VALOR|TELEFONE|APARTAMENTO"
@@ -43,6 +56,18 @@ class Payment(Base, TimestampMixin):
     paid_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    pix_code: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, comment="PIX copy-paste code"
+    )
+    pix_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    qr_media_id: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True, comment="WhatsApp media ID of the PIX QR image"
+    )
+    qr_media_uploaded_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     client: Mapped["Client"] = relationship("Client", back_populates="payments")
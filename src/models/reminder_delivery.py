@@ -0,0 +1,59 @@
+"""Reminder delivery model."""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base, TimestampMixin
+
+
+class ReminderDelivery(Base, TimestampMixin):
+    """
+    One payment reminder per client and month.
+
+    The primary key makes campaigns idempotent: re-running a month only
+    sends to clients whose reminder is still pending or failed.
+    """
+
+    __tablename__ = "reminder_deliveries"
+    __table_args__ = (Index("ix_reminder_deliveries_month_ref_status", "month_ref", "status"),)
+
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True
+    )
+    month_ref: Mapped[str] = mapped_column(
+        String(7), primary_key=True, comment="Format: YYYY-MM"
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="pending",
+        comment="pending, sending, sent, failed, skipped",
+    )
+    template: Mapped[str] = mapped_column(String(255), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    message_id: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True, comment="WhatsApp message ID"
+    )
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="Not claimed before this time (retry backoff)",
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<ReminderDelivery(client_id={self.client_id}, month_ref='{self.month_ref}', "
+            f"status='{self.status}')>"
+        )
@@ -1,4 +1,5 @@
 """PIX schemas for API requests and responses."""
+from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel, Field
@@ -26,6 +27,8 @@ class PIXCreateResponse(BaseModel):
     qr_code_base64: Optional[str] = Field(None, description="QR code image in base64")
     amount: float
     expiration_hours: int
+    expires_at: Optional[datetime] = Field(None, description="PIX expiration")
+    reused: bool = Field(False, description="True if an existing pending PIX was returned")
     external_reference: str
     month_ref: str
 
@@ -41,6 +44,8 @@ class PIXCreateResponse(BaseModel):
                 "qr_code_base64": "iVBORw0KGgo...",
                 "amount": 70.0,
                 "expiration_hours": 6,
+                "expires_at": "2025-01-10T16:30:00Z",
+                "reused": False,
                 "external_reference": "PIX|2025-01|70.00|5511999999999|101",
                 "month_ref": "2025-01",
             }
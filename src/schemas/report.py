@@ -0,0 +1,20 @@
+"""Report schemas for API responses."""
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class MonthlySummaryResponse(BaseModel):
+    """Collection totals for one condo and month."""
+
+    condo: str
+    month_ref: str
+    billed_count: int
+    billed_amount: float
+    paid_count: int
+    paid_amount: float
+    pending_count: int
+    expired_count: int
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
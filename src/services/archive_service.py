@@ -0,0 +1,335 @@
+"""Archive closed months of payments to compressed files and restore them.
+
+An archive is a gzip-compressed CSV of one month of payments joined with
+their clients, written with ``COPY ... TO STDOUT`` straight from Postgres,
+plus a JSON manifest with row count, amount total, id range and the file's
+SHA-256. The file is read back and checked against the database before the
+month is removed: its partition is detached (and dropped), or its rows are
+deleted from the default partition.
+
+Monthly summary rows are kept, so reports still cover archived months.
+"""
+import csv
+import gzip
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from src.core.database import engine
+from src.core.logging import get_logger
+from src.models.payment import Payment
+
+logger = get_logger(__name__)
+
+CLIENT_COLUMNS = ["name", "phone", "condo", "block", "apartment"]
+
+_MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+
+# Bytes per read when hashing and restoring
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveError(Exception):
+    """Raised when a month cannot be archived or restored safely."""
+
+
+def _sha256(path: Path) -> str:
+    """SHA-256 of a file."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _partition_name(month_ref: str) -> str:
+    """Name of a month's payments partition."""
+    return "payments_" + month_ref.replace("-", "_")
+
+
+class PaymentArchiver:
+    """Move closed months of payments between Postgres and archive files."""
+
+    @staticmethod
+    def paths(directory: Path, month_ref: str) -> tuple[Path, Path]:
+        """Data file and manifest paths for a month."""
+        return (
+            directory / f"payments_{month_ref}.csv.gz",
+            directory / f"payments_{month_ref}.manifest.json",
+        )
+
+    @staticmethod
+    def _month_table(cursor: Any, month_ref: str) -> tuple[str, bool]:
+        """Table holding a month's rows and whether it is its own partition."""
+        name = _partition_name(month_ref)
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_inherits "
+            "WHERE inhparent = 'payments'::regclass AND inhrelid = to_regclass(%s))",
+            (name,),
+        )
+        if cursor.fetchone()[0]:
+            return name, True
+        return "payments_default", False
+
+    @staticmethod
+    def _verify_file(path: Path, expected_rows: int, expected_amount: Decimal) -> None:
+        """Read an archive back and compare its row count and amount total."""
+        rows = 0
+        amount = Decimal("0")
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                rows += 1
+                amount += Decimal(row["amount"])
+        if rows != expected_rows or amount != expected_amount:
+            raise ArchiveError(
+                f"Archive check failed for {path.name}: {rows} rows / {amount} "
+                f"in file, {expected_rows} rows / {expected_amount} in database"
+            )
+
+    def archive_month(
+        self,
+        month_ref: str,
+        directory: Path,
+        prune: bool = True,
+        detach_only: bool = False,
+        force: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Archive one month and remove it from Postgres.
+
+        Writes to the month are blocked (``SHARE`` lock on its partition,
+        taken before the transaction's snapshot) from the export until the
+        removal commits, so the file and the removed rows are the same
+        snapshot.
+
+        Args:
+            month_ref: Month reference (YYYY-MM)
+            directory: Output directory
+            prune: Remove the month from Postgres after a verified export
+            detach_only: Detach the month's partition but keep the table
+            force: Archive even if the month is not closed
+
+        Returns:
+            Manifest
+
+        Raises:
+            ArchiveError: If the month is open, empty, already archived or
+                the export does not match the database
+        """
+        if not _MONTH_PATTERN.match(month_ref):
+            raise ArchiveError(f"Invalid month reference: {month_ref}")
+        if month_ref >= datetime.now(timezone.utc).strftime("%Y-%m") and not force:
+            raise ArchiveError(f"{month_ref} is not closed yet")
+
+        directory.mkdir(parents=True, exist_ok=True)
+        data_path, manifest_path = self.paths(directory, month_ref)
+        if manifest_path.exists():
+            raise ArchiveError(f"{manifest_path} already exists")
+
+        payment_columns = [column.name for column in Payment.__table__.columns]
+        client_columns = [f"client_{column}" for column in CLIENT_COLUMNS]
+        select_list = ", ".join(
+            [f"p.{column}" for column in payment_columns]
+            + [f"c.{column} AS client_{column}" for column in CLIENT_COLUMNS]
+        )
+
+        partial_path = data_path.with_suffix(".gz.partial")
+        conn = engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            # Resolved in a transaction of its own: under REPEATABLE READ the
+            # first query takes the snapshot, and that must follow the lock
+            table, own_partition = self._month_table(cursor, month_ref)
+            conn.commit()
+
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cursor.execute(f'LOCK TABLE "{table}" IN SHARE MODE')
+            # Creating or detaching the month's partition needs a lock on this
+            # table, so once granted the answer cannot change; check that it
+            # did not change before (this query also takes the snapshot)
+            if self._month_table(cursor, month_ref) != (table, own_partition):
+                raise ArchiveError(f"Partitions of {month_ref} changed meanwhile; retry")
+
+            cursor.execute(
+                "SELECT count(*), coalesce(sum(amount), 0), min(id), max(id), "
+                "count(*) FILTER (WHERE status = 'pending') "
+                "FROM payments WHERE month_ref = %s",
+                (month_ref,),
+            )
+            rows, amount, min_id, max_id, pending = cursor.fetchone()
+            if rows == 0:
+                raise ArchiveError(f"No payments for {month_ref}")
+            if pending and not force:
+                raise ArchiveError(f"{month_ref} still has {pending} pending payments")
+
+            query = cursor.mogrify(
+                f"COPY (SELECT {select_list} FROM payments p "
+                "JOIN clients c ON c.id = p.client_id "
+                "WHERE p.month_ref = %s ORDER BY p.id) "
+                "TO STDOUT WITH (FORMAT csv, HEADER)",
+                (month_ref,),
+            ).decode()
+            with gzip.open(partial_path, "wb") as f:
+                cursor.copy_expert(query, f)
+
+            self._verify_file(partial_path, rows, amount)
+            partial_path.replace(data_path)
+
+            action = None
+            if prune:
+                if own_partition:
+                    cursor.execute(f'ALTER TABLE payments DETACH PARTITION "{table}"')
+                    action = "detached"
+                    if not detach_only:
+                        cursor.execute(f'DROP TABLE "{table}"')
+                        action = "dropped"
+                else:
+                    cursor.execute("DELETE FROM payments_default WHERE month_ref = %s", (month_ref,))
+                    if cursor.rowcount != rows:
+                        raise ArchiveError(
+                            f"Deleted {cursor.rowcount} rows, archived {rows}; rolled back"
+                        )
+                    action = "deleted"
+
+            manifest = {
+                "month_ref": month_ref,
+                "file": data_path.name,
+                "format": "csv+gzip",
+                "payment_columns": payment_columns,
+                "client_columns": client_columns,
+                "rows": rows,
+                "amount_sum": str(amount),
+                "min_id": min_id,
+                "max_id": max_id,
+                "sha256": _sha256(data_path),
+                "bytes": data_path.stat().st_size,
+                "archived_at": datetime.now(timezone.utc).isoformat(),
+                "pruned": action,
+            }
+            manifest_path.write_text(json.dumps(manifest, indent=2) + "\n")
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            # Nothing was removed, so files from this run would be misleading
+            for path in (partial_path, data_path, manifest_path):
+                path.unlink(missing_ok=True)
+            raise
+        finally:
+            conn.close()
+
+        logger.info(
+            "payments_month_archived",
+            month_ref=month_ref,
+            rows=rows,
+            file=str(data_path),
+            pruned=action,
+        )
+        return manifest
+
+    @staticmethod
+    def verify_archive(manifest_path: Path) -> dict[str, Any]:
+        """
+        Check an archive file against its manifest.
+
+        Args:
+            manifest_path: Manifest path
+
+        Returns:
+            Manifest
+
+        Raises:
+            ArchiveError: If the file is missing or its checksum, row count
+                or amount total differ from the manifest
+        """
+        manifest = json.loads(manifest_path.read_text())
+        data_path = manifest_path.parent / manifest["file"]
+        if not data_path.exists():
+            raise ArchiveError(f"{data_path} is missing")
+        if _sha256(data_path) != manifest["sha256"]:
+            raise ArchiveError(f"Checksum mismatch for {data_path}")
+        PaymentArchiver._verify_file(data_path, manifest["rows"], Decimal(manifest["amount_sum"]))
+        return manifest
+
+    def restore_month(self, manifest_path: Path) -> int:
+        """
+        Load an archived month back into ``payments`` in one transaction.
+
+        Args:
+            manifest_path: Manifest path
+
+        Returns:
+            Rows restored
+
+        Raises:
+            ArchiveError: If the archive fails verification, the month still
+                has rows in Postgres or its detached partition still exists
+        """
+        manifest = self.verify_archive(manifest_path)
+        month_ref = manifest["month_ref"]
+        data_path = manifest_path.parent / manifest["file"]
+
+        payment_columns = manifest["payment_columns"]
+        client_columns = manifest["client_columns"]
+
+        conn = engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT count(*) FROM payments WHERE month_ref = %s", (month_ref,))
+            if cursor.fetchone()[0]:
+                raise ArchiveError(f"{month_ref} already has payments in the database")
+
+            name = _partition_name(month_ref)
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (name,))
+            table_exists = cursor.fetchone()[0]
+            _, own_partition = self._month_table(cursor, month_ref)
+            if table_exists and not own_partition:
+                raise ArchiveError(
+                    f"Detached table {name} still exists: reattach it with "
+                    f"ALTER TABLE payments ATTACH PARTITION {name} FOR VALUES IN ('{month_ref}')"
+                )
+            cursor.execute("SELECT ensure_payments_partition(%s)", (month_ref,))
+
+            cursor.execute(
+                "CREATE TEMP TABLE payments_restore (LIKE payments) ON COMMIT DROP"
+            )
+            for column in client_columns:
+                cursor.execute(f'ALTER TABLE payments_restore ADD COLUMN "{column}" text')
+
+            column_list = ", ".join(f'"{column}"' for column in payment_columns + client_columns)
+            with gzip.open(data_path, "rb") as f:
+                cursor.copy_expert(
+                    f"COPY payments_restore ({column_list}) FROM STDIN WITH (FORMAT csv, HEADER)",
+                    f,
+                    size=CHUNK_SIZE,
+                )
+
+            payment_list = ", ".join(f'"{column}"' for column in payment_columns)
+            cursor.execute(
+                f"INSERT INTO payments ({payment_list}) "
+                f"SELECT {payment_list} FROM payments_restore WHERE month_ref = %s",
+                (month_ref,),
+            )
+            restored = cursor.rowcount
+            if restored != manifest["rows"]:
+                raise ArchiveError(
+                    f"Restored {restored} rows, manifest lists {manifest['rows']}; rolled back"
+                )
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        logger.info("payments_month_restored", month_ref=month_ref, rows=restored)
+        return restored
+
+
+# Global instance
+payment_archiver = PaymentArchiver()
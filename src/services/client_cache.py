@@ -0,0 +1,241 @@
+"""In-process cache of client records keyed by phone.
+
+Entries hold plain column values, never ORM instances, so they are safe to
+share between sessions and threads. :meth:`ClientCache.attach` turns an
+entry back into a persistent ``Client`` in the caller's session without a
+SELECT.
+
+Each worker has its own cache. Writes invalidate the local entry and, unless
+``CLIENT_CACHE_NOTIFY`` is turned off (single worker), send a Postgres
+``NOTIFY`` on commit so the other workers drop theirs too.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.core.metrics import metrics
+from src.models.client import Client
+
+logger = get_logger(__name__)
+
+NOTIFY_CHANNEL = "client_cache_invalidate"
+
+# Notification payload that clears the whole cache (bulk writes)
+CLEAR_ALL = "*"
+
+# Wait before reconnecting the LISTEN connection
+RETRY_DELAY_SECONDS = 5
+
+
+class ClientCache:
+    """Bounded TTL/LRU cache of client column values."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        """Initialize cache."""
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(phone: str) -> str:
+        """
+        Cache key for a phone number.
+
+        The phone exactly as stored and queried (``Client.phone == phone``),
+        not normalized: a spelling the database does not match must miss
+        here too, or the answer would depend on whether the cache is warm.
+        """
+        return phone
+
+    def get(self, phone: str) -> Optional[dict[str, Any]]:
+        """
+        Get cached column values for a phone.
+
+        Args:
+            phone: Phone number
+
+        Returns:
+            Column values or None on miss/expiry
+        """
+        if self.max_size <= 0:
+            return None
+
+        key = self.key(phone)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, client: Client) -> None:
+        """
+        Cache a client's current column values.
+
+        Args:
+            client: Loaded client
+        """
+        if self.max_size <= 0:
+            return
+
+        key = self.key(client.phone)
+        values = {attr.key: getattr(client, attr.key) for attr in inspect(Client).column_attrs}
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, phone: str) -> None:
+        """
+        Drop a phone from this worker's cache.
+
+        Args:
+            phone: Phone number
+        """
+        with self._lock:
+            if self._entries.pop(self.key(phone), None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate_everywhere(self, db: Session, phone: str) -> None:
+        """
+        Invalidate locally and, if enabled, queue a NOTIFY for other workers.
+
+        The notification is delivered when the caller's transaction commits,
+        so other workers never reload the old row after seeing it.
+
+        Args:
+            db: Database session (transaction not yet committed)
+            phone: Phone number
+        """
+        self.invalidate(phone)
+        if settings.client_cache_notify:
+            db.execute(
+                text("SELECT pg_notify(:channel, :phone)"),
+                {"channel": NOTIFY_CHANNEL, "phone": self.key(phone)},
+            )
+
+    @staticmethod
+    def attach(db: Session, values: dict[str, Any]) -> Client:
+        """
+        Turn cached values into a persistent client in ``db`` without a query.
+
+        Args:
+            db: Database session
+            values: Cached column values
+
+        Returns:
+            Client attached to the session
+        """
+        client = Client(**values)
+        make_transient_to_detached(client)
+        return db.merge(client, load=False)
+
+    def stats(self) -> dict[str, int]:
+        """Cache counters."""
+        return {
+            "hits_total": self.hits,
+            "misses_total": self.misses,
+            "evictions_total": self.evictions,
+            "invalidations_total": self.invalidations,
+            "size": len(self._entries),
+        }
+
+    def _connect(self) -> Any:
+        """Open a dedicated autocommit connection listening on the channel."""
+        import psycopg2
+
+        conn = psycopg2.connect(settings.database_url)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        return conn
+
+    async def _run(self) -> None:
+        """Listen for invalidations from other workers, reconnecting on error."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            conn = None
+            try:
+                conn = await asyncio.to_thread(self._connect)
+                # Notifications may have been missed while disconnected
+                self.clear()
+                logger.info("client_cache_listening", channel=NOTIFY_CHANNEL)
+
+                closed: asyncio.Future = loop.create_future()
+
+                def on_readable(conn: Any, closed: asyncio.Future) -> None:
+                    try:
+                        conn.poll()
+                    except Exception as e:
+                        if not closed.done():
+                            closed.set_exception(e)
+                        return
+                    while conn.notifies:
+                        payload = conn.notifies.pop(0).payload
+                        if payload == CLEAR_ALL:
+                            self.clear()
+                        else:
+                            self.invalidate(payload)
+
+                loop.add_reader(conn.fileno(), partial(on_readable, conn, closed))
+                try:
+                    await closed
+                finally:
+                    loop.remove_reader(conn.fileno())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("client_cache_listen_failed", error=str(e))
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def start(self) -> None:
+        """Start listening for cross-worker invalidations."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="client-cache-listen")
+
+    async def stop(self) -> None:
+        """Stop the listener."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global instance
+client_cache = ClientCache(
+    max_size=settings.client_cache_size,
+    ttl_seconds=settings.client_cache_ttl_seconds,
+)
+metrics.register("client_cache", client_cache.stats)
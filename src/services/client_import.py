@@ -0,0 +1,250 @@
+"""Bulk import of clients from CSV.
+
+Rows are validated and normalized in Python, staged into a temporary table
+with ``COPY ... FROM STDIN`` and merged into ``clients`` with a single
+``INSERT ... ON CONFLICT (phone) DO UPDATE``, all in one transaction. Rows
+whose values did not change are left alone, so re-importing the same file
+is a no-op.
+"""
+import csv
+import io
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from src.core.config import settings
+from src.core.database import engine
+from src.core.logging import get_logger
+from src.services.client_cache import CLEAR_ALL, NOTIFY_CHANNEL, client_cache
+from src.services.message_parser import MessageParser
+
+logger = get_logger(__name__)
+
+# CSV columns and their maximum length (same limits as the clients table)
+COLUMNS = {
+    "name": 255,
+    "phone": 20,
+    "condo": 255,
+    "block": 50,
+    "apartment": 50,
+}
+
+# Prefixed to phones given without country code (DDD + number)
+DEFAULT_COUNTRY_CODE = "55"
+
+# Rejected rows listed individually in the result; the rest are only counted
+MAX_REJECTED_DETAILS = 100
+
+
+class ClientImportError(Exception):
+    """Raised when a file cannot be imported at all (e.g. missing columns)."""
+
+
+@dataclass
+class ImportResult:
+    """Outcome of one import."""
+
+    total: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    rejected: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    dry_run: bool = False
+
+    def reject(self, line: int, reason: str) -> None:
+        """Count a rejected row, keeping the first few reasons."""
+        self.rejected += 1
+        if len(self.errors) < MAX_REJECTED_DETAILS:
+            self.errors.append({"line": line, "reason": reason})
+
+    def as_dict(self) -> dict[str, Any]:
+        """Result as plain values."""
+        return {
+            "total": self.total,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "dry_run": self.dry_run,
+        }
+
+
+def normalize_import_phone(phone: str) -> str:
+    """
+    Normalize a phone to the format WhatsApp reports (country code + digits).
+
+    Args:
+        phone: Phone as typed in the spreadsheet
+
+    Returns:
+        Digits only, with the default country code added when missing
+    """
+    digits = MessageParser.normalize_phone(phone)
+    if len(digits) in (10, 11):
+        digits = DEFAULT_COUNTRY_CODE + digits
+    return digits
+
+
+class ClientImporter:
+    """Validate, stage and merge client rows from CSV."""
+
+    def _parse(
+        self,
+        lines: Iterable[str],
+        result: ImportResult,
+        default_condo: Optional[str],
+    ) -> io.StringIO:
+        """
+        Validate rows and write the accepted ones as CSV for ``COPY``.
+
+        Args:
+            lines: CSV text, header first
+            result: Result to record totals and rejections in
+            default_condo: Condo for rows that leave it blank
+
+        Returns:
+            Buffer with the accepted rows, positioned at the start
+
+        Raises:
+            ClientImportError: If the header lacks a required column
+        """
+        reader = csv.reader(lines)
+        try:
+            header = [column.strip().lower() for column in next(reader)]
+        except StopIteration:
+            raise ClientImportError("Empty file") from None
+
+        missing = [column for column in COLUMNS if column not in header]
+        if missing and not (missing == ["condo"] and default_condo):
+            raise ClientImportError(f"Missing columns: {', '.join(missing)}")
+        positions = {column: header.index(column) for column in COLUMNS if column in header}
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        seen: dict[str, int] = {}
+
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            result.total += 1
+            line = reader.line_num
+
+            values = {
+                column: row[index].strip() if index < len(row) else ""
+                for column, index in positions.items()
+            }
+            if not values.get("condo") and default_condo:
+                values["condo"] = default_condo
+
+            empty = [column for column in COLUMNS if not values.get(column)]
+            if empty:
+                result.reject(line, f"empty {', '.join(empty)}")
+                continue
+
+            values["phone"] = normalize_import_phone(values["phone"])
+            if not 12 <= len(values["phone"]) <= COLUMNS["phone"]:
+                result.reject(line, f"invalid phone {row[positions['phone']].strip()!r}")
+                continue
+
+            too_long = [column for column, limit in COLUMNS.items() if len(values[column]) > limit]
+            if too_long:
+                result.reject(line, f"too long: {', '.join(too_long)}")
+                continue
+
+            # One statement cannot update the same row twice
+            if values["phone"] in seen:
+                result.reject(line, f"duplicate phone (first on line {seen[values['phone']]})")
+                continue
+            seen[values["phone"]] = line
+
+            writer.writerow([values[column] for column in COLUMNS])
+
+        buffer.seek(0)
+        return buffer
+
+    def import_csv(
+        self,
+        lines: Iterable[str],
+        default_condo: Optional[str] = None,
+        dry_run: bool = False,
+    ) -> ImportResult:
+        """
+        Import clients from CSV, inserting new phones and updating known ones.
+
+        Phones are matched exactly after normalization, as stored by the
+        WhatsApp flow.
+
+        Args:
+            lines: CSV text with a header (name, phone, condo, block, apartment)
+            default_condo: Condo for rows that leave it blank (column optional)
+            dry_run: Run the merge and report counts, then roll back
+
+        Returns:
+            Import result
+
+        Raises:
+            ClientImportError: If the header lacks a required column
+        """
+        result = ImportResult(dry_run=dry_run)
+        buffer = self._parse(lines, result, default_condo)
+        staged = result.total - result.rejected
+
+        if staged:
+            column_list = ", ".join(COLUMNS)
+            changed = " OR ".join(
+                f"clients.{column} IS DISTINCT FROM EXCLUDED.{column}"
+                for column in COLUMNS
+                if column != "phone"
+            )
+            updates = ", ".join(
+                f"{column} = EXCLUDED.{column}" for column in COLUMNS if column != "phone"
+            )
+
+            conn = engine.raw_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "CREATE TEMP TABLE clients_import "
+                    "(name text, phone text, condo text, block text, apartment text) "
+                    "ON COMMIT DROP"
+                )
+                cursor.copy_expert(
+                    f"COPY clients_import ({column_list}) FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+                # xmax is 0 only for rows this statement inserted
+                cursor.execute(
+                    f"WITH merged AS ("
+                    f"INSERT INTO clients ({column_list}) "
+                    f"SELECT {column_list} FROM clients_import "
+                    f"ON CONFLICT (phone) DO UPDATE SET {updates} WHERE {changed} "
+                    f"RETURNING (xmax = 0) AS inserted) "
+                    f"SELECT count(*) FILTER (WHERE inserted), "
+                    f"count(*) FILTER (WHERE NOT inserted) FROM merged"
+                )
+                result.inserted, result.updated = cursor.fetchone()
+                result.unchanged = staged - result.inserted - result.updated
+
+                if dry_run:
+                    conn.rollback()
+                else:
+                    if result.updated and settings.client_cache_notify:
+                        # Delivered on commit
+                        cursor.execute("SELECT pg_notify(%s, %s)", (NOTIFY_CHANNEL, CLEAR_ALL))
+                    conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+            if result.updated and not dry_run:
+                client_cache.clear()
+
+        logger.info("clients_imported", **{k: v for k, v in result.as_dict().items() if k != "errors"})
+        return result
+
+
+# Global instance
+client_importer = ClientImporter()
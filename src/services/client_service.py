@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from src.core.logging import get_logger
 from src.models.client import Client
 from src.schemas.client import ClientCreate, ClientUpdate
+from src.services.client_cache import client_cache
 
 logger = get_logger(__name__)
 
@@ -32,6 +33,9 @@ class ClientService:
         """
         Get client by phone number.
 
+        Served from the in-process client cache when possible; the returned
+        client is attached to ``db`` either way.
+
         Args:
             db: Database session
             phone: Phone number
@@ -39,7 +43,14 @@ class ClientService:
         Returns:
             Client or None if not found
         """
-        return db.query(Client).filter(Client.phone == phone).first()
+        cached = client_cache.get(phone)
+        if cached is not None:
+            return client_cache.attach(db, cached)
+
+        client = db.query(Client).filter(Client.phone == phone).first()
+        if client is not None:
+            client_cache.put(client)
+        return client
 
     @staticmethod
     def create(db: Session, client_data: ClientCreate) -> Client:
@@ -68,8 +79,10 @@ class ClientService:
         )
 
         db.add(client)
+        client_cache.invalidate_everywhere(db, client.phone)
         db.commit()
         db.refresh(client)
+        client_cache.put(client)
 
         logger.info(
             "client_created",
@@ -103,12 +116,18 @@ class ClientService:
         )
 
         update_data = client_data.model_dump(exclude_unset=True)
+        old_phone = client.phone
 
         for field, value in update_data.items():
             setattr(client, field, value)
 
+        client_cache.invalidate_everywhere(db, old_phone)
+        if client.phone != old_phone:
+            client_cache.invalidate_everywhere(db, client.phone)
+
         db.commit()
         db.refresh(client)
+        client_cache.put(client)
 
         logger.info(
             "client_updated",
@@ -140,8 +159,16 @@ class ClientService:
                 client_id=existing_client.id,
                 phone=client_data.phone,
             )
-            # Update existing client data
-            update_data = ClientUpdate(**client_data.model_dump())
+            # Update existing client data, skipping the write when unchanged
+            changes = {
+                field: value
+                for field, value in client_data.model_dump().items()
+                if getattr(existing_client, field) != value
+            }
+            if not changes:
+                return existing_client, False
+
+            update_data = ClientUpdate(**changes)
             updated_client = ClientService.update(db, existing_client, update_data)
             return updated_client, False
 
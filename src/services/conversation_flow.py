@@ -0,0 +1,277 @@
+"""Declarative onboarding flow for the WhatsApp bot.
+
+The flow is a table of :class:`Step` (state name, data field, prompt,
+validator and the labels that introduce the field in free text), compiled
+once into a :class:`ConversationFlow`. The next step is always the first one
+whose field is still missing, so a message that answers several fields at
+once skips their steps::
+
+    João Silva, Condomínio Flores, bloco B, apto 101, plano 2
+
+Segments are separated by commas, semicolons or line breaks. A message is
+only split across fields when it has one segment per missing field (in
+order, from the step being asked) or when some segments start with a label;
+then only the labeled segments are taken. Any other message is a single
+answer to the question asked, commas included. Before the first question
+only labeled segments count, so a greeting is never taken for an answer.
+
+The collected fields are echoed back (:meth:`ConversationFlow.summary`) and
+confirmed before the PIX is generated.
+"""
+import re
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from src.services.message_parser import MessageParser
+
+# Separators between answers in one message
+SEGMENT_SEPARATORS = re.compile(r"[,;\n]+")
+
+# Sent before the first prompt of a conversation
+WELCOME = "Olá! Bem-vindo ao sistema de pagamentos PIX via WhatsApp.\n\n"
+
+# Replies to the confirmation question
+CONFIRM_YES = re.compile(r"^\s*(?:sim|s|ok|confirmo|confirmado|certo|isso)(?![^\W\d_])", re.IGNORECASE)
+CONFIRM_NO = re.compile(r"^\s*(?:n[aã]o|n)(?![^\W\d_])", re.IGNORECASE)
+
+CONFIRM_PROMPT = (
+    "Confira seus dados:\n\n{summary}\n\n"
+    "Está tudo certo? Responda *SIM* para gerar o PIX.\n"
+    "Para corrigir um campo, envie por exemplo: bloco C\n"
+    "Para recomeçar, responda *NÃO*."
+)
+
+
+@dataclass(frozen=True)
+class Step:
+    """One question of the flow."""
+
+    name: str
+    field: str
+    # Shown when the answers are echoed back for confirmation
+    title: str
+    action: str
+    prompt: str
+    validate: Callable[[str], Optional[str]]
+    # Regex alternatives that introduce the field at the start of a segment
+    labels: tuple[str, ...] = ()
+    # Keep the label as part of the value (e.g. "Condomínio Flores")
+    keep_label: bool = False
+    retry_action: Optional[str] = None
+    retry_prompt: Optional[str] = None
+    # How the stored value is shown in the confirmation
+    describe: Callable[[str], str] = str
+
+
+def not_empty(value: str) -> Optional[str]:
+    """Accept any non-empty answer."""
+    return value or None
+
+
+def min_length(length: int) -> Callable[[str], Optional[str]]:
+    """Accept answers with at least ``length`` characters."""
+
+    def validate(value: str) -> Optional[str]:
+        return value if len(value) >= length else None
+
+    return validate
+
+
+def plan_option(value: str) -> Optional[str]:
+    """Accept a plan option (1, 2 or 3)."""
+    return value if MessageParser.is_valid_plan_option(value) else None
+
+
+def plan_description(option: str) -> str:
+    """Plan option with its monthly amount."""
+    return f"{option} (R$ {MessageParser.get_plan_value(option):.2f})"
+
+
+class ConversationFlow:
+    """Steps of a conversation and the parser of their answers."""
+
+    def __init__(self, steps: list[Step]) -> None:
+        """
+        Compile the flow.
+
+        Args:
+            steps: Steps in the order they are asked
+        """
+        self.steps = steps
+        self._by_name = {step.name: step for step in steps}
+        self._by_field = {step.field: step for step in steps}
+        alternatives = "|".join(
+            f"(?P<{step.field}>{'|'.join(step.labels)})" for step in steps if step.labels
+        )
+        # A label is a whole word at the start of the segment, then ":", "-" etc.
+        self._labels = re.compile(
+            rf"^(?:{alternatives})(?![^\W\d_])[\s:.\-]*", re.IGNORECASE
+        )
+
+    def step(self, name: str) -> Optional[Step]:
+        """Step with this state name, if any."""
+        return self._by_name.get(name)
+
+    def next_step(self, data: dict) -> Optional[Step]:
+        """
+        First step whose field is still missing.
+
+        Args:
+            data: Collected answers
+
+        Returns:
+            Step to ask, or None when every field is filled
+        """
+        for step in self.steps:
+            if step.field not in data:
+                return step
+        return None
+
+    def parse(
+        self,
+        text: str,
+        data: dict,
+        current: Optional[Step],
+    ) -> tuple[dict[str, str], set[str]]:
+        """
+        Extract answers from a message.
+
+        Args:
+            text: Message text
+            data: Answers collected so far
+            current: Step being asked; None before the first question (and
+                for corrections), when only labeled answers are taken
+
+        Returns:
+            Valid answers by field, and fields whose answer was rejected
+        """
+        # (field of its label or None, value) per segment
+        segments: list[tuple[Optional[str], str]] = []
+        for segment in SEGMENT_SEPARATORS.split(text):
+            segment = segment.strip()
+            if not segment:
+                continue
+            match = self._labels.match(segment)
+            if match is None:
+                segments.append((None, segment))
+                continue
+            step = self._by_field[match.lastgroup]
+            value = segment if step.keep_label else segment[match.end():].strip()
+            segments.append((step.field, value))
+
+        missing = []
+        if current is not None:
+            missing = [
+                step.field
+                for step in self.steps[self.steps.index(current):]
+                if step.field not in data
+            ]
+
+        if (
+            len(segments) > 1
+            and len(segments) == len(missing)
+            and all(field in (None, expected) for (field, _), expected in zip(segments, missing, strict=True))
+        ):
+            # One answer per missing field, in the order they are asked
+            answers = {expected: value for (_, value), expected in zip(segments, missing, strict=True)}
+        elif any(field for field, _ in segments):
+            # Unlabeled segments next to labeled ones are ambiguous ("Olá")
+            answers = {field: value for field, value in segments if field}
+        elif current is not None:
+            # A single answer to the question asked, as typed
+            answers = {current.field: text.strip()}
+        else:
+            answers = {}
+
+        accepted: dict[str, str] = {}
+        rejected: set[str] = set()
+        for field, value in answers.items():
+            valid = self._by_field[field].validate(value)
+            if valid is None:
+                rejected.add(field)
+            else:
+                accepted[field] = valid
+        return accepted, rejected
+
+    def summary(self, data: dict) -> str:
+        """
+        Collected answers, one line per field, for confirmation.
+
+        Args:
+            data: Answers (every field filled)
+
+        Returns:
+            Text listing each field's title and value
+        """
+        return "\n".join(
+            f"{step.title}: {step.describe(data[step.field])}" for step in self.steps
+        )
+
+
+# Global instance
+onboarding_flow = ConversationFlow(
+    [
+        Step(
+            name="COLLECT_NAME",
+            field="name",
+            title="Nome",
+            action="collect_name",
+            prompt=(
+                "Vou coletar algumas informações para gerar seu PIX de pagamento mensal.\n\n"
+                "Dica: você pode enviar tudo em uma mensagem, por exemplo:\n"
+                "João Silva, Condomínio Flores, bloco B, apto 101, plano 2\n\n"
+                "Para começar, qual é o seu nome completo?"
+            ),
+            validate=min_length(3),
+            labels=("nome", "meu nome [eé]"),
+            retry_action="retry_name",
+            retry_prompt="Por favor, digite seu nome completo (mínimo 3 caracteres).",
+        ),
+        Step(
+            name="COLLECT_CONDO",
+            field="condo",
+            title="Condomínio",
+            action="collect_condo",
+            prompt="Obrigado, {name}!\n\nAgora, qual é o nome do seu condomínio?",
+            validate=not_empty,
+            labels=(r"condom[ií]nio", "condo", r"cond\.", "residencial", r"edif[ií]cio"),
+            keep_label=True,
+        ),
+        Step(
+            name="COLLECT_BLOCK",
+            field="block",
+            title="Bloco/torre",
+            action="collect_block",
+            prompt="Qual é o bloco/torre do seu apartamento?",
+            validate=not_empty,
+            labels=("bloco", "torre", "bl"),
+        ),
+        Step(
+            name="COLLECT_APARTMENT",
+            field="apartment",
+            title="Apartamento",
+            action="collect_apartment",
+            prompt="Qual é o número do seu apartamento?",
+            validate=not_empty,
+            labels=("apartamento", "apto", "ap"),
+        ),
+        Step(
+            name="SELECT_PLAN",
+            field="plan",
+            title="Plano",
+            action="select_plan",
+            prompt=(
+                "Perfeito! Agora selecione o plano desejado:\n\n"
+                "1️⃣ Individual - R$ 70,00\n"
+                "2️⃣ 2 pessoas - R$ 90,00\n"
+                "3️⃣ 4 pessoas - R$ 100,00\n\n"
+                "Digite o número do plano (1, 2 ou 3):"
+            ),
+            validate=plan_option,
+            labels=("plano", "op[cç][aã]o"),
+            describe=plan_description,
+            retry_action="retry_plan",
+            retry_prompt="Opção inválida. Por favor, digite 1, 2 ou 3 para selecionar o plano.",
+        ),
+    ]
+)
@@ -1,8 +1,22 @@
-"""Conversation handler for WhatsApp bot flow."""
+"""Conversation handler for WhatsApp bot flow.
+
+The steps, prompts and validation live in :mod:`src.services.conversation_flow`.
+When the last fields are filled by a message that answered several of them at
+once, the answers are echoed back (CONFIRM step) and the PIX is only generated
+after the client confirms them; answering one question at a time generates it
+directly.
+"""
 from typing import Optional
 
 from src.core.logging import get_logger
 from src.schemas.whatsapp import ConversationState
+from src.services.conversation_flow import (
+    CONFIRM_NO,
+    CONFIRM_PROMPT,
+    CONFIRM_YES,
+    WELCOME,
+    onboarding_flow,
+)
 from src.services.message_parser import MessageParser
 from src.services.whatsapp import whatsapp_service
 
@@ -17,11 +31,7 @@ class ConversationHandler:
 
     # Conversation steps
     STEP_START = "START"
-    STEP_COLLECT_NAME = "COLLECT_NAME"
-    STEP_COLLECT_CONDO = "COLLECT_CONDO"
-    STEP_COLLECT_BLOCK = "COLLECT_BLOCK"
-    STEP_COLLECT_APARTMENT = "COLLECT_APARTMENT"
-    STEP_SELECT_PLAN = "SELECT_PLAN"
+    STEP_CONFIRM = "CONFIRM"
     STEP_COMPLETED = "COMPLETED"
 
     def __init__(self) -> None:
@@ -87,159 +97,126 @@ class ConversationHandler:
         except Exception as e:
             logger.warning("failed_to_mark_read", error=str(e), request_id=request_id)
 
-        # Process based on current step
-        if state.step == self.STEP_START:
-            return await self._handle_start(phone, message_text, state, request_id)
+        if state.step == self.STEP_CONFIRM:
+            return await self._confirm(phone, message_text, state, request_id)
 
-        elif state.step == self.STEP_COLLECT_NAME:
-            return await self._handle_collect_name(phone, message_text, state, request_id)
-
-        elif state.step == self.STEP_COLLECT_CONDO:
-            return await self._handle_collect_condo(phone, message_text, state, request_id)
-
-        elif state.step == self.STEP_COLLECT_BLOCK:
-            return await self._handle_collect_block(phone, message_text, state, request_id)
-
-        elif state.step == self.STEP_COLLECT_APARTMENT:
-            return await self._handle_collect_apartment(phone, message_text, state, request_id)
-
-        elif state.step == self.STEP_SELECT_PLAN:
-            return await self._handle_select_plan(phone, message_text, state, request_id)
-
-        else:
-            # Unknown state, reset
+        if state.step != self.STEP_START and onboarding_flow.step(state.step) is None:
+            # Completed or unknown state: start over
             self.reset_state(phone)
-            return await self._handle_start(phone, message_text, state, request_id)
-
-    async def _handle_start(
-        self,
-        phone: str,
-        message_text: str,
-        state: ConversationState,
-        request_id: Optional[str],
-    ) -> dict:
-        """Handle START step."""
-        welcome_message = (
-            "Olá! Bem-vindo ao sistema de pagamentos PIX via WhatsApp.\n\n"
-            "Vou coletar algumas informações para gerar seu PIX de pagamento mensal.\n\n"
-            "Para começar, qual é o seu nome completo?"
-        )
-
-        await whatsapp_service.send_text_message(phone, welcome_message, request_id)
+            state = self.get_state(phone)
 
-        state.step = self.STEP_COLLECT_NAME
-        return {"step": state.step, "action": "collect_name"}
+        return await self._advance(phone, message_text, state, request_id)
 
-    async def _handle_collect_name(
+    async def _advance(
         self,
         phone: str,
         message_text: str,
         state: ConversationState,
         request_id: Optional[str],
     ) -> dict:
-        """Handle COLLECT_NAME step."""
-        if len(message_text) < 3:
-            await whatsapp_service.send_text_message(
-                phone,
-                "Por favor, digite seu nome completo (mínimo 3 caracteres).",
-                request_id,
-            )
-            return {"step": state.step, "action": "retry_name"}
+        """
+        Store the answers found in a message and ask for the next missing field.
 
-        state.data["name"] = message_text
-        state.step = self.STEP_COLLECT_CONDO
+        Args:
+            phone: Sender phone number
+            message_text: Message text
+            state: Conversation state
+            request_id: Request ID for tracking
 
-        await whatsapp_service.send_text_message(
-            phone,
-            f"Obrigado, {message_text}!\n\nAgora, qual é o nome do seu condomínio?",
-            request_id,
-        )
+        Returns:
+            Response data with next step and action
+        """
+        current = onboarding_flow.step(state.step)
+        answers, rejected = onboarding_flow.parse(message_text, state.data, current)
+        state.data.update(answers)
+
+        if len(answers) > 1:
+            logger.info(
+                "conversation_fields_collected",
+                request_id=request_id,
+                phone=phone,
+                fields=sorted(answers),
+            )
 
-        return {"step": state.step, "action": "collect_condo"}
+        step = onboarding_flow.next_step(state.data)
+        if step is None:
+            if len(answers) > 1:
+                # Fields split out of one message are checked by the client
+                return await self._ask_confirmation(phone, state, request_id)
+            return self._complete(phone, state)
 
-    async def _handle_collect_condo(
-        self,
-        phone: str,
-        message_text: str,
-        state: ConversationState,
-        request_id: Optional[str],
-    ) -> dict:
-        """Handle COLLECT_CONDO step."""
-        state.data["condo"] = message_text
-        state.step = self.STEP_COLLECT_BLOCK
-
-        await whatsapp_service.send_text_message(
-            phone,
-            "Qual é o bloco/torre do seu apartamento?",
-            request_id,
-        )
+        if step.field in rejected and step.retry_prompt:
+            prompt, action = step.retry_prompt, step.retry_action
+        else:
+            prompt, action = step.prompt.format(**state.data), step.action
+        if current is None:
+            prompt = WELCOME + prompt
 
-        return {"step": state.step, "action": "collect_block"}
+        state.step = step.name
+        await whatsapp_service.send_text_message(phone, prompt, request_id)
+        return {"step": state.step, "action": action}
 
-    async def _handle_collect_block(
+    async def _ask_confirmation(
         self,
         phone: str,
-        message_text: str,
         state: ConversationState,
         request_id: Optional[str],
     ) -> dict:
-        """Handle COLLECT_BLOCK step."""
-        state.data["block"] = message_text
-        state.step = self.STEP_COLLECT_APARTMENT
-
-        await whatsapp_service.send_text_message(
-            phone,
-            "Qual é o número do seu apartamento?",
-            request_id,
-        )
+        """Echo the collected answers and wait for the client to confirm them."""
+        state.step = self.STEP_CONFIRM
+        prompt = CONFIRM_PROMPT.format(summary=onboarding_flow.summary(state.data))
+        await whatsapp_service.send_text_message(phone, prompt, request_id)
+        return {"step": state.step, "action": "confirm_data"}
 
-        return {"step": state.step, "action": "collect_apartment"}
-
-    async def _handle_collect_apartment(
+    async def _confirm(
         self,
         phone: str,
         message_text: str,
         state: ConversationState,
         request_id: Optional[str],
     ) -> dict:
-        """Handle COLLECT_APARTMENT step."""
-        state.data["apartment"] = message_text
-        state.step = self.STEP_SELECT_PLAN
-
-        plan_message = (
-            "Perfeito! Agora selecione o plano desejado:\n\n"
-            "1️⃣ Individual - R$ 70,00\n"
-            "2️⃣ 2 pessoas - R$ 90,00\n"
-            "3️⃣ 4 pessoas - R$ 100,00\n\n"
-            "Digite o número do plano (1, 2 ou 3):"
-        )
+        """
+        Handle the reply to the confirmation.
 
-        await whatsapp_service.send_text_message(phone, plan_message, request_id)
+        "Sim" generates the PIX, "não" starts the questions over and labeled
+        answers (e.g. "bloco C") correct those fields and ask again.
 
-        return {"step": state.step, "action": "select_plan"}
+        Args:
+            phone: Sender phone number
+            message_text: Message text
+            state: Conversation state
+            request_id: Request ID for tracking
 
-    async def _handle_select_plan(
-        self,
-        phone: str,
-        message_text: str,
-        state: ConversationState,
-        request_id: Optional[str],
-    ) -> dict:
-        """Handle SELECT_PLAN step."""
-        if not self.parser.is_valid_plan_option(message_text):
-            await whatsapp_service.send_text_message(
-                phone,
-                "Opção inválida. Por favor, digite 1, 2 ou 3 para selecionar o plano.",
-                request_id,
+        Returns:
+            Response data with next step and action
+        """
+        if CONFIRM_YES.match(message_text):
+            return self._complete(phone, state)
+
+        if CONFIRM_NO.match(message_text):
+            state.data.clear()
+            step = onboarding_flow.steps[0]
+            state.step = step.name
+            await whatsapp_service.send_text_message(phone, step.prompt, request_id)
+            return {"step": state.step, "action": step.action}
+
+        answers, _ = onboarding_flow.parse(message_text, state.data, None)
+        if answers:
+            state.data.update(answers)
+            logger.info(
+                "conversation_fields_corrected",
+                request_id=request_id,
+                phone=phone,
+                fields=sorted(answers),
             )
-            return {"step": state.step, "action": "retry_plan"}
+        return await self._ask_confirmation(phone, state, request_id)
 
-        plan_value = self.parser.get_plan_value(message_text)
-        state.data["plan"] = message_text
+    def _complete(self, phone: str, state: ConversationState) -> dict:
+        """Finish onboarding and return the collected data for PIX generation."""
+        plan_value = self.parser.get_plan_value(state.data["plan"])
         state.data["amount"] = plan_value
         state.step = self.STEP_COMPLETED
 
-        # Return collected data for PIX generation
         return {
             "step": state.step,
             "action": "generate_pix",
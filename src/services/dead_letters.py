@@ -0,0 +1,272 @@
+"""Dead-letter store for webhook events that failed, and their replay.
+
+Webhook routes acknowledge every event with 200, so a failure is recorded
+here (raw payload, error, attempt count) instead of being lost. Each source
+registers a replay handler that runs the event through the same processing
+as the route; :meth:`DeadLetterStore.replay` runs pending dead letters
+through their handlers with bounded concurrency and records the outcomes.
+"""
+import asyncio
+import json
+import threading
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+from sqlalchemy import text
+
+from src.core.database import SessionLocal
+from src.core.logging import get_logger
+from src.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Longest error text kept per dead letter
+MAX_ERROR_LENGTH = 2000
+
+Handler = Callable[[dict[str, Any]], Awaitable[Any]]
+
+
+class DeadLetterStore:
+    """Record failed webhook events and replay them."""
+
+    def __init__(self) -> None:
+        """Initialize store."""
+        self.handlers: dict[str, Handler] = {}
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.record_failures = 0
+
+    def register(self, source: str, handler: Handler) -> None:
+        """
+        Register the replay handler of a source.
+
+        Args:
+            source: Event source (e.g. "mercadopago")
+            handler: Coroutine function taking the stored payload; raises
+                if processing fails again
+        """
+        self.handlers[source] = handler
+
+    def record(
+        self,
+        source: str,
+        event_key: str,
+        payload: dict[str, Any],
+        error: str,
+        request_id: Optional[str] = None,
+    ) -> None:
+        """
+        Store a failed event, or count another failure of a stored one.
+
+        Uses its own session, so the caller's (possibly broken) transaction
+        does not matter. Never raises: a webhook must still be acknowledged.
+
+        Args:
+            source: Event source
+            event_key: Identifier of the event within its source
+            payload: Data needed to replay the event
+            error: Error message
+            request_id: Request ID for tracking
+        """
+        db = SessionLocal()
+        try:
+            db.execute(
+                text(
+                    "INSERT INTO dead_letters (source, event_key, payload, error, request_id) "
+                    "VALUES (:source, :event_key, CAST(:payload AS jsonb), :error, :request_id) "
+                    "ON CONFLICT (source, event_key) DO UPDATE SET "
+                    "payload = EXCLUDED.payload, error = EXCLUDED.error, "
+                    "request_id = EXCLUDED.request_id, attempts = dead_letters.attempts + 1, "
+                    "status = 'pending', last_failed_at = now(), resolved_at = NULL"
+                ),
+                {
+                    "source": source,
+                    "event_key": event_key,
+                    "payload": json.dumps(payload, default=str),
+                    "error": (error or "unknown error")[:MAX_ERROR_LENGTH],
+                    "request_id": request_id,
+                },
+            )
+            db.commit()
+            with self._lock:
+                self.recorded += 1
+            logger.warning(
+                "dead_letter_recorded",
+                request_id=request_id,
+                source=source,
+                event_key=event_key,
+            )
+        except Exception as e:
+            db.rollback()
+            with self._lock:
+                self.record_failures += 1
+            logger.error(
+                "dead_letter_record_failed",
+                request_id=request_id,
+                source=source,
+                event_key=event_key,
+                error=str(e),
+                exc_info=True,
+            )
+        finally:
+            db.close()
+
+    @staticmethod
+    def pending(
+        source: Optional[str] = None,
+        ids: Optional[list[int]] = None,
+        limit: Optional[int] = None,
+        exclude_kinds: Sequence[str] = (),
+    ) -> list[dict[str, Any]]:
+        """
+        Pending dead letters, oldest first.
+
+        Args:
+            source: Only this source
+            ids: Only these ids
+            limit: At most this many
+            exclude_kinds: Leave out payloads whose "kind" is one of these
+
+        Returns:
+            Rows as dictionaries
+        """
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                text(
+                    "SELECT id, source, event_key, payload, error, attempts, request_id, "
+                    "last_failed_at FROM dead_letters WHERE status = 'pending' "
+                    "AND (CAST(:source AS text) IS NULL OR source = :source) "
+                    "AND (CAST(:ids AS bigint[]) IS NULL OR id = ANY(CAST(:ids AS bigint[]))) "
+                    "AND COALESCE(payload->>'kind', '') <> ALL(CAST(:exclude_kinds AS text[])) "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"source": source, "ids": ids, "limit": limit, "exclude_kinds": list(exclude_kinds)},
+            ).mappings().all()
+            return [dict(row) for row in rows]
+        finally:
+            db.close()
+
+    @staticmethod
+    def discard(ids: list[int]) -> int:
+        """
+        Mark dead letters as not to be replayed.
+
+        Args:
+            ids: Dead letter ids
+
+        Returns:
+            Rows discarded
+        """
+        db = SessionLocal()
+        try:
+            discarded = db.execute(
+                text(
+                    "UPDATE dead_letters SET status = 'discarded' "
+                    "WHERE status = 'pending' AND id = ANY(:ids)"
+                ),
+                {"ids": ids},
+            ).rowcount
+            db.commit()
+            return discarded
+        finally:
+            db.close()
+
+    async def _replay_one(self, letter: dict[str, Any], semaphore: asyncio.Semaphore) -> tuple[int, Optional[str]]:
+        """Replay one dead letter; returns its id and the error, if any."""
+        handler = self.handlers.get(letter["source"])
+        if handler is None:
+            return letter["id"], f"no replay handler for {letter['source']}"
+        async with semaphore:
+            try:
+                await handler(letter["payload"])
+            except Exception as e:
+                logger.error(
+                    "dead_letter_replay_failed",
+                    dead_letter_id=letter["id"],
+                    source=letter["source"],
+                    error=str(e),
+                )
+                return letter["id"], (str(e) or type(e).__name__)[:MAX_ERROR_LENGTH]
+        return letter["id"], None
+
+    @staticmethod
+    def _record_outcomes(outcomes: list[tuple[int, Optional[str]]]) -> None:
+        """Mark replayed dead letters resolved or count another failure."""
+        ids, errors = (list(column) for column in zip(*outcomes, strict=True))
+        db = SessionLocal()
+        try:
+            db.execute(
+                text(
+                    "UPDATE dead_letters d SET "
+                    "status = CASE WHEN r.error IS NULL THEN 'resolved' ELSE 'pending' END, "
+                    "resolved_at = CASE WHEN r.error IS NULL THEN now() END, "
+                    "attempts = d.attempts + CASE WHEN r.error IS NULL THEN 0 ELSE 1 END, "
+                    "error = COALESCE(r.error, d.error), "
+                    "last_failed_at = CASE WHEN r.error IS NULL THEN d.last_failed_at ELSE now() END "
+                    "FROM unnest(CAST(:ids AS bigint[]), CAST(:errors AS text[])) AS r(id, error) "
+                    "WHERE d.id = r.id"
+                ),
+                {"ids": ids, "errors": errors},
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    async def replay(
+        self,
+        source: Optional[str] = None,
+        ids: Optional[list[int]] = None,
+        limit: Optional[int] = None,
+        concurrency: int = 4,
+        exclude_kinds: Sequence[str] = (),
+    ) -> list[dict[str, Any]]:
+        """
+        Replay pending dead letters.
+
+        Args:
+            source: Only this source
+            ids: Only these ids
+            limit: At most this many
+            concurrency: Dead letters processed at the same time
+            exclude_kinds: Leave out payloads whose "kind" is one of these;
+                they stay pending
+
+        Returns:
+            One outcome per dead letter (id, source, event_key, resolved, error)
+        """
+        letters = await asyncio.to_thread(self.pending, source, ids, limit, exclude_kinds)
+        if not letters:
+            return []
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        outcomes = await asyncio.gather(*(self._replay_one(letter, semaphore) for letter in letters))
+        await asyncio.to_thread(self._record_outcomes, outcomes)
+
+        results = [
+            {
+                "id": letter["id"],
+                "source": letter["source"],
+                "event_key": letter["event_key"],
+                "resolved": error is None,
+                "error": error,
+            }
+            for letter, (_, error) in zip(letters, outcomes, strict=True)
+        ]
+        logger.info(
+            "dead_letters_replayed",
+            total=len(results),
+            resolved=sum(1 for result in results if result["resolved"]),
+        )
+        return results
+
+    def stats(self) -> dict[str, int]:
+        """Recording counters."""
+        return {
+            "recorded_total": self.recorded,
+            "record_failures_total": self.record_failures,
+        }
+
+
+# Global instance
+dead_letters = DeadLetterStore()
+metrics.register("dead_letters", dead_letters.stats)
@@ -1,11 +1,15 @@
 """Mercado Pago service for PIX generation."""
-from datetime import datetime, timedelta
+import hashlib
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 from typing import Optional
 
 import httpx
 
 from src.core.config import settings
+from src.core.http import http_client
 from src.core.logging import get_logger
+from src.utils import brcode
 
 logger = get_logger(__name__)
 
@@ -16,7 +20,7 @@ class MercadoPagoService:
     def __init__(self) -> None:
         """Initialize Mercado Pago service."""
         self.access_token = settings.mercadopago_access_token
-        self.api_url = "https://api.mercadopago.com/v1"
+        self.api_url = settings.mercadopago_api_url
         self.headers = {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
@@ -46,6 +50,33 @@ class MercadoPagoService:
         """
         return f"PIX|{month_ref}|{amount:.2f}|{phone}|{apartment}"
 
+    def generate_idempotency_key(
+        self,
+        client_id: int,
+        month_ref: str,
+        amount: float,
+        generation: int,
+    ) -> str:
+        """
+        Generate the idempotency key for a PIX charge.
+
+        Derived from the charge itself instead of the HTTP request, so a
+        retried request or restarted conversation gets the same charge back
+        from Mercado Pago. ``generation`` changes once a previous charge for
+        the same client, month and amount has been recorded.
+
+        Args:
+            client_id: Client ID
+            month_ref: Month reference (YYYY-MM)
+            amount: Payment amount
+            generation: Number of charges already recorded
+
+        Returns:
+            Idempotency key
+        """
+        raw = f"{client_id}|{month_ref}|{amount:.2f}|{generation}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
     async def create_pix_payment(
         self,
         amount: float,
@@ -53,6 +84,7 @@ class MercadoPagoService:
         external_reference: str,
         payer_email: Optional[str] = None,
         request_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
     ) -> dict:
         """
         Create a PIX payment in Mercado Pago.
@@ -63,6 +95,7 @@ class MercadoPagoService:
             external_reference: External reference for tracking
             payer_email: Payer email (optional)
             request_id: Request ID for tracking
+            idempotency_key: X-Idempotency-Key (defaults to request_id)
 
         Returns:
             Mercado Pago payment response
@@ -88,7 +121,7 @@ class MercadoPagoService:
 
         # Set idempotency key
         headers = self.headers.copy()
-        headers["X-Idempotency-Key"] = request_id or external_reference
+        headers["X-Idempotency-Key"] = idempotency_key or request_id or external_reference
 
         logger.info(
             "creating_mercadopago_payment",
@@ -97,7 +130,7 @@ class MercadoPagoService:
             external_reference=external_reference,
         )
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             try:
                 response = await client.post(
                     f"{self.api_url}/payments",
@@ -143,6 +176,66 @@ class MercadoPagoService:
 
         return qr_code
 
+    def validate_pix_code(
+        self,
+        pix_code: str,
+        amount: float,
+        request_id: Optional[str] = None,
+    ) -> brcode.BRCode:
+        """
+        Parse a returned PIX code and check it matches the charge.
+
+        Args:
+            pix_code: Copy-and-paste code from Mercado Pago
+            amount: Expected amount
+            request_id: Request ID for tracking
+
+        Returns:
+            Parsed code
+
+        Raises:
+            brcode.BRCodeError: If the code is malformed or the amount differs
+        """
+        try:
+            code = brcode.parse(pix_code)
+            if code.amount is not None and code.amount != Decimal(f"{amount:.2f}"):
+                raise brcode.BRCodeError(
+                    f"PIX amount {code.amount} does not match charge amount {amount:.2f}"
+                )
+            return code
+        except brcode.BRCodeError as e:
+            logger.error(
+                "invalid_pix_code_from_mercadopago",
+                request_id=request_id,
+                error=str(e),
+            )
+            raise
+
+    def extract_expiration(self, payment_response: dict) -> datetime:
+        """
+        Extract PIX expiration from payment response.
+
+        Falls back to the configured expiration window when Mercado Pago
+        does not return a parseable ``date_of_expiration``.
+
+        Args:
+            payment_response: Mercado Pago payment response
+
+        Returns:
+            Timezone-aware expiration datetime
+        """
+        value = payment_response.get("date_of_expiration")
+        if value:
+            try:
+                expires_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                return expires_at
+            except ValueError:
+                logger.warning("invalid_date_of_expiration", value=value)
+
+        return datetime.now(timezone.utc) + timedelta(hours=settings.pix_expiration_hours)
+
     def extract_qr_code_base64(self, payment_response: dict) -> Optional[str]:
         """
         Extract QR code image (base64) from payment response.
@@ -183,7 +276,7 @@ class MercadoPagoService:
             payment_id=payment_id,
         )
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             try:
                 response = await client.get(
                     f"{self.api_url}/payments/{payment_id}",
@@ -0,0 +1,267 @@
+"""Transactional outbox: side effects that survive a crash after commit.
+
+Writers call :meth:`OutboxRelay.enqueue` before committing the change that
+causes the effect (e.g. a payment approval), so the event row commits or
+rolls back with it. The relay, running in every worker, claims due events
+in batches with ``FOR UPDATE SKIP LOCKED``, runs their handlers
+concurrently through the side-effect executor and records the outcome with
+one statement per batch. Failures are retried with exponential backoff up
+to ``OUTBOX_MAX_ATTEMPTS``; an event whose claim expires (worker died
+mid-batch) is claimed again.
+
+Delivery is at least once: a handler may run twice for the same event, for
+example if the worker dies after the effect but before marking it done.
+"""
+import asyncio
+from functools import partial
+from typing import Any, Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.core.effects import Effect, side_effects
+from src.core.logging import get_logger
+from src.core.metrics import metrics
+from src.models.outbox import OutboxEvent
+
+logger = get_logger(__name__)
+
+# Longest error text kept per event
+MAX_ERROR_LENGTH = 1000
+
+# Upper bound of the retry backoff
+MAX_BACKOFF_SECONDS = 3600
+
+Handler = Callable[[dict[str, Any]], Any]
+
+
+class OutboxRelay:
+    """Enqueue outbox events and execute them in the background."""
+
+    def __init__(self) -> None:
+        """Initialize relay."""
+        self.handlers: dict[str, Handler] = {}
+        self.batch_size = settings.outbox_batch_size
+        self.poll_interval = settings.outbox_poll_seconds
+        self.max_attempts = settings.outbox_max_attempts
+        self.retry_base = settings.outbox_retry_base_seconds
+        self.lease = settings.outbox_lease_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.processed = 0
+        self.retried = 0
+        self.dead = 0
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """
+        Register the handler of an event kind.
+
+        Args:
+            kind: Event kind
+            handler: Coroutine function or callable taking the payload
+        """
+        self.handlers[kind] = handler
+
+    @staticmethod
+    def enqueue(db: Session, kind: str, payload: dict[str, Any]) -> None:
+        """
+        Add an event to the caller's transaction (no commit).
+
+        Args:
+            db: Database session whose next commit also changes the state
+                the event reports
+            kind: Event kind (registered handler)
+            payload: JSON-serializable handler arguments
+        """
+        db.add(OutboxEvent(kind=kind, payload=payload))
+
+    def wake(self) -> None:
+        """Process pending events now instead of at the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _claim(self) -> list[tuple[int, str, dict[str, Any], int]]:
+        """Claim a batch of due events (own transaction)."""
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                text(
+                    "UPDATE outbox SET status = 'processing', attempts = attempts + 1, "
+                    "locked_until = now() + make_interval(secs => :lease) "
+                    "WHERE id IN (SELECT id FROM outbox "
+                    "WHERE status IN ('pending', 'processing') "
+                    "AND available_at <= now() "
+                    "AND (status = 'pending' OR locked_until < now()) "
+                    "ORDER BY available_at, id LIMIT :limit FOR UPDATE SKIP LOCKED) "
+                    "RETURNING id, kind, payload, attempts"
+                ),
+                {"lease": self.lease, "limit": self.batch_size},
+            ).all()
+            db.commit()
+            return [tuple(row) for row in rows]
+        finally:
+            db.close()
+
+    def _complete(
+        self,
+        done: list[int],
+        failed: list[tuple[int, int, str]],
+    ) -> None:
+        """
+        Record a batch's outcomes.
+
+        Args:
+            done: Ids of events whose handler succeeded
+            failed: (id, attempts, error) of events whose handler failed
+        """
+        db = SessionLocal()
+        try:
+            if done:
+                db.execute(
+                    text(
+                        "UPDATE outbox SET status = 'done', processed_at = now(), "
+                        "locked_until = NULL, last_error = NULL WHERE id = ANY(:ids)"
+                    ),
+                    {"ids": done},
+                )
+            if failed:
+                ids, attempts, errors = (list(column) for column in zip(*failed, strict=True))
+                delays = [
+                    min(self.retry_base * 2 ** (attempt - 1), MAX_BACKOFF_SECONDS)
+                    for attempt in attempts
+                ]
+                db.execute(
+                    text(
+                        "UPDATE outbox o SET "
+                        "status = CASE WHEN o.attempts >= :max_attempts THEN 'failed' ELSE 'pending' END, "
+                        "available_at = now() + make_interval(secs => r.delay), "
+                        "locked_until = NULL, last_error = r.error "
+                        "FROM unnest(CAST(:ids AS bigint[]), CAST(:delays AS float8[]), "
+                        "CAST(:errors AS text[])) AS r(id, delay, error) "
+                        "WHERE o.id = r.id"
+                    ),
+                    {
+                        "ids": ids,
+                        "delays": delays,
+                        "errors": errors,
+                        "max_attempts": self.max_attempts,
+                    },
+                )
+            db.commit()
+        finally:
+            db.close()
+
+    async def _handle(self, event_id: int, kind: str, payload: dict[str, Any]) -> tuple[str, Optional[str]]:
+        """Run one event's handler through the side-effect executor."""
+        handler = self.handlers.get(kind)
+        if handler is None:
+            return "failed", f"no handler for {kind}"
+        return await side_effects.execute(
+            Effect(kind, partial(handler, payload)), request_id=f"outbox-{event_id}"
+        )
+
+    async def process_batch(self) -> int:
+        """
+        Claim and execute one batch.
+
+        Returns:
+            Events claimed
+        """
+        events = await asyncio.to_thread(self._claim)
+        if not events:
+            return 0
+
+        results = await asyncio.gather(
+            *(self._handle(event_id, kind, payload) for event_id, kind, payload, _ in events)
+        )
+
+        done: list[int] = []
+        failed: list[tuple[int, int, str]] = []
+        for (event_id, kind, _, attempts), (outcome, error) in zip(events, results, strict=True):
+            if outcome == "succeeded":
+                done.append(event_id)
+                continue
+            failed.append((event_id, attempts, (error or outcome)[:MAX_ERROR_LENGTH]))
+            if attempts >= self.max_attempts:
+                self.dead += 1
+                logger.error("outbox_event_dead", event_id=event_id, kind=kind, attempts=attempts, error=error)
+            else:
+                self.retried += 1
+
+        await asyncio.to_thread(self._complete, done, failed)
+        self.processed += len(done)
+        return len(events)
+
+    def purge(self) -> int:
+        """
+        Delete processed events older than ``OUTBOX_RETENTION_DAYS``.
+
+        Returns:
+            Events deleted
+        """
+        db = SessionLocal()
+        try:
+            deleted = db.execute(
+                text(
+                    "DELETE FROM outbox WHERE status = 'done' "
+                    "AND processed_at < now() - make_interval(days => :days)"
+                ),
+                {"days": settings.outbox_retention_days},
+            ).rowcount
+            db.commit()
+        finally:
+            db.close()
+        if deleted:
+            logger.info("outbox_purged", deleted=deleted)
+        return deleted
+
+    async def _run(self) -> None:
+        """Process batches until idle, then wait for a wakeup or the next poll."""
+        while True:
+            try:
+                claimed = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("outbox_relay_failed", error=str(e), exc_info=True)
+                claimed = 0
+
+            if claimed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        """Start the relay loop."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="outbox-relay")
+
+    async def stop(self) -> None:
+        """Stop the relay loop (claimed events are retried after their lease)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+
+    def stats(self) -> dict[str, int]:
+        """Relay counters."""
+        return {
+            "processed_total": self.processed,
+            "retried_total": self.retried,
+            "dead_total": self.dead,
+        }
+
+
+# Global instance
+outbox_relay = OutboxRelay()
+metrics.register("outbox", outbox_relay.stats)
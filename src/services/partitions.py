@@ -0,0 +1,69 @@
+"""Monthly partition maintenance for the payments table."""
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# How often the scheduler checks that upcoming partitions exist
+CHECK_INTERVAL_SECONDS = 6 * 60 * 60
+
+
+def upcoming_month_refs(months_ahead: int, now: Optional[datetime] = None) -> list[str]:
+    """
+    Current month reference followed by the next ``months_ahead`` ones.
+
+    Args:
+        months_ahead: Number of months after the current one
+        now: Reference time (defaults to now, UTC)
+
+    Returns:
+        Month references (YYYY-MM)
+    """
+    now = now or datetime.now(timezone.utc)
+    refs = []
+    for offset in range(months_ahead + 1):
+        year, month = divmod(now.month - 1 + offset, 12)
+        refs.append(f"{now.year + year:04d}-{month + 1:02d}")
+    return refs
+
+
+def ensure_payment_partitions(
+    db: Optional[Session] = None,
+    months_ahead: int = settings.payments_partition_months_ahead,
+) -> list[str]:
+    """
+    Create the payments partitions for the current and upcoming months.
+
+    Rows already written to the default partition for those months are moved
+    into the new partition.
+
+    Args:
+        db: Database session (a new one is opened if omitted)
+        months_ahead: Months after the current one to prepare
+
+    Returns:
+        Month references whose partition was created
+    """
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        created = [
+            month_ref
+            for month_ref in upcoming_month_refs(months_ahead)
+            if db.scalar(text("SELECT ensure_payments_partition(:m)"), {"m": month_ref})
+        ]
+        db.commit()
+    finally:
+        if own_session:
+            db.close()
+
+    if created:
+        logger.info("payment_partitions_created", months=created)
+    return created
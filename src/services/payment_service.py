@@ -1,16 +1,25 @@
 """Payment service for managing payments."""
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, func, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.core.logging import get_logger
+from src.models.client import Client
 from src.models.payment import Payment
 from src.schemas.payment import PaymentCreate, PaymentUpdate
+from src.services.summary_service import summary_service
 
 logger = get_logger(__name__)
 
 
+class PaymentStatusConflict(Exception):
+    """The payment's status changed since it was read."""
+
+
 class PaymentService:
     """Service for managing payments."""
 
@@ -43,18 +52,27 @@ class PaymentService:
         return db.query(Payment).filter(Payment.request_id == request_id).first()
 
     @staticmethod
-    def get_by_mp_payment_id(db: Session, mp_payment_id: str) -> Optional[Payment]:
+    def get_by_mp_payment_id(
+        db: Session,
+        mp_payment_id: str,
+        for_update: bool = False,
+    ) -> Optional[Payment]:
         """
         Get payment by Mercado Pago payment ID.
 
         Args:
             db: Database session
             mp_payment_id: Mercado Pago payment ID
+            for_update: Lock the row until the transaction ends and reload
+                it, so concurrent status changes are serialized
 
         Returns:
             Payment or None if not found
         """
-        return db.query(Payment).filter(Payment.mp_payment_id == mp_payment_id).first()
+        query = db.query(Payment).filter(Payment.mp_payment_id == mp_payment_id)
+        if for_update:
+            query = query.with_for_update().populate_existing()
+        return query.first()
 
     @staticmethod
     def get_client_payment_for_month(
@@ -83,11 +101,83 @@ class PaymentService:
             .first()
         )
 
+    @staticmethod
+    def get_reusable_pending(
+        db: Session,
+        client_id: int,
+        month_ref: str,
+        amount: float,
+        min_validity: timedelta,
+    ) -> Optional[Payment]:
+        """
+        Get a pending payment whose PIX code can still be sent again.
+
+        Args:
+            db: Database session
+            client_id: Client ID
+            month_ref: Month reference (YYYY-MM)
+            amount: Payment amount
+            min_validity: Minimum time the PIX must remain valid
+
+        Returns:
+            Most recent reusable payment or None
+        """
+        valid_until = datetime.now(timezone.utc) + min_validity
+        return (
+            db.query(Payment)
+            .filter(
+                Payment.client_id == client_id,
+                Payment.month_ref == month_ref,
+                Payment.amount == amount,
+                Payment.status == "pending",
+                Payment.pix_code.isnot(None),
+                Payment.pix_expires_at > valid_until,
+            )
+            .order_by(Payment.created_at.desc())
+            .first()
+        )
+
+    @staticmethod
+    def count_attempts(
+        db: Session,
+        client_id: int,
+        month_ref: str,
+        amount: float,
+    ) -> int:
+        """
+        Count payments already created for a client, month and amount.
+
+        Used as the generation number of the Mercado Pago idempotency key,
+        so a retry reuses the key while a charge created after the previous
+        one expired gets a new one.
+
+        Args:
+            db: Database session
+            client_id: Client ID
+            month_ref: Month reference (YYYY-MM)
+            amount: Payment amount
+
+        Returns:
+            Number of payments
+        """
+        return db.scalar(
+            select(func.count())
+            .select_from(Payment)
+            .where(
+                Payment.client_id == client_id,
+                Payment.month_ref == month_ref,
+                Payment.amount == amount,
+            )
+        )
+
     @staticmethod
     def create(
         db: Session,
         payment_data: PaymentCreate,
         request_id: str,
+        mp_payment_id: Optional[str] = None,
+        pix_code: Optional[str] = None,
+        pix_expires_at: Optional[datetime] = None,
     ) -> Payment:
         """
         Create a new payment.
@@ -96,9 +186,16 @@ class PaymentService:
             db: Database session
             payment_data: Payment data
             request_id: Request ID for tracking
+            mp_payment_id: Mercado Pago payment ID of the charge
+            pix_code: PIX code (kept for resending)
+            pix_expires_at: PIX code expiration
 
         Returns:
             Created payment
+
+        Raises:
+            IntegrityError: A payment with this request ID or Mercado Pago
+                payment ID already exists for the month
         """
         logger.info(
             "creating_payment",
@@ -113,10 +210,18 @@ class PaymentService:
             month_ref=payment_data.month_ref,
             amount=payment_data.amount,
             status="pending",
+            mp_payment_id=mp_payment_id,
+            pix_code=pix_code,
+            pix_expires_at=pix_expires_at,
             external_reference=payment_data.external_reference,
         )
 
         db.add(payment)
+        db.flush()
+
+        condo = db.scalar(select(Client.condo).where(Client.id == payment.client_id))
+        summary_service.record_created(db, condo, payment)
+
         db.commit()
         db.refresh(payment)
 
@@ -128,6 +233,61 @@ class PaymentService:
 
         return payment
 
+    @staticmethod
+    def record_charge(
+        db: Session,
+        payment_data: PaymentCreate,
+        request_id: str,
+        mp_payment_id: Optional[str],
+        pix_code: str,
+        pix_expires_at: Optional[datetime],
+    ) -> tuple[Payment, bool]:
+        """
+        Create the payment of a PIX charge, or load the one already recorded.
+
+        Concurrent retries with the same idempotency key get the same
+        Mercado Pago charge; the unique (mp_payment_id, month_ref) index lets
+        only one of them insert it. Anything else added to the session
+        (e.g. outbox events) is rolled back with the losing insert.
+
+        Args:
+            db: Database session
+            payment_data: Payment data
+            request_id: Request ID for tracking
+            mp_payment_id: Mercado Pago payment ID (None for a local PIX)
+            pix_code: PIX code
+            pix_expires_at: PIX code expiration
+
+        Returns:
+            The payment, and whether this call created it
+        """
+        try:
+            payment = PaymentService.create(
+                db,
+                payment_data,
+                request_id,
+                mp_payment_id=mp_payment_id,
+                pix_code=pix_code,
+                pix_expires_at=pix_expires_at,
+            )
+            return payment, True
+        except IntegrityError:
+            db.rollback()
+            existing = (
+                PaymentService.get_by_mp_payment_id(db, mp_payment_id)
+                if mp_payment_id
+                else None
+            )
+            if existing is None:
+                raise
+            logger.info(
+                "payment_already_recorded",
+                request_id=request_id,
+                payment_id=existing.id,
+                mp_payment_id=mp_payment_id,
+            )
+            return existing, False
+
     @staticmethod
     def update_status(
         db: Session,
@@ -135,6 +295,8 @@ class PaymentService:
         status: str,
         mp_payment_id: Optional[str] = None,
         paid_at: Optional[datetime] = None,
+        pix_code: Optional[str] = None,
+        pix_expires_at: Optional[datetime] = None,
     ) -> Payment:
         """
         Update payment status.
@@ -145,9 +307,15 @@ class PaymentService:
             status: New status
             mp_payment_id: Mercado Pago payment ID (optional)
             paid_at: Payment datetime (optional)
+            pix_code: PIX copy-paste code (optional)
+            pix_expires_at: PIX expiration datetime (optional)
 
         Returns:
             Updated payment
+
+        Raises:
+            PaymentStatusConflict: If the stored status is no longer the one
+                on ``payment`` (the transaction is rolled back)
         """
         logger.info(
             "updating_payment_status",
@@ -156,7 +324,30 @@ class PaymentService:
             new_status=status,
         )
 
-        payment.status = status
+        old_status = payment.status
+        if status != old_status:
+            # Only move the row from the status we read: a concurrent change
+            # must not be counted twice in the monthly summary
+            moved = db.execute(
+                update(Payment)
+                .where(
+                    Payment.id == payment.id,
+                    Payment.month_ref == payment.month_ref,
+                    Payment.status == old_status,
+                )
+                .values(status=status)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if moved != 1:
+                db.rollback()
+                raise PaymentStatusConflict(
+                    f"Payment {payment.id} is no longer {old_status}"
+                )
+            set_committed_value(payment, "status", status)
+
+            summary_service.record_status_change(
+                db, payment.client.condo, payment, old_status, status
+            )
 
         if mp_payment_id:
             payment.mp_payment_id = mp_payment_id
@@ -164,6 +355,10 @@ class PaymentService:
         if paid_at:
             payment.paid_at = paid_at
 
+        if pix_code:
+            payment.pix_code = pix_code
+            payment.pix_expires_at = pix_expires_at
+
         db.commit()
         db.refresh(payment)
 
@@ -175,6 +370,137 @@ class PaymentService:
 
         return payment
 
+    @staticmethod
+    def update_qr_media(db: Session, payment: Payment, media_id: str) -> Payment:
+        """
+        Record the WhatsApp media ID of the payment's QR image.
+
+        Args:
+            db: Database session
+            payment: Payment
+            media_id: WhatsApp media ID
+
+        Returns:
+            Updated payment
+        """
+        payment.qr_media_id = media_id
+        payment.qr_media_uploaded_at = datetime.now(timezone.utc)
+        db.commit()
+
+        logger.info(
+            "payment_qr_media_stored",
+            payment_id=payment.id,
+            media_id=media_id,
+        )
+
+        return payment
+
+    @staticmethod
+    def _apply_filters(
+        stmt: Select,
+        month_ref: Optional[str] = None,
+        status: Optional[str] = None,
+        condo: Optional[str] = None,
+    ) -> Select:
+        """Apply the optional list/export filters to a payments-join-clients select."""
+        if month_ref:
+            stmt = stmt.where(Payment.month_ref == month_ref)
+        if status:
+            stmt = stmt.where(Payment.status == status)
+        if condo:
+            stmt = stmt.where(Client.condo == condo)
+        return stmt
+
+    @staticmethod
+    def list_page(
+        db: Session,
+        limit: int,
+        after: Optional[tuple[datetime, int]] = None,
+        month_ref: Optional[str] = None,
+        status: Optional[str] = None,
+        condo: Optional[str] = None,
+    ) -> tuple[list[Payment], bool]:
+        """
+        List payments newest first using keyset pagination on (created_at, id).
+
+        The client is loaded in the same query, so serializing the page does
+        not issue one query per payment.
+
+        Args:
+            db: Database session
+            limit: Page size
+            after: ``(created_at, id)`` of the last row of the previous page
+            month_ref: Filter by month reference (YYYY-MM)
+            status: Filter by payment status
+            condo: Filter by client condominium
+
+        Returns:
+            Tuple of (payments, has_more)
+        """
+        stmt = (
+            select(Payment)
+            .join(Payment.client)
+            .options(contains_eager(Payment.client))
+            .order_by(Payment.created_at.desc(), Payment.id.desc())
+            .limit(limit + 1)
+        )
+        stmt = PaymentService._apply_filters(stmt, month_ref, status, condo)
+
+        if after is not None:
+            stmt = stmt.where(tuple_(Payment.created_at, Payment.id) < tuple_(*after))
+
+        payments = list(db.scalars(stmt))
+        return payments[:limit], len(payments) > limit
+
+    @staticmethod
+    def iter_export_rows(
+        db: Session,
+        month_ref: Optional[str] = None,
+        status: Optional[str] = None,
+        condo: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Any]:
+        """
+        Stream payments joined with client fields, oldest first.
+
+        Rows are fetched from a server-side cursor ``batch_size`` at a time,
+        so memory stays constant regardless of how many rows match.
+
+        Args:
+            db: Database session
+            month_ref: Filter by month reference (YYYY-MM)
+            status: Filter by payment status
+            condo: Filter by client condominium
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            Result rows with payment and client columns
+        """
+        stmt = (
+            select(
+                Payment.id,
+                Payment.request_id,
+                Payment.month_ref,
+                Payment.amount,
+                Payment.status,
+                Payment.mp_payment_id,
+                Payment.external_reference,
+                Payment.created_at,
+                Payment.paid_at,
+                Client.name,
+                Client.phone,
+                Client.condo,
+                Client.block,
+                Client.apartment,
+            )
+            .join(Client, Payment.client_id == Client.id)
+            .order_by(Payment.created_at, Payment.id)
+            .execution_options(yield_per=batch_size)
+        )
+        stmt = PaymentService._apply_filters(stmt, month_ref, status, condo)
+
+        yield from db.execute(stmt)
+
 
 # Global instance
 payment_service = PaymentService()
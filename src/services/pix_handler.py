@@ -1,24 +1,244 @@
 """PIX generation handler for conversation flow."""
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import httpx
 from sqlalchemy.orm import Session
 
+from src.core.config import settings
+from src.core.database import release_connection
 from src.core.logging import get_logger
+from src.models.payment import Payment
 from src.schemas.client import ClientCreate
 from src.schemas.payment import PaymentCreate
 from src.services.client_service import client_service
 from src.services.mercadopago_service import mercadopago_service
+from src.services.outbox import outbox_relay
 from src.services.payment_service import payment_service
+from src.services.qr_renderer import qr_renderer
 from src.services.sheets_service import sheets_service
 from src.services.whatsapp import whatsapp_service
+from src.utils import brcode
+from src.utils.brcode import BRCodeError
 
 logger = get_logger(__name__)
 
 
+def format_remaining(expires_at: datetime) -> str:
+    """
+    Format the time left until a PIX expires, e.g. ``3h20min``.
+
+    Args:
+        expires_at: Timezone-aware expiration datetime
+
+    Returns:
+        Human readable remaining time
+    """
+    minutes = max(int((expires_at - datetime.now(timezone.utc)).total_seconds() // 60), 0)
+    if minutes < 60:
+        return f"{minutes} minutos"
+    return f"{minutes // 60}h{minutes % 60:02d}min"
+
+
+def build_local_pix_code(amount: float, reference: str) -> str:
+    """
+    Build a static PIX code for the configured fallback key.
+
+    Args:
+        amount: Payment amount
+        reference: Value the txid is derived from (e.g. request ID)
+
+    Returns:
+        Copy-and-paste PIX code
+    """
+    return brcode.build(
+        merchant_name=settings.pix_merchant_name,
+        merchant_city=settings.pix_merchant_city,
+        key=settings.pix_fallback_key,
+        amount=amount,
+        txid=brcode.make_txid(reference),
+    )
+
+
+def check_local_pix_config() -> None:
+    """
+    Build a sample local PIX when the fallback is enabled.
+
+    Called at startup, so a key without merchant name/city (or one too long
+    for a BR Code) stops the app instead of failing only when Mercado Pago
+    is already down.
+
+    Raises:
+        RuntimeError: If ``PIX_FALLBACK_KEY`` is set but no valid code can
+            be built with the merchant settings
+    """
+    if not settings.pix_fallback_key:
+        return
+    try:
+        build_local_pix_code(1.0, "startup")
+    except BRCodeError as e:
+        raise RuntimeError(
+            "PIX_FALLBACK_KEY is set but the local PIX cannot be built "
+            f"(check PIX_MERCHANT_NAME and PIX_MERCHANT_CITY): {e}"
+        ) from e
+
+
 class PIXHandler:
     """Handle PIX generation and WhatsApp notification."""
 
+    @staticmethod
+    def build_pix_message(
+        amount: float,
+        month_ref: str,
+        condo: str,
+        block: str,
+        apartment: str,
+        pix_code: str,
+        expires_in: str,
+        manual_confirmation: bool = False,
+    ) -> str:
+        """
+        Build the WhatsApp message carrying a PIX code.
+
+        Args:
+            amount: Payment amount
+            month_ref: Month reference (YYYY-MM)
+            condo: Condominium name
+            block: Block/tower
+            apartment: Apartment number
+            pix_code: PIX copy-paste code
+            expires_in: Human readable time until expiration
+            manual_confirmation: Code was generated locally, so payment is
+                confirmed by the administration instead of the webhook
+
+        Returns:
+            Message text
+        """
+        if manual_confirmation:
+            closing = "Após o pagamento, envie o comprovante aqui para confirmarmos."
+        else:
+            closing = "Após o pagamento, você receberá a confirmação automaticamente."
+
+        return (
+            f"✅ PIX gerado com sucesso!\n\n"
+            f"💰 Valor: R$ {amount:.2f}\n"
+            f"📅 Referência: {month_ref}\n"
+            f"🏢 {condo} - Bloco {block} - Apto {apartment}\n\n"
+            f"🔑 Código PIX Copia e Cola:\n\n"
+            f"{pix_code}\n\n"
+            f"⏰ Este PIX expira em {expires_in}.\n\n"
+            f"{closing}"
+        )
+
+    @staticmethod
+    def _result(client_id: int, payment: Payment, amount: float, reused: bool) -> dict:
+        """Build the result dictionary returned to the conversation handler."""
+        return {
+            "success": True,
+            "reused": reused,
+            "client_id": client_id,
+            "payment_id": payment.id,
+            "mp_payment_id": payment.mp_payment_id,
+            "pix_code": payment.pix_code,
+            "amount": amount,
+        }
+
+    async def send_qr_image(
+        self,
+        db: Session,
+        payment: Payment,
+        phone: str,
+        request_id: Optional[str] = None,
+    ) -> bool:
+        """
+        Send the payment's PIX QR image, uploading it only when needed.
+
+        The image is rendered locally on the process pool and uploaded once;
+        the media ID is stored on the payment, so resends and reminders are a
+        single send call. Failures are logged, not raised: the copy-and-paste
+        code has already been sent. No connection is held during the calls.
+
+        Args:
+            db: Database session
+            payment: Payment with a PIX code
+            phone: Recipient phone
+            request_id: Request ID for tracking
+
+        Returns:
+            True if the image was sent
+        """
+        if not settings.pix_send_qr_image or not payment.pix_code:
+            return False
+
+        caption = f"QR Code PIX - R$ {float(payment.amount):.2f}"
+        max_age = timedelta(days=settings.whatsapp_media_max_age_days)
+
+        media_id = payment.qr_media_id
+        if media_id and (
+            payment.qr_media_uploaded_at is None
+            or datetime.now(timezone.utc) - payment.qr_media_uploaded_at > max_age
+        ):
+            media_id = None
+
+        release_connection(db)
+        try:
+            if media_id:
+                try:
+                    await whatsapp_service.send_image_message(phone, media_id, caption, request_id)
+                    return True
+                except httpx.HTTPError:
+                    # Media may have been purged by WhatsApp: upload again
+                    logger.warning(
+                        "cached_qr_media_rejected",
+                        request_id=request_id,
+                        payment_id=payment.id,
+                        media_id=media_id,
+                    )
+
+            png = await qr_renderer.render(payment.pix_code)
+            media_id = await whatsapp_service.upload_media(
+                png, "image/png", f"pix-{payment.id}.png", request_id
+            )
+            payment_service.update_qr_media(db, payment, media_id)
+            release_connection(db)
+
+            await whatsapp_service.send_image_message(phone, media_id, caption, request_id)
+            return True
+
+        except Exception as e:
+            logger.error(
+                "pix_qr_send_failed",
+                request_id=request_id,
+                payment_id=payment.id,
+                error=str(e),
+                exc_info=True,
+            )
+            return False
+
+    async def _send_pix(
+        self,
+        db: Session,
+        payment: Payment,
+        phone: str,
+        pix_message: str,
+        request_id: Optional[str] = None,
+    ) -> None:
+        """
+        Send the PIX code message, then its QR image.
+
+        Args:
+            db: Database session
+            payment: Payment being paid
+            phone: Client phone
+            pix_message: Message with the PIX code
+            request_id: Request ID for tracking
+
+        Raises:
+            httpx.HTTPError: If the PIX code message cannot be sent
+        """
+        await whatsapp_service.send_text_message(phone, pix_message, request_id)
+        await self.send_qr_image(db, payment, phone, request_id)
+
     async def generate_and_send_pix(
         self,
         db: Session,
@@ -33,6 +253,10 @@ class PIXHandler:
         """
         Generate PIX and send code via WhatsApp.
 
+        Database work happens in short transactions between the Mercado Pago
+        and WhatsApp calls, so a slow provider never holds a pooled
+        connection.
+
         Args:
             db: Database session
             phone: Client phone
@@ -84,6 +308,8 @@ class PIXHandler:
                     payment_id=existing_payment.id,
                 )
 
+                release_connection(db)
+
                 # Send message about existing payment
                 message = (
                     f"Você já possui um pagamento aprovado para {month_ref}.\n\n"
@@ -98,7 +324,36 @@ class PIXHandler:
                     "payment_id": existing_payment.id,
                 }
 
-            # 4. Generate external reference
+            # 4. Resend a still-valid pending PIX instead of charging again
+            reusable = payment_service.get_reusable_pending(
+                db,
+                client.id,
+                month_ref,
+                amount,
+                timedelta(minutes=settings.pix_reuse_min_validity_minutes),
+            )
+
+            if reusable:
+                logger.info(
+                    "pending_pix_reused",
+                    request_id=request_id,
+                    client_id=client.id,
+                    payment_id=reusable.id,
+                    mp_payment_id=reusable.mp_payment_id,
+                )
+
+                release_connection(db)
+
+                pix_message = self.build_pix_message(
+                    amount, month_ref, condo, block, apartment,
+                    reusable.pix_code, format_remaining(reusable.pix_expires_at),
+                    manual_confirmation=reusable.mp_payment_id is None,
+                )
+                await self._send_pix(db, reusable, phone, pix_message, request_id)
+
+                return self._result(client.id, reusable, amount, reused=True)
+
+            # 5. Generate external reference
             external_reference = mercadopago_service.generate_external_reference(
                 month_ref=month_ref,
                 amount=amount,
@@ -106,88 +361,120 @@ class PIXHandler:
                 apartment=apartment,
             )
 
-            # 5. Create PIX in Mercado Pago
+            # 6. Create PIX in Mercado Pago (key derived from the charge, not the request)
             description = f"Pagamento PIX - {condo} - Bloco {block} - Apto {apartment} - {month_ref}"
 
-            mp_response = await mercadopago_service.create_pix_payment(
+            idempotency_key = mercadopago_service.generate_idempotency_key(
+                client_id=client.id,
+                month_ref=month_ref,
                 amount=amount,
-                description=description,
-                external_reference=external_reference,
-                request_id=request_id,
+                generation=payment_service.count_attempts(db, client.id, month_ref, amount),
             )
 
-            # 6. Extract PIX data
-            mp_payment_id = str(mp_response.get("id"))
-            pix_code = mercadopago_service.extract_pix_code(mp_response)
+            release_connection(db)
 
-            if not pix_code:
-                logger.error(
-                    "pix_code_not_generated",
+            local_fallback = False
+            try:
+                mp_response = await mercadopago_service.create_pix_payment(
+                    amount=amount,
+                    description=description,
+                    external_reference=external_reference,
                     request_id=request_id,
-                    mp_payment_id=mp_payment_id,
+                    idempotency_key=idempotency_key,
                 )
-                raise Exception("Failed to generate PIX code")
 
-            # 7. Create payment record
+                # 7. Extract PIX data and check it before it reaches the client
+                mp_payment_id = str(mp_response.get("id"))
+                pix_code = mercadopago_service.extract_pix_code(mp_response)
+                pix_expires_at = mercadopago_service.extract_expiration(mp_response)
+
+                if not pix_code:
+                    logger.error(
+                        "pix_code_not_generated",
+                        request_id=request_id,
+                        mp_payment_id=mp_payment_id,
+                    )
+                    raise BRCodeError("Mercado Pago returned no PIX code")
+
+                mercadopago_service.validate_pix_code(pix_code, amount, request_id)
+
+            except (httpx.HTTPError, BRCodeError) as mp_error:
+                if not settings.pix_fallback_key:
+                    raise
+
+                # Mercado Pago degraded: static PIX for the configured key,
+                # confirmed manually by the administration
+                logger.warning(
+                    "mercadopago_degraded_using_local_pix",
+                    request_id=request_id,
+                    error=str(mp_error),
+                )
+                mp_payment_id = None
+                pix_code = build_local_pix_code(amount, request_id or external_reference)
+                pix_expires_at = datetime.now(timezone.utc) + timedelta(
+                    hours=settings.pix_expiration_hours
+                )
+                local_fallback = True
+
+            # 8. Create payment record with the Mercado Pago ID and PIX code
+            # (kept for resending); the Sheets row is appended by the outbox
+            # relay after this commit (the sync job owns the sheet when enabled)
+            if not settings.sheets_sync_enabled:
+                outbox_relay.enqueue(
+                    db,
+                    "sheets_append",
+                    {
+                        "request_id": request_id,
+                        "name": name,
+                        "phone": phone,
+                        "condo": condo,
+                        "block": block,
+                        "apartment": apartment,
+                        "month_ref": month_ref,
+                        "amount": amount,
+                        "status": "pending",
+                        "mp_payment_id": mp_payment_id,
+                        "tracking_request_id": request_id,
+                    },
+                )
             payment_data = PaymentCreate(
                 client_id=client.id,
                 month_ref=month_ref,
                 amount=amount,
                 external_reference=external_reference,
             )
-
-            payment = payment_service.create(db, payment_data, request_id)
-
-            # 8. Update with Mercado Pago ID
-            payment_service.update_status(
+            payment, created = payment_service.record_charge(
                 db,
-                payment,
-                status="pending",
+                payment_data,
+                request_id,
                 mp_payment_id=mp_payment_id,
+                pix_code=pix_code,
+                pix_expires_at=pix_expires_at,
             )
-
-            # 9. Register in Google Sheets
-            try:
-                sheets_service.create_payment_row(
-                    request_id=request_id,
-                    name=name,
-                    phone=phone,
-                    condo=condo,
-                    block=block,
-                    apartment=apartment,
-                    month_ref=month_ref,
-                    amount=amount,
-                    status="pending",
-                    mp_payment_id=mp_payment_id,
-                    tracking_request_id=request_id,
+            release_connection(db)
+
+            if not created:
+                # A concurrent request with the same key already recorded
+                # this charge (and its Sheets row)
+                pix_message = self.build_pix_message(
+                    amount, month_ref, condo, block, apartment,
+                    pix_code, format_remaining(pix_expires_at),
+                    manual_confirmation=payment.mp_payment_id is None,
                 )
-                logger.info(
-                    "payment_registered_in_sheets",
-                    request_id=request_id,
-                    payment_id=payment.id,
-                )
-            except Exception as sheets_error:
-                logger.error(
-                    "failed_to_register_in_sheets",
-                    request_id=request_id,
-                    error=str(sheets_error),
-                    exc_info=True,
-                )
-                # Don't fail the entire operation if sheets fails
-
-            # 10. Send PIX code via WhatsApp
-            pix_message = (
-                f"✅ PIX gerado com sucesso!\n\n"
-                f"💰 Valor: R$ {amount:.2f}\n"
-                f"📅 Referência: {month_ref}\n"
-                f"🏢 {condo} - Bloco {block} - Apto {apartment}\n\n"
-                f"🔑 Código PIX Copia e Cola:\n\n"
-                f"{pix_code}\n\n"
-                f"⏰ Este PIX expira em 6 horas.\n\n"
-                f"Após o pagamento, você receberá a confirmação automaticamente."
+                await self._send_pix(db, payment, phone, pix_message, request_id)
+
+                return self._result(client.id, payment, amount, reused=True)
+
+            outbox_relay.wake()
+
+            # 9. Send PIX code via WhatsApp
+            pix_message = self.build_pix_message(
+                amount, month_ref, condo, block, apartment,
+                pix_code, f"{settings.pix_expiration_hours} horas",
+                manual_confirmation=local_fallback,
             )
 
-            await whatsapp_service.send_text_message(phone, pix_message, request_id)
+            await self._send_pix(db, payment, phone, pix_message, request_id)
 
             logger.info(
                 "pix_generated_and_sent",
@@ -197,14 +484,7 @@ class PIXHandler:
                 mp_payment_id=mp_payment_id,
             )
 
-            return {
-                "success": True,
-                "client_id": client.id,
-                "payment_id": payment.id,
-                "mp_payment_id": mp_payment_id,
-                "pix_code": pix_code,
-                "amount": amount,
-            }
+            return self._result(client.id, payment, amount, reused=False)
 
         except Exception as e:
             logger.error(
@@ -215,6 +495,8 @@ class PIXHandler:
                 exc_info=True,
             )
 
+            db.rollback()
+
             # Send error message to user
             error_message = (
                 "❌ Desculpe, ocorreu um erro ao gerar seu PIX.\n\n"
@@ -235,3 +517,4 @@ class PIXHandler:
 
 # Global instance
 pix_handler = PIXHandler()
+outbox_relay.register("sheets_append", lambda payload: sheets_service.create_payment_row(**payload))
@@ -0,0 +1,69 @@
+"""PIX QR image rendering off the event loop.
+
+Workers come from a forkserver, not ``fork``: by the time the first QR is
+rendered the app runs threads (database pool, Sheets refresher, asyncio's
+default executor) and a forked child could inherit one of their locks held.
+The forkserver is a fresh interpreter started before any of that, and the
+pool is created at startup so the first PIX does not pay for it.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.utils.qr import render_qr_png
+
+logger = get_logger(__name__)
+
+
+class QRRenderer:
+    """Render QR PNGs on a process pool so CPU work never blocks the loop."""
+
+    def __init__(self) -> None:
+        """Initialize renderer."""
+        self.max_workers = settings.qr_render_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        """Create the process pool and start its workers."""
+        executor = self._get_executor()
+        # Workers start on the first submission; do it now, not on a request
+        executor.submit(render_qr_png, "warmup")
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the process pool, creating it on first use (e.g. in scripts)."""
+        if self._executor is None:
+            context = multiprocessing.get_context("forkserver")
+            # Preloaded once in the server, so each worker forks with it imported
+            context.set_forkserver_preload(["src.utils.qr"])
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+            )
+            logger.info("qr_render_pool_started", workers=self.max_workers)
+        return self._executor
+
+    async def render(self, data: str) -> bytes:
+        """
+        Render a QR code PNG.
+
+        Args:
+            data: Text to encode
+
+        Returns:
+            PNG bytes
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), render_qr_png, data)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+qr_renderer = QRRenderer()
@@ -0,0 +1,389 @@
+"""Monthly payment reminder campaigns over WhatsApp templates.
+
+A campaign for a month first stages one ``reminder_deliveries`` row per
+client without an approved payment (a single ``INSERT ... SELECT``; rows
+already present are kept). It then works through the pending rows in
+batches: each batch is claimed with ``FOR UPDATE SKIP LOCKED``, sent
+through a concurrency- and rate-limited sender, and its results written
+back with one ``UPDATE``.
+
+Re-running a month is safe: sent rows are never sent again, failed rows are
+retried up to ``REMINDER_MAX_ATTEMPTS`` and clients who paid in the
+meantime are skipped. A failed row waits for an exponential backoff
+(``REMINDER_RETRY_BASE_SECONDS``, like the outbox) and is never retried by
+the run that failed it. A 429 from WhatsApp halves the send rate, pauses
+for ``Retry-After`` and does not use up an attempt; a batch rejected
+entirely with 429 ends the run. A batch interrupted mid-send is claimed
+again after ``STALE_CLAIM_SECONDS``, so its recipients may get the reminder
+twice.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Collection, Optional
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.core.http import http_client
+from src.core.logging import get_logger
+from src.services.whatsapp import whatsapp_service
+
+logger = get_logger(__name__)
+
+# A "sending" row older than this belongs to an interrupted run
+STALE_CLAIM_SECONDS = 600
+
+# Longest error text kept per delivery
+MAX_ERROR_LENGTH = 500
+
+# Upper bound of the retry backoff
+MAX_BACKOFF_SECONDS = 6 * 3600
+
+# Pause after a 429 without a usable Retry-After header
+RATE_LIMIT_PAUSE_SECONDS = 30.0
+
+_APPROVED = (
+    "EXISTS (SELECT 1 FROM payments p WHERE p.client_id = {alias}.client_id "
+    "AND p.month_ref = {alias}.month_ref AND p.status = 'approved')"
+)
+
+
+@dataclass
+class Recipient:
+    """A claimed delivery."""
+
+    client_id: int
+    phone: str
+    name: str
+
+
+class RateLimiter:
+    """Spaces calls out to at most ``rate`` per second across all tasks."""
+
+    def __init__(self, rate: float) -> None:
+        """Initialize limiter (``rate`` <= 0 disables it)."""
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Wait for the next free slot."""
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def slow_down(self, pause: float) -> None:
+        """Halve the rate and give no slot for the next ``pause`` seconds."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            # A disabled limiter starts at one call per second
+            self.interval = self.interval * 2 if self.interval else 1.0
+            self._next = max(self._next, loop.time() + pause)
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Seconds to pause after a 429, from ``Retry-After`` when it is numeric."""
+    try:
+        return max(float(response.headers.get("Retry-After", "")), 0.0)
+    except ValueError:
+        return RATE_LIMIT_PAUSE_SECONDS
+
+
+class ReminderCampaign:
+    """Stage, send and track payment reminders for a month."""
+
+    def __init__(self) -> None:
+        """Initialize campaign settings."""
+        self.template = settings.reminder_template_name
+        self.language = settings.reminder_template_language
+        self.concurrency = settings.reminder_concurrency
+        self.rate = settings.reminder_rate_per_second
+        self.batch_size = settings.reminder_batch_size
+        self.max_attempts = settings.reminder_max_attempts
+        self.retry_base = settings.reminder_retry_base_seconds
+
+    def stage(self, db: Session, month_ref: str, condo: Optional[str] = None) -> int:
+        """
+        Create pending deliveries for every client without an approved payment.
+
+        Args:
+            db: Database session
+            month_ref: Month reference (YYYY-MM)
+            condo: Only clients of this condominium
+
+        Returns:
+            Deliveries created (clients already staged are not counted)
+        """
+        result = db.execute(
+            text(
+                "INSERT INTO reminder_deliveries (client_id, month_ref, template) "
+                "SELECT c.id, :month_ref, :template FROM clients c "
+                "WHERE (CAST(:condo AS text) IS NULL OR c.condo = :condo) "
+                "AND NOT EXISTS (SELECT 1 FROM payments p WHERE p.client_id = c.id "
+                "AND p.month_ref = :month_ref AND p.status = 'approved') "
+                "ON CONFLICT (client_id, month_ref) DO NOTHING"
+            ),
+            {"month_ref": month_ref, "template": self.template, "condo": condo},
+        )
+        db.commit()
+        return result.rowcount
+
+    def claim(
+        self,
+        db: Session,
+        month_ref: str,
+        limit: int,
+        attempted: Collection[int] = (),
+    ) -> tuple[list[Recipient], int]:
+        """
+        Claim the next batch of deliveries to send.
+
+        Deliveries of clients who have paid since staging are marked
+        ``skipped`` first. Failed deliveries are only claimed once their
+        backoff has elapsed.
+
+        Args:
+            db: Database session
+            month_ref: Month reference (YYYY-MM)
+            limit: Batch size
+            attempted: Clients already tried in this run, never claimed again
+
+        Returns:
+            Claimed recipients and the number of deliveries skipped
+        """
+        sendable = (
+            "{alias}.month_ref = :month_ref "
+            "AND NOT {alias}.client_id = ANY(CAST(:attempted AS integer[])) "
+            "AND ({alias}.status = 'pending' "
+            "OR ({alias}.status = 'failed' AND {alias}.attempts < :max_attempts "
+            "AND {alias}.available_at <= now()) "
+            "OR ({alias}.status = 'sending' "
+            "AND {alias}.updated_at < now() - make_interval(secs => :stale)))"
+        )
+        params = {
+            "month_ref": month_ref,
+            "attempted": list(attempted),
+            "max_attempts": self.max_attempts,
+            "stale": STALE_CLAIM_SECONDS,
+        }
+
+        skipped = db.execute(
+            text(
+                "UPDATE reminder_deliveries d SET status = 'skipped', updated_at = now() "
+                f"WHERE {sendable.format(alias='d')} AND {_APPROVED.format(alias='d')}"
+            ),
+            params,
+        ).rowcount
+
+        rows = db.execute(
+            text(
+                "UPDATE reminder_deliveries d SET status = 'sending', "
+                "attempts = d.attempts + 1, updated_at = now() "
+                "FROM clients c WHERE c.id = d.client_id AND (d.client_id, d.month_ref) IN ("
+                "SELECT q.client_id, q.month_ref FROM reminder_deliveries q "
+                f"WHERE {sendable.format(alias='q')} "
+                "ORDER BY q.client_id LIMIT :limit FOR UPDATE SKIP LOCKED) "
+                "RETURNING d.client_id, c.phone, c.name"
+            ),
+            {**params, "limit": limit},
+        ).all()
+        db.commit()
+        return [Recipient(client_id=row[0], phone=row[1], name=row[2]) for row in rows], skipped
+
+    def record(
+        self,
+        db: Session,
+        month_ref: str,
+        results: list[tuple[int, Optional[str], Optional[str], bool]],
+    ) -> None:
+        """
+        Store a batch's results with one statement.
+
+        Failed deliveries become due again after ``retry_base * 2^(attempt-1)``
+        seconds; rate-limited ones get their attempt back.
+
+        Args:
+            db: Database session
+            month_ref: Month reference (YYYY-MM)
+            results: (client_id, message_id, error, throttled) per recipient;
+                a message_id means sent, an error means failed, throttled
+                means WhatsApp answered 429
+        """
+        if not results:
+            return
+        client_ids, message_ids, errors, throttled = (list(column) for column in zip(*results, strict=True))
+        db.execute(
+            text(
+                "UPDATE reminder_deliveries d SET "
+                "status = CASE WHEN r.error IS NULL THEN 'sent' ELSE 'failed' END, "
+                "attempts = CASE WHEN r.throttled THEN d.attempts - 1 ELSE d.attempts END, "
+                "available_at = CASE WHEN r.error IS NULL THEN d.available_at "
+                "ELSE now() + make_interval(secs => LEAST("
+                ":retry_base * power(2, GREATEST(d.attempts - 1, 0)), :max_backoff)) END, "
+                "message_id = r.message_id, error = r.error, "
+                "sent_at = CASE WHEN r.error IS NULL THEN now() END, updated_at = now() "
+                "FROM unnest(CAST(:client_ids AS integer[]), CAST(:message_ids AS text[]), "
+                "CAST(:errors AS text[]), CAST(:throttled AS boolean[])) "
+                "AS r(client_id, message_id, error, throttled) "
+                "WHERE d.client_id = r.client_id AND d.month_ref = :month_ref"
+            ),
+            {
+                "client_ids": client_ids,
+                "message_ids": message_ids,
+                "errors": errors,
+                "throttled": throttled,
+                "retry_base": self.retry_base,
+                "max_backoff": MAX_BACKOFF_SECONDS,
+                "month_ref": month_ref,
+            },
+        )
+        db.commit()
+
+    @staticmethod
+    def counts(db: Session, month_ref: str) -> dict[str, int]:
+        """
+        Deliveries per status for a month.
+
+        Args:
+            db: Database session
+            month_ref: Month reference (YYYY-MM)
+
+        Returns:
+            Count per status
+        """
+        rows = db.execute(
+            text(
+                "SELECT status, count(*) FROM reminder_deliveries "
+                "WHERE month_ref = :month_ref GROUP BY status"
+            ),
+            {"month_ref": month_ref},
+        ).all()
+        return dict(rows)
+
+    def _components(self, recipient: Recipient, month_ref: str) -> list[dict[str, Any]]:
+        """Template body parameters: client's first name and MM/YYYY."""
+        year, month = month_ref.split("-")
+        first_name = recipient.name.split()[0] if recipient.name.strip() else recipient.name
+        return [
+            {
+                "type": "body",
+                "parameters": [
+                    {"type": "text", "text": first_name},
+                    {"type": "text", "text": f"{month}/{year}"},
+                ],
+            }
+        ]
+
+    async def _send(
+        self,
+        http: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        limiter: RateLimiter,
+        recipient: Recipient,
+        month_ref: str,
+    ) -> tuple[int, Optional[str], Optional[str], bool]:
+        """Send one reminder; never raises."""
+        async with semaphore:
+            await limiter.wait()
+            try:
+                response = await whatsapp_service.send_template_message(
+                    to=recipient.phone,
+                    template_name=self.template,
+                    language_code=self.language,
+                    components=self._components(recipient, month_ref),
+                    request_id=f"reminder-{month_ref}-{recipient.client_id}",
+                    http=http,
+                )
+            except Exception as e:
+                detail = str(e)
+                throttled = False
+                if isinstance(e, httpx.HTTPStatusError):
+                    detail = f"{detail}: {e.response.text}"
+                    if e.response.status_code == 429:
+                        throttled = True
+                        pause = _retry_after(e.response)
+                        logger.warning("reminder_rate_limited", client_id=recipient.client_id, pause=pause)
+                        await limiter.slow_down(pause)
+                return recipient.client_id, None, detail[:MAX_ERROR_LENGTH], throttled
+            return recipient.client_id, response.get("messages", [{}])[0].get("id", ""), None, False
+
+    async def run(
+        self,
+        month_ref: str,
+        condo: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> dict[str, int]:
+        """
+        Stage and send a month's reminders.
+
+        Args:
+            month_ref: Month reference (YYYY-MM)
+            condo: Only clients of this condominium
+            limit: Stop after claiming this many deliveries
+
+        Returns:
+            Deliveries staged, sent, failed (of which throttled, i.e. 429)
+            and skipped in this run
+        """
+        totals = {"staged": 0, "sent": 0, "failed": 0, "skipped": 0, "throttled": 0}
+        attempted: set[int] = set()
+        semaphore = asyncio.Semaphore(max(self.concurrency, 1))
+        limiter = RateLimiter(self.rate)
+
+        db = SessionLocal()
+        try:
+            totals["staged"] = await asyncio.to_thread(self.stage, db, month_ref, condo)
+            logger.info("reminder_campaign_started", month_ref=month_ref, condo=condo, staged=totals["staged"])
+
+            claimed = 0
+            async with http_client(timeout=30.0) as http:
+                while limit is None or claimed < limit:
+                    size = self.batch_size if limit is None else min(self.batch_size, limit - claimed)
+                    recipients, skipped = await asyncio.to_thread(
+                        self.claim, db, month_ref, size, attempted
+                    )
+                    totals["skipped"] += skipped
+                    if not recipients:
+                        break
+                    claimed += len(recipients)
+                    attempted.update(r.client_id for r in recipients)
+
+                    results = await asyncio.gather(
+                        *(self._send(http, semaphore, limiter, r, month_ref) for r in recipients)
+                    )
+                    await asyncio.to_thread(self.record, db, month_ref, results)
+
+                    failed = sum(1 for _, _, error, _ in results if error is not None)
+                    throttled = sum(1 for *_, is_throttled in results if is_throttled)
+                    totals["sent"] += len(results) - failed
+                    totals["failed"] += failed
+                    totals["throttled"] += throttled
+                    logger.info(
+                        "reminder_batch_sent",
+                        month_ref=month_ref,
+                        sent=len(results) - failed,
+                        failed=failed,
+                        throttled=throttled,
+                    )
+                    if throttled == len(results):
+                        # WhatsApp is refusing everything; rows wait for their backoff
+                        logger.warning("reminder_campaign_throttled", month_ref=month_ref)
+                        break
+        finally:
+            db.close()
+
+        logger.info("reminder_campaign_finished", month_ref=month_ref, **totals)
+        return totals
+
+
+# Global instance
+reminder_campaign = ReminderCampaign()
@@ -0,0 +1,182 @@
+"""Google credentials manager for the Sheets service.
+
+Credentials are loaded once at startup and refreshed by a background task
+shortly before they expire, so request threads always find a valid token.
+Interactive OAuth never runs inside the application: authorize once with
+``scripts/authorize_sheets.py`` to create the token file.
+"""
+import asyncio
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Google Sheets API scope
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+# Wait before retrying a failed refresh
+RETRY_DELAY_SECONDS = 30
+
+
+class SheetsCredentialsManager:
+    """Load Google credentials once and keep them fresh in the background."""
+
+    def __init__(self) -> None:
+        """Initialize credentials manager."""
+        self.credentials_file = settings.google_sheets_credentials_file
+        self.token_file = settings.google_sheets_token_file
+        self.refresh_margin = timedelta(seconds=settings.google_sheets_refresh_margin_seconds)
+        self._credentials: Any = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _load(self) -> Any:
+        """
+        Load credentials from disk without any user interaction.
+
+        Tries the service account file first, then an authorized-user token
+        file created by ``scripts/authorize_sheets.py``.
+
+        Returns:
+            Google credentials
+
+        Raises:
+            FileNotFoundError: If no usable credentials exist
+        """
+        from google.oauth2.credentials import Credentials
+        from google.oauth2.service_account import Credentials as ServiceAccountCredentials
+
+        if os.path.exists(self.credentials_file):
+            try:
+                creds = ServiceAccountCredentials.from_service_account_file(
+                    self.credentials_file, scopes=SCOPES
+                )
+                logger.info("using_service_account_credentials")
+                return creds
+            except Exception as e:
+                logger.warning(
+                    "service_account_failed",
+                    error=str(e),
+                )
+
+        if os.path.exists(self.token_file):
+            creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
+            logger.info("using_authorized_user_credentials", token_file=self.token_file)
+            return creds
+
+        logger.error(
+            "credentials_file_not_found",
+            file=self.credentials_file,
+            token_file=self.token_file,
+        )
+        raise FileNotFoundError(
+            f"No Google credentials found ({self.credentials_file} or {self.token_file}). "
+            "Use a service account or run scripts/authorize_sheets.py"
+        )
+
+    def get(self) -> Any:
+        """
+        Get the shared credentials, loading them on first use.
+
+        Returns:
+            Google credentials (may still need a refresh if the background
+            task has not run yet)
+        """
+        with self._lock:
+            if self._credentials is None:
+                self._credentials = self._load()
+            return self._credentials
+
+    def needs_refresh(self) -> bool:
+        """Check whether the token is missing or about to expire."""
+        creds = self._credentials
+        if creds is None:
+            return False
+        if not creds.token or creds.expiry is None:
+            return True
+        return datetime.utcnow() >= creds.expiry - self.refresh_margin
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Refresh the access token if it is close to expiring.
+
+        Runs on startup and in the background task, never on a request
+        thread. Authorized-user tokens are written back to the token file.
+
+        Args:
+            force: Refresh even if the token is still fresh
+
+        Returns:
+            True if a refresh happened
+        """
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+
+        creds = self.get()
+
+        # Refresh the shared object itself: Sheets clients hold a reference to
+        # it. One refresh at a time; get() waits for it only while it runs
+        with self._lock:
+            if not force and not self.needs_refresh():
+                return False
+
+            creds.refresh(Request())
+
+            if isinstance(creds, Credentials):
+                with open(self.token_file, "w") as token:
+                    token.write(creds.to_json())
+
+        logger.info("credentials_refreshed", expiry=str(creds.expiry))
+        return True
+
+    def seconds_until_refresh(self) -> float:
+        """Seconds until the token enters the refresh margin."""
+        creds = self._credentials
+        if creds is None or creds.expiry is None:
+            return 0.0
+        due = creds.expiry - self.refresh_margin - datetime.utcnow()
+        return max(due.total_seconds(), 0.0)
+
+    async def _run(self) -> None:
+        """Background loop refreshing the token before it expires."""
+        while True:
+            delay = self.seconds_until_refresh()
+            await asyncio.sleep(delay)
+
+            try:
+                await asyncio.to_thread(self.refresh)
+                if self._credentials is not None and self._credentials.expiry is None:
+                    # Token without expiry: nothing left to schedule
+                    return
+            except Exception as e:
+                logger.error(
+                    "credentials_refresh_failed",
+                    error=str(e),
+                    exc_info=True,
+                )
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+
+    def start(self) -> None:
+        """Start the background refresh task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="sheets-credentials-refresh")
+            logger.info("credentials_refresh_task_started")
+
+    async def stop(self) -> None:
+        """Stop the background refresh task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global instance
+sheets_credentials = SheetsCredentialsManager()
@@ -1,22 +1,21 @@
-"""Google Sheets service for payment tracking."""
-import os
+"""Google Sheets service for payment tracking.
+
+The Google client libraries are slow to import (googleapiclient alone pulls
+in httplib2, uritemplate and the discovery machinery), so they are imported
+inside the methods that need them. Importing this module, and therefore
+``src.main``, stays cheap; the cost is paid once by :meth:`prepare` during
+application startup.
+"""
+import threading
 from datetime import datetime
 from typing import Any, Optional
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google.oauth2.service_account import Credentials as ServiceAccountCredentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-
 from src.core.config import settings
 from src.core.logging import get_logger
+from src.services.sheets_credentials import sheets_credentials
 
 logger = get_logger(__name__)
 
-# Google Sheets API scope
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-
 
 class GoogleSheetsService:
     """Service for interacting with Google Sheets."""
@@ -25,83 +24,98 @@ class GoogleSheetsService:
         """Initialize Google Sheets service."""
         self.spreadsheet_id = settings.google_sheets_spreadsheet_id
         self.sheet_name = settings.google_sheets_sheet_name
-        self.credentials_file = settings.google_sheets_credentials_file
+        self.credentials = sheets_credentials
         self.service = None
+        self._service_lock = threading.Lock()
+        self._local = threading.local()
 
-    def _get_credentials(self) -> Credentials | ServiceAccountCredentials:
+    def _get_service(self) -> Any:
         """
-        Get Google API credentials.
+        Get Google Sheets service.
 
-        Tries service account first, falls back to OAuth flow.
+        The service object is built once and shared; the lock keeps
+        concurrent thread-pool calls from building it twice. The discovery
+        document bundled with google-api-python-client is used
+        (``static_discovery=True``), so building the client never fetches it
+        over the network.
 
         Returns:
-            Google credentials
+            Google Sheets API service
+        """
+        if self.service is not None:
+            return self.service
+
+        with self._service_lock:
+            if self.service is None:
+                from googleapiclient.discovery import build
+
+                client_options = None
+                if settings.google_sheets_api_endpoint:
+                    client_options = {"api_endpoint": settings.google_sheets_api_endpoint}
+                self.service = build(
+                    "sheets",
+                    "v4",
+                    credentials=self.credentials.get(),
+                    client_options=client_options,
+                    static_discovery=True,
+                    cache_discovery=False,
+                )
+                logger.info("google_sheets_service_initialized")
 
-        Raises:
-            Exception: If credentials cannot be obtained
+        return self.service
+
+    def _execute(self, request: Any) -> dict:
         """
-        creds = None
+        Execute an API request on this thread's own HTTP connection.
 
-        # Try service account credentials first (recommended for production)
-        if os.path.exists(self.credentials_file):
-            try:
-                creds = ServiceAccountCredentials.from_service_account_file(
-                    self.credentials_file, scopes=SCOPES
-                )
-                logger.info("using_service_account_credentials")
-                return creds
-            except Exception as e:
-                logger.warning(
-                    "service_account_failed",
-                    error=str(e),
-                )
+        httplib2 connections are not thread-safe, so each worker thread gets
+        its own authorized connection sharing the managed credentials.
 
-        # Fall back to OAuth flow (for development)
-        token_file = "token.json"
-
-        if os.path.exists(token_file):
-            creds = Credentials.from_authorized_user_file(token_file, SCOPES)
-
-        # If credentials don't exist or are invalid, get new ones
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-                logger.info("credentials_refreshed")
-            else:
-                if not os.path.exists(self.credentials_file):
-                    logger.error(
-                        "credentials_file_not_found",
-                        file=self.credentials_file,
-                    )
-                    raise FileNotFoundError(
-                        f"Credentials file not found: {self.credentials_file}"
-                    )
-
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    self.credentials_file, SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-                logger.info("new_credentials_obtained")
+        Args:
+            request: googleapiclient HttpRequest
+
+        Returns:
+            API response
+        """
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import google_auth_httplib2
+            import httplib2
 
-            # Save credentials for next run
-            with open(token_file, "w") as token:
-                token.write(creds.to_json())
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials.get(), http=httplib2.Http()
+            )
+            self._local.http = http
 
-        return creds
+        return request.execute(http=http)
 
-    def _get_service(self) -> Any:
+    def prepare(self) -> bool:
         """
-        Get Google Sheets service.
+        Load credentials and build the Sheets client ahead of time.
+
+        Called from the application lifespan so the first payment approval
+        does not pay for imports, credential loading, token fetching and
+        client discovery inside the webhook request. Failures are logged,
+        not raised: the request path will retry lazily.
 
         Returns:
-            Google Sheets API service
+            True if the service is ready
         """
-        if not self.service:
-            creds = self._get_credentials()
-            self.service = build("sheets", "v4", credentials=creds)
-            logger.info("google_sheets_service_initialized")
+        if not self.spreadsheet_id:
+            logger.info("google_sheets_not_configured")
+            return False
 
-        return self.service
+        try:
+            self.credentials.refresh()
+            self._get_service()
+            return True
+        except Exception as e:
+            logger.error(
+                "google_sheets_prepare_failed",
+                error=str(e),
+                exc_info=True,
+            )
+            return False
 
     def append_row(
         self,
@@ -132,7 +146,7 @@ class GoogleSheetsService:
 
             body = {"values": [values]}
 
-            result = (
+            result = self._execute(
                 service.spreadsheets()
                 .values()
                 .append(
@@ -141,7 +155,6 @@ class GoogleSheetsService:
                     valueInputOption="RAW",
                     body=body,
                 )
-                .execute()
             )
 
             logger.info(
@@ -196,14 +209,13 @@ class GoogleSheetsService:
             service = self._get_service()
 
             # 1. Find the row with matching request_id
-            result = (
+            result = self._execute(
                 service.spreadsheets()
                 .values()
                 .get(
                     spreadsheetId=self.spreadsheet_id,
                     range=f"{self.sheet_name}!A:M",
                 )
-                .execute()
             )
 
             values = result.get("values", [])
@@ -242,11 +254,10 @@ class GoogleSheetsService:
 
             body = {"valueInputOption": "RAW", "data": updates}
 
-            result = (
+            result = self._execute(
                 service.spreadsheets()
                 .values()
                 .batchUpdate(spreadsheetId=self.spreadsheet_id, body=body)
-                .execute()
             )
 
             logger.info(
@@ -320,6 +331,97 @@ class GoogleSheetsService:
 
         return self.append_row(values, tracking_request_id)
 
+    def get_all_rows(self) -> list[list[Any]]:
+        """
+        Read every row of the sheet (header included).
+
+        Returns:
+            Rows as lists of cell values; trailing empty cells are omitted
+            by the API
+        """
+        service = self._get_service()
+
+        result = self._execute(
+            service.spreadsheets()
+            .values()
+            .get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{self.sheet_name}!A:L",
+            )
+        )
+
+        return result.get("values", [])
+
+    def append_rows(
+        self,
+        rows: list[list[Any]],
+        request_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Append several rows with a single API call.
+
+        Args:
+            rows: Rows to append
+            request_id: Request ID for tracking
+
+        Returns:
+            API response (``updates.updatedRange`` holds the rows written)
+        """
+        logger.info(
+            "appending_rows_to_sheets",
+            request_id=request_id,
+            rows=len(rows),
+        )
+
+        service = self._get_service()
+
+        return self._execute(
+            service.spreadsheets()
+            .values()
+            .append(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{self.sheet_name}!A:L",
+                valueInputOption="RAW",
+                insertDataOption="INSERT_ROWS",
+                body={"values": rows},
+            )
+        )
+
+    def update_rows(
+        self,
+        rows: dict[int, list[Any]],
+        request_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Overwrite several full rows with a single ``batchUpdate`` call.
+
+        Args:
+            rows: Mapping of 1-based row number to row values (A-L)
+            request_id: Request ID for tracking
+
+        Returns:
+            API response
+        """
+        logger.info(
+            "updating_rows_in_sheets",
+            request_id=request_id,
+            rows=len(rows),
+        )
+
+        service = self._get_service()
+
+        data = [
+            {"range": f"{self.sheet_name}!A{row_number}:L{row_number}", "values": [values]}
+            for row_number, values in rows.items()
+        ]
+        body = {"valueInputOption": "RAW", "data": data}
+
+        return self._execute(
+            service.spreadsheets()
+            .values()
+            .batchUpdate(spreadsheetId=self.spreadsheet_id, body=body)
+        )
+
 
 # Global instance
 sheets_service = GoogleSheetsService()
@@ -0,0 +1,221 @@
+"""Diff-based mirror of payments from Postgres to Google Sheets.
+
+Postgres is the source of truth. Each run reads the payments report join
+(payments + clients), hashes every row and compares it with a snapshot of
+what the sheet held after the last sync. Only changed rows are rewritten
+(one ``batchUpdate``) and only new rows are appended (one append), so Sheets
+traffic is proportional to the number of changes rather than the number of
+events.
+
+The snapshot is built from the sheet itself on the first run after startup
+and kept in memory afterwards.
+"""
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.core.database import ReadSessionLocal
+from src.core.logging import get_logger
+from src.models.client import Client
+from src.models.payment import Payment
+from src.services.sheets_service import sheets_service
+
+logger = get_logger(__name__)
+
+# Columns A-L, same layout as GoogleSheetsService.create_payment_row
+ROW_WIDTH = 12
+
+_UPDATED_RANGE = re.compile(r"![A-Z]+(\d+)")
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one sync run."""
+
+    scanned: int = 0
+    updated: int = 0
+    appended: int = 0
+    unchanged: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Return counters as a dict."""
+        return {
+            "scanned": self.scanned,
+            "updated": self.updated,
+            "appended": self.appended,
+            "unchanged": self.unchanged,
+        }
+
+
+def _cell_text(value: Any) -> str:
+    """Render a cell the way the Sheets API returns it for RAW input."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _row_hash(row: list[Any]) -> str:
+    """Hash a row after normalizing its cells to text."""
+    cells = [_cell_text(cell) for cell in row]
+    cells += [""] * (ROW_WIDTH - len(cells))
+    return hashlib.blake2b("\x1f".join(cells[:ROW_WIDTH]).encode(), digest_size=16).hexdigest()
+
+
+def _format_timestamp(value: Optional[datetime]) -> str:
+    """Format a DB timestamp in UTC like the event writers do."""
+    if value is None:
+        return ""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class SheetsSyncService:
+    """Mirror the payments report into Google Sheets, pushing only diffs."""
+
+    def __init__(self) -> None:
+        """Initialize sync service."""
+        # request_id -> (1-based row number, row hash)
+        self._snapshot: Optional[dict[str, tuple[int, str]]] = None
+        self._lock = threading.Lock()
+
+    def _iter_report_rows(self, db: Session) -> Iterator[list[Any]]:
+        """
+        Stream the payments report join as sheet rows.
+
+        Args:
+            db: Database session
+
+        Yields:
+            Row values for columns A-L
+        """
+        stmt = (
+            select(
+                Payment.request_id,
+                Client.name,
+                Client.phone,
+                Client.condo,
+                Client.block,
+                Client.apartment,
+                Payment.month_ref,
+                Payment.amount,
+                Payment.status,
+                Payment.created_at,
+                Payment.paid_at,
+                Payment.mp_payment_id,
+            )
+            .join(Client, Payment.client_id == Client.id)
+            .order_by(Payment.id)
+            .execution_options(yield_per=1000)
+        )
+
+        for row in db.execute(stmt):
+            yield [
+                row.request_id,
+                row.name,
+                row.phone,
+                row.condo,
+                row.block,
+                row.apartment,
+                row.month_ref,
+                float(row.amount),
+                row.status,
+                _format_timestamp(row.created_at),
+                _format_timestamp(row.paid_at),
+                row.mp_payment_id or "",
+            ]
+
+    def _load_snapshot(self) -> dict[str, tuple[int, str]]:
+        """Build the snapshot from the current sheet contents."""
+        snapshot: dict[str, tuple[int, str]] = {}
+
+        for index, row in enumerate(sheets_service.get_all_rows()):
+            if index == 0 or not row or not row[0]:
+                continue  # header or blank row
+            snapshot[str(row[0])] = (index + 1, _row_hash(row))
+
+        logger.info("sheets_snapshot_loaded", rows=len(snapshot))
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next run re-reads the sheet."""
+        self._snapshot = None
+
+    def sync(self, db: Optional[Session] = None) -> SyncResult:
+        """
+        Run one diff-based sync.
+
+        Args:
+            db: Database session (a read-only one, on the replica when available, is opened if omitted)
+
+        Returns:
+            Sync counters
+        """
+        with self._lock:
+            own_session = db is None
+            db = db or ReadSessionLocal()
+            try:
+                return self._sync(db)
+            except Exception:
+                # Sheet state is uncertain after a failed push
+                self.invalidate()
+                raise
+            finally:
+                if own_session:
+                    db.close()
+
+    def _sync(self, db: Session) -> SyncResult:
+        """Sync implementation; caller holds the lock."""
+        if self._snapshot is None:
+            self._snapshot = self._load_snapshot()
+
+        snapshot = self._snapshot
+        result = SyncResult()
+        changed: dict[int, list[Any]] = {}
+        new_rows: list[list[Any]] = []
+        new_hashes: list[tuple[str, str]] = []
+
+        for row in self._iter_report_rows(db):
+            result.scanned += 1
+            row_hash = _row_hash(row)
+            known = snapshot.get(row[0])
+
+            if known is None:
+                new_rows.append(row)
+                new_hashes.append((row[0], row_hash))
+            elif known[1] != row_hash:
+                changed[known[0]] = row
+                snapshot[row[0]] = (known[0], row_hash)
+            else:
+                result.unchanged += 1
+
+        if changed:
+            sheets_service.update_rows(changed)
+            result.updated = len(changed)
+
+        if new_rows:
+            response = sheets_service.append_rows(new_rows)
+            match = _UPDATED_RANGE.search(response.get("updates", {}).get("updatedRange", ""))
+            if match:
+                first_row = int(match.group(1))
+                for offset, (request_id, row_hash) in enumerate(new_hashes):
+                    snapshot[request_id] = (first_row + offset, row_hash)
+            else:
+                # Can't tell where the rows landed: re-read on the next run
+                self.invalidate()
+            result.appended = len(new_rows)
+
+        logger.info("sheets_sync_completed", **result.as_dict())
+        return result
+
+
+# Global instance
+sheets_sync = SheetsSyncService()
@@ -0,0 +1,254 @@
+"""Monthly collection summary maintenance."""
+from decimal import Decimal
+from typing import Any, Optional
+
+from sqlalchemy import case, delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.core.logging import get_logger
+from src.models.client import Client
+from src.models.monthly_summary import MonthlySummary
+from src.models.payment import Payment
+
+logger = get_logger(__name__)
+
+COUNTER_COLUMNS = [
+    "billed_count",
+    "billed_amount",
+    "paid_count",
+    "paid_amount",
+    "pending_count",
+    "expired_count",
+]
+
+
+def _status_deltas(status: str, amount: Decimal, sign: int) -> dict[str, Any]:
+    """Counter changes for one payment entering (+1) or leaving (-1) a status."""
+    deltas: dict[str, Any] = {}
+    if status == "approved":
+        deltas["paid_count"] = sign
+        deltas["paid_amount"] = sign * amount
+    elif status == "pending":
+        deltas["pending_count"] = sign
+    elif status == "expired":
+        deltas["expired_count"] = sign
+    return deltas
+
+
+class MonthlySummaryService:
+    """
+    Keep ``monthly_summaries`` in step with ``payments``.
+
+    Changes are applied as deltas inside the caller's transaction with an
+    atomic upsert, so concurrent webhooks never lose an update and the
+    summary commits or rolls back together with the payment row.
+    """
+
+    @staticmethod
+    def apply_delta(
+        db: Session,
+        condo: str,
+        month_ref: str,
+        deltas: dict[str, Any],
+    ) -> None:
+        """
+        Add counter deltas to a summary row, creating it if needed.
+
+        Does not commit.
+
+        Args:
+            db: Database session
+            condo: Condominium name
+            month_ref: Month reference (YYYY-MM)
+            deltas: Column name -> increment
+        """
+        if not deltas:
+            return
+
+        table = MonthlySummary.__table__
+        stmt = pg_insert(table).values(condo=condo, month_ref=month_ref, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.condo, table.c.month_ref],
+            set_={
+                **{column: table.c[column] + stmt.excluded[column] for column in deltas},
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def record_created(db: Session, condo: str, payment: Payment) -> None:
+        """
+        Count a newly created payment. Does not commit.
+
+        Args:
+            db: Database session
+            condo: Client condominium
+            payment: New payment
+        """
+        amount = Decimal(str(payment.amount))
+        deltas = {"billed_count": 1, "billed_amount": amount}
+        deltas.update(_status_deltas(payment.status, amount, 1))
+        MonthlySummaryService.apply_delta(db, condo, payment.month_ref, deltas)
+
+    @staticmethod
+    def record_status_change(
+        db: Session,
+        condo: str,
+        payment: Payment,
+        old_status: str,
+        new_status: str,
+    ) -> None:
+        """
+        Move a payment between status counters. Does not commit.
+
+        Args:
+            db: Database session
+            condo: Client condominium
+            payment: Updated payment
+            old_status: Previous status
+            new_status: New status
+        """
+        if old_status == new_status:
+            return
+
+        amount = Decimal(str(payment.amount))
+        deltas = _status_deltas(old_status, amount, -1)
+        for column, value in _status_deltas(new_status, amount, 1).items():
+            deltas[column] = deltas.get(column, 0) + value
+        MonthlySummaryService.apply_delta(db, condo, payment.month_ref, deltas)
+
+    @staticmethod
+    def _aggregate_query() -> Any:
+        """GROUP BY over payments join clients producing summary rows."""
+        paid = Payment.status == "approved"
+        return (
+            select(
+                Client.condo,
+                Payment.month_ref,
+                func.count().label("billed_count"),
+                func.coalesce(func.sum(Payment.amount), 0).label("billed_amount"),
+                func.count().filter(paid).label("paid_count"),
+                func.coalesce(func.sum(case((paid, Payment.amount), else_=0)), 0).label(
+                    "paid_amount"
+                ),
+                func.count().filter(Payment.status == "pending").label("pending_count"),
+                func.count().filter(Payment.status == "expired").label("expired_count"),
+            )
+            .join(Client, Payment.client_id == Client.id)
+            .group_by(Client.condo, Payment.month_ref)
+        )
+
+    @staticmethod
+    def list_summaries(
+        db: Session,
+        month_ref: Optional[str] = None,
+        condo: Optional[str] = None,
+    ) -> list[MonthlySummary]:
+        """
+        Read summary rows, latest month first.
+
+        Args:
+            db: Database session
+            month_ref: Filter by month reference (YYYY-MM)
+            condo: Filter by condominium
+
+        Returns:
+            Summary rows
+        """
+        stmt = select(MonthlySummary).order_by(
+            MonthlySummary.month_ref.desc(), MonthlySummary.condo
+        )
+        if month_ref:
+            stmt = stmt.where(MonthlySummary.month_ref == month_ref)
+        if condo:
+            stmt = stmt.where(MonthlySummary.condo == condo)
+        return list(db.scalars(stmt))
+
+    @staticmethod
+    def _live_months() -> Any:
+        """Months that still have payments in Postgres (not archived)."""
+        return select(Payment.month_ref).distinct().scalar_subquery()
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """
+        Recompute the table from payments and commit.
+
+        The table is locked for the duration, so incremental updates from
+        concurrent transactions wait and are applied on top of the rebuilt
+        rows instead of being lost. Rows of archived months (no payments
+        left in Postgres) are kept.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of summary rows written
+        """
+        db.execute(text("LOCK TABLE monthly_summaries IN EXCLUSIVE MODE"))
+        db.execute(
+            delete(MonthlySummary).where(
+                MonthlySummary.month_ref.in_(MonthlySummaryService._live_months())
+            )
+        )
+        query = MonthlySummaryService._aggregate_query()
+        result = db.execute(
+            insert(MonthlySummary).from_select(
+                ["condo", "month_ref", *COUNTER_COLUMNS],
+                query,
+            )
+        )
+        db.commit()
+
+        logger.info("monthly_summary_rebuilt", rows=result.rowcount)
+        return result.rowcount
+
+    @staticmethod
+    def verify(db: Session) -> list[dict[str, Any]]:
+        """
+        Compare the table with a fresh aggregate of payments.
+
+        Archived months are skipped: their payments are no longer in Postgres.
+
+        Args:
+            db: Database session
+
+        Returns:
+            One entry per mismatching (condo, month_ref), empty if consistent
+        """
+        expected = {
+            (row.condo, row.month_ref): {column: row._mapping[column] for column in COUNTER_COLUMNS}
+            for row in db.execute(MonthlySummaryService._aggregate_query())
+        }
+        actual = {
+            (row.condo, row.month_ref): {column: getattr(row, column) for column in COUNTER_COLUMNS}
+            for row in db.scalars(
+                select(MonthlySummary).where(
+                    MonthlySummary.month_ref.in_(MonthlySummaryService._live_months())
+                )
+            )
+        }
+
+        zero = dict.fromkeys(COUNTER_COLUMNS, 0)
+        mismatches = []
+        for key in sorted(expected.keys() | actual.keys()):
+            want = expected.get(key, zero)
+            have = actual.get(key, zero)
+            if want != have:
+                mismatches.append(
+                    {
+                        "condo": key[0],
+                        "month_ref": key[1],
+                        "expected": {k: str(v) for k, v in want.items()},
+                        "actual": {k: str(v) for k, v in have.items()},
+                    }
+                )
+
+        logger.info("monthly_summary_verified", mismatches=len(mismatches))
+        return mismatches
+
+
+# Global instance
+summary_service = MonthlySummaryService()
@@ -4,10 +4,11 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 
+from src.core.config import settings
+from src.core.database import release_connection
 from src.core.logging import get_logger
-from src.models.client import Client
-from src.models.payment import Payment
 from src.services.mercadopago_service import mercadopago_service
+from src.services.outbox import outbox_relay
 from src.services.payment_service import payment_service
 from src.services.sheets_service import sheets_service
 from src.services.whatsapp import whatsapp_service
@@ -31,6 +32,11 @@ class WebhookProcessor:
         """
         Process payment notification from Mercado Pago.
 
+        The Mercado Pago lookup runs before any query. An approval enqueues
+        the WhatsApp confirmation and Sheets update in the outbox, in the
+        same transaction as the status change, so neither is lost if the
+        process dies after the commit.
+
         Args:
             db: Database session
             mp_payment_id: Mercado Pago payment ID
@@ -82,8 +88,9 @@ class WebhookProcessor:
                 status_detail=mp_status_detail,
             )
 
-            # 3. Find payment in our database
-            payment = payment_service.get_by_mp_payment_id(db, mp_payment_id)
+            # 3. Find payment in our database, locked: concurrent notifications
+            # for the same payment wait here and see the status this one sets
+            payment = payment_service.get_by_mp_payment_id(db, mp_payment_id, for_update=True)
 
             if not payment:
                 logger.warning(
@@ -107,6 +114,39 @@ class WebhookProcessor:
             if mp_status == "approved" and payment.status != "approved":
                 # Payment approved
                 paid_at = datetime.utcnow()
+                client = payment.client
+
+                # Confirmation and Sheets update commit with the status change;
+                # the outbox relay executes them (the sync job owns the sheet
+                # when enabled)
+                outbox_relay.enqueue(
+                    db,
+                    "payment_confirmation",
+                    {
+                        "payment_id": payment.id,
+                        "client_id": client.id,
+                        "phone": client.phone,
+                        "amount": float(payment.amount),
+                        "month_ref": payment.month_ref,
+                        "condo": client.condo,
+                        "block": client.block,
+                        "apartment": client.apartment,
+                        "mp_payment_id": mp_payment_id,
+                        "request_id": request_id,
+                    },
+                )
+                if not settings.sheets_sync_enabled:
+                    outbox_relay.enqueue(
+                        db,
+                        "sheets_update",
+                        {
+                            "request_id_value": payment.request_id,
+                            "status": "approved",
+                            "paid_at": paid_at.isoformat(),
+                            "tracking_request_id": request_id,
+                        },
+                    )
+
                 payment_service.update_status(
                     db,
                     payment,
@@ -114,6 +154,8 @@ class WebhookProcessor:
                     mp_payment_id=mp_payment_id,
                     paid_at=paid_at,
                 )
+                release_connection(db)
+                outbox_relay.wake()
                 updated = True
 
                 logger.info(
@@ -123,35 +165,6 @@ class WebhookProcessor:
                     mp_payment_id=mp_payment_id,
                 )
 
-                # Update Google Sheets
-                try:
-                    sheets_service.update_row_by_request_id(
-                        request_id_value=payment.request_id,
-                        status="approved",
-                        paid_at=paid_at,
-                        tracking_request_id=request_id,
-                    )
-                    logger.info(
-                        "payment_updated_in_sheets",
-                        request_id=request_id,
-                        payment_id=payment.id,
-                    )
-                except Exception as sheets_error:
-                    logger.error(
-                        "failed_to_update_sheets",
-                        request_id=request_id,
-                        error=str(sheets_error),
-                        exc_info=True,
-                    )
-                    # Don't fail the entire operation if sheets fails
-
-                # Send confirmation to client
-                await self._send_payment_confirmation(
-                    db,
-                    payment,
-                    request_id,
-                )
-
             elif mp_status in ["cancelled", "rejected"] and payment.status == "pending":
                 # Payment cancelled or rejected
                 payment_service.update_status(
@@ -183,6 +196,10 @@ class WebhookProcessor:
                     )
                     updated = True
 
+            if not updated:
+                # Nothing changed: release the row lock
+                release_connection(db)
+
             # 5. Mark webhook as processed
             processed_webhooks.add(webhook_key)
 
@@ -215,56 +232,63 @@ class WebhookProcessor:
             )
             raise
 
-    async def _send_payment_confirmation(
-        self,
-        db: Session,
-        payment: Payment,
-        request_id: Optional[str] = None,
-    ) -> None:
+    @staticmethod
+    async def send_payment_confirmation(payload: dict) -> None:
         """
-        Send payment confirmation to client via WhatsApp.
+        Send payment confirmation to client via WhatsApp (outbox handler).
 
         Args:
-            db: Database session
-            payment: Payment object
-            request_id: Request ID for tracking
+            payload: Payment and client fields recorded at approval
+
+        Raises:
+            httpx.HTTPError: If the message cannot be sent
         """
-        try:
-            # Get client info
-            client: Client = payment.client
-
-            confirmation_message = (
-                f"✅ Pagamento confirmado!\n\n"
-                f"💰 Valor: R$ {payment.amount:.2f}\n"
-                f"📅 Referência: {payment.month_ref}\n"
-                f"🏢 {client.condo} - Bloco {client.block} - Apto {client.apartment}\n\n"
-                f"Obrigado pelo pagamento! Seu recibo está registrado no sistema.\n\n"
-                f"ID do pagamento: {payment.mp_payment_id}"
-            )
+        confirmation_message = (
+            f"✅ Pagamento confirmado!\n\n"
+            f"💰 Valor: R$ {payload['amount']:.2f}\n"
+            f"📅 Referência: {payload['month_ref']}\n"
+            f"🏢 {payload['condo']} - Bloco {payload['block']} - Apto {payload['apartment']}\n\n"
+            f"Obrigado pelo pagamento! Seu recibo está registrado no sistema.\n\n"
+            f"ID do pagamento: {payload['mp_payment_id']}"
+        )
 
-            await whatsapp_service.send_text_message(
-                to=client.phone,
-                message=confirmation_message,
-                request_id=request_id,
-            )
+        await whatsapp_service.send_text_message(
+            to=payload["phone"],
+            message=confirmation_message,
+            request_id=payload.get("request_id"),
+        )
 
-            logger.info(
-                "payment_confirmation_sent",
-                request_id=request_id,
-                payment_id=payment.id,
-                client_id=client.id,
-            )
+        logger.info(
+            "payment_confirmation_sent",
+            request_id=payload.get("request_id"),
+            payment_id=payload["payment_id"],
+            client_id=payload["client_id"],
+        )
 
-        except Exception as e:
-            logger.error(
-                "failed_to_send_confirmation",
-                request_id=request_id,
-                payment_id=payment.id,
-                error=str(e),
-                exc_info=True,
-            )
-            # Don't raise - webhook was processed successfully
+    @staticmethod
+    def update_sheet_row(payload: dict) -> None:
+        """
+        Mark the payment's spreadsheet row as paid (outbox handler).
+
+        Args:
+            payload: ``update_row_by_request_id`` arguments, paid_at in ISO format
+
+        Raises:
+            LookupError: If the row is not in the sheet yet, so the event is
+                retried after the payment's ``sheets_append``
+        """
+        result = sheets_service.update_row_by_request_id(
+            request_id_value=payload["request_id_value"],
+            status=payload["status"],
+            paid_at=datetime.fromisoformat(payload["paid_at"]) if payload.get("paid_at") else None,
+            tracking_request_id=payload.get("tracking_request_id"),
+        )
+        if result.get("updated") is False:
+            # The append is a separate event that may still be pending or in backoff
+            raise LookupError(f"sheet row {payload['request_id_value']} not found")
 
 
 # Global instance
 webhook_processor = WebhookProcessor()
+outbox_relay.register("payment_confirmation", webhook_processor.send_payment_confirmation)
+outbox_relay.register("sheets_update", webhook_processor.update_sheet_row)
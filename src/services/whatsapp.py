@@ -1,8 +1,10 @@
 """WhatsApp Cloud API service for sending messages."""
 import httpx
+from contextlib import nullcontext
 from typing import Optional
 
 from src.core.config import settings
+from src.core.http import http_client
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -58,7 +60,7 @@ class WhatsAppService:
             message_length=len(message),
         )
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             try:
                 response = await client.post(
                     url,
@@ -96,6 +98,7 @@ class WhatsAppService:
         language_code: str = "pt_BR",
         components: Optional[list] = None,
         request_id: Optional[str] = None,
+        http: Optional[httpx.AsyncClient] = None,
     ) -> dict:
         """
         Send a template message to a WhatsApp number.
@@ -106,6 +109,7 @@ class WhatsAppService:
             language_code: Language code (default: pt_BR)
             components: Template components (parameters, buttons, etc.)
             request_id: Request ID for tracking
+            http: Client to reuse across many sends (bulk campaigns)
 
         Returns:
             Response from WhatsApp API
@@ -135,7 +139,7 @@ class WhatsAppService:
             template=template_name,
         )
 
-        async with httpx.AsyncClient() as client:
+        async with nullcontext(http) if http is not None else http_client() as client:
             try:
                 response = await client.post(
                     url,
@@ -189,7 +193,7 @@ class WhatsAppService:
             "message_id": message_id,
         }
 
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             try:
                 response = await client.post(
                     url,
@@ -217,6 +221,132 @@ class WhatsAppService:
                 )
                 raise
 
+    async def upload_media(
+        self,
+        content: bytes,
+        mime_type: str,
+        filename: str,
+        request_id: Optional[str] = None,
+    ) -> str:
+        """
+        Upload media to WhatsApp so it can be sent by ID.
+
+        Args:
+            content: File bytes
+            mime_type: MIME type (e.g. "image/png")
+            filename: File name shown to the recipient
+            request_id: Request ID for tracking
+
+        Returns:
+            WhatsApp media ID
+
+        Raises:
+            httpx.HTTPError: If request fails
+        """
+        url = f"{self.api_url}/{self.phone_number_id}/media"
+
+        logger.info(
+            "uploading_whatsapp_media",
+            request_id=request_id,
+            mime_type=mime_type,
+            size=len(content),
+        )
+
+        async with http_client() as client:
+            try:
+                response = await client.post(
+                    url,
+                    data={"messaging_product": "whatsapp", "type": mime_type},
+                    files={"file": (filename, content, mime_type)},
+                    headers={"Authorization": self.headers["Authorization"]},
+                    timeout=30.0,
+                )
+                response.raise_for_status()
+
+                media_id = response.json()["id"]
+
+                logger.info(
+                    "whatsapp_media_uploaded",
+                    request_id=request_id,
+                    media_id=media_id,
+                )
+
+                return media_id
+
+            except httpx.HTTPError as e:
+                logger.error(
+                    "whatsapp_media_upload_error",
+                    request_id=request_id,
+                    error=str(e),
+                    exc_info=True,
+                )
+                raise
+
+    async def send_image_message(
+        self,
+        to: str,
+        media_id: str,
+        caption: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Send a previously uploaded image.
+
+        Args:
+            to: Phone number with country code
+            media_id: WhatsApp media ID from :meth:`upload_media`
+            caption: Image caption (optional)
+            request_id: Request ID for tracking
+
+        Returns:
+            Response from WhatsApp API
+
+        Raises:
+            httpx.HTTPError: If request fails
+        """
+        url = f"{self.api_url}/{self.phone_number_id}/messages"
+
+        image: dict = {"id": media_id}
+        if caption:
+            image["caption"] = caption
+
+        payload = {
+            "messaging_product": "whatsapp",
+            "recipient_type": "individual",
+            "to": to,
+            "type": "image",
+            "image": image,
+        }
+
+        logger.info(
+            "sending_whatsapp_image",
+            request_id=request_id,
+            to=to,
+            media_id=media_id,
+        )
+
+        async with http_client() as client:
+            try:
+                response = await client.post(
+                    url,
+                    json=payload,
+                    headers=self.headers,
+                    timeout=30.0,
+                )
+                response.raise_for_status()
+
+                return response.json()
+
+            except httpx.HTTPError as e:
+                logger.error(
+                    "whatsapp_image_send_error",
+                    request_id=request_id,
+                    error=str(e),
+                    to=to,
+                    exc_info=True,
+                )
+                raise
+
 
 # Global instance
 whatsapp_service = WhatsAppService()
@@ -0,0 +1,349 @@
+"""PIX BR Code (EMV QRCPS-MPM) parsing, validation and generation.
+
+A BR Code is a flat sequence of TLV fields: a two-digit ID, a two-digit
+length and the value. Some fields (merchant account information and the
+additional data field) are templates holding nested TLV fields. The last
+field, ID 63, is a CRC16-CCITT (poly 0x1021, init 0xFFFF) over everything
+before its value, including the ``6304`` ID and length.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+PIX_GUI = "br.gov.bcb.pix"
+
+ID_PAYLOAD_FORMAT = "00"
+ID_POINT_OF_INITIATION = "01"
+ID_MERCHANT_ACCOUNT_PIX = "26"
+ID_MERCHANT_CATEGORY = "52"
+ID_CURRENCY = "53"
+ID_AMOUNT = "54"
+ID_COUNTRY = "58"
+ID_MERCHANT_NAME = "59"
+ID_MERCHANT_CITY = "60"
+ID_ADDITIONAL_DATA = "62"
+ID_CRC = "63"
+
+# Merchant account (26) sub-fields
+SUB_GUI = "00"
+SUB_KEY = "01"
+SUB_DESCRIPTION = "02"
+SUB_URL = "25"
+
+# Additional data (62) sub-field
+SUB_TXID = "05"
+
+# Merchant account templates (26-51) and the additional data field are nested
+TEMPLATE_IDS = {f"{i:02d}" for i in range(26, 52)} | {ID_ADDITIONAL_DATA}
+
+CURRENCY_BRL = "986"
+STATIC_INITIATION = "11"
+DYNAMIC_INITIATION = "12"
+
+MAX_NAME_LENGTH = 25
+MAX_CITY_LENGTH = 15
+MAX_TXID_LENGTH = 25
+
+_TXID_PATTERN = re.compile(r"^[A-Za-z0-9]{1,25}$|^\*\*\*$")
+_AMOUNT_PATTERN = re.compile(r"^\d{1,10}\.\d{2}$")
+
+
+def _build_crc_table() -> list[int]:
+    """Precompute CRC16-CCITT values for every byte."""
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+
+_CRC_TABLE = _build_crc_table()
+
+
+def crc16(data: bytes) -> int:
+    """
+    CRC16-CCITT (poly 0x1021, init 0xFFFF, no reflection, no final XOR).
+
+    Args:
+        data: Bytes to checksum
+
+    Returns:
+        16-bit checksum
+    """
+    crc = 0xFFFF
+    table = _CRC_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFF00) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+class BRCodeError(ValueError):
+    """Raised when a BR Code payload is malformed or invalid."""
+
+
+@dataclass
+class BRCode:
+    """Parsed PIX BR Code."""
+
+    payload: str
+    fields: dict[str, str] = field(default_factory=dict)
+    merchant_account: dict[str, str] = field(default_factory=dict)
+    additional_data: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def key(self) -> Optional[str]:
+        """PIX key (static codes)."""
+        return self.merchant_account.get(SUB_KEY)
+
+    @property
+    def url(self) -> Optional[str]:
+        """Payload location URL (dynamic codes)."""
+        return self.merchant_account.get(SUB_URL)
+
+    @property
+    def amount(self) -> Optional[Decimal]:
+        """Transaction amount, if fixed."""
+        value = self.fields.get(ID_AMOUNT)
+        return Decimal(value) if value else None
+
+    @property
+    def txid(self) -> Optional[str]:
+        """Transaction ID from the additional data field."""
+        return self.additional_data.get(SUB_TXID)
+
+    @property
+    def merchant_name(self) -> str:
+        """Merchant (receiver) name."""
+        return self.fields.get(ID_MERCHANT_NAME, "")
+
+    @property
+    def merchant_city(self) -> str:
+        """Merchant (receiver) city."""
+        return self.fields.get(ID_MERCHANT_CITY, "")
+
+    @property
+    def is_dynamic(self) -> bool:
+        """True for codes pointing to a payload URL."""
+        return self.url is not None
+
+
+def _tlv(field_id: str, value: str) -> str:
+    """Encode one TLV field."""
+    if len(value) > 99:
+        raise BRCodeError(f"Field {field_id} is longer than 99 characters")
+    return f"{field_id}{len(value):02d}{value}"
+
+
+def _parse_tlv(data: str) -> dict[str, str]:
+    """
+    Parse a flat TLV sequence.
+
+    Raises:
+        BRCodeError: If a field is truncated, not numeric or duplicated
+    """
+    fields: dict[str, str] = {}
+    position = 0
+    end = len(data)
+
+    while position < end:
+        header = data[position:position + 4]
+        if len(header) < 4 or not header.isdigit():
+            raise BRCodeError(f"Invalid field header at position {position}")
+
+        field_id, length = header[:2], int(header[2:])
+        value = data[position + 4:position + 4 + length]
+        if len(value) != length:
+            raise BRCodeError(f"Field {field_id} is truncated")
+        if field_id in fields:
+            raise BRCodeError(f"Field {field_id} is duplicated")
+
+        fields[field_id] = value
+        position += 4 + length
+
+    return fields
+
+
+def _crc_field(payload_without_crc: str) -> str:
+    """CRC field (``6304XXXX``) for a payload ending right before it."""
+    data = payload_without_crc + ID_CRC + "04"
+    return f"{ID_CRC}04{crc16(data.encode('utf-8')):04X}"
+
+
+def parse(payload: str) -> BRCode:
+    """
+    Parse and validate a PIX BR Code.
+
+    Args:
+        payload: Copy-and-paste PIX code
+
+    Returns:
+        Parsed code
+
+    Raises:
+        BRCodeError: If the payload is malformed, fails the CRC check or is
+            missing mandatory PIX fields
+    """
+    payload = payload.strip()
+    if len(payload) < 8 or payload[-8:-4] != ID_CRC + "04":
+        raise BRCodeError("Payload does not end with a CRC field")
+
+    expected = f"{crc16(payload[:-4].encode('utf-8')):04X}"
+    if payload[-4:].upper() != expected:
+        raise BRCodeError(f"CRC mismatch (expected {expected}, got {payload[-4:]})")
+
+    fields = _parse_tlv(payload)
+
+    if fields.get(ID_PAYLOAD_FORMAT) != "01":
+        raise BRCodeError("Payload format indicator must be 01")
+    if next(iter(fields)) != ID_PAYLOAD_FORMAT:
+        raise BRCodeError("Payload format indicator must be the first field")
+
+    merchant_account: dict[str, str] = {}
+    for field_id in sorted(TEMPLATE_IDS - {ID_ADDITIONAL_DATA}):
+        if field_id in fields:
+            nested = _parse_tlv(fields[field_id])
+            if nested.get(SUB_GUI, "").lower() == PIX_GUI:
+                merchant_account = nested
+                break
+
+    if not merchant_account:
+        raise BRCodeError("No PIX merchant account information (br.gov.bcb.pix)")
+    if SUB_KEY not in merchant_account and SUB_URL not in merchant_account:
+        raise BRCodeError("PIX merchant account has neither a key nor a URL")
+
+    if fields.get(ID_CURRENCY) != CURRENCY_BRL:
+        raise BRCodeError("Transaction currency must be 986 (BRL)")
+    if fields.get(ID_COUNTRY) != "BR":
+        raise BRCodeError("Country code must be BR")
+    for field_id in (ID_MERCHANT_CATEGORY, ID_MERCHANT_NAME, ID_MERCHANT_CITY):
+        if not fields.get(field_id):
+            raise BRCodeError(f"Mandatory field {field_id} is missing")
+
+    amount = fields.get(ID_AMOUNT)
+    if amount is not None:
+        try:
+            if Decimal(amount) <= 0:
+                raise BRCodeError("Transaction amount must be positive")
+        except InvalidOperation as e:
+            raise BRCodeError(f"Invalid transaction amount: {amount}") from e
+
+    additional_data = {}
+    if ID_ADDITIONAL_DATA in fields:
+        additional_data = _parse_tlv(fields[ID_ADDITIONAL_DATA])
+
+    return BRCode(
+        payload=payload,
+        fields=fields,
+        merchant_account=merchant_account,
+        additional_data=additional_data,
+    )
+
+
+def is_valid(payload: str) -> bool:
+    """Check a payload without raising."""
+    try:
+        parse(payload)
+        return True
+    except BRCodeError:
+        return False
+
+
+def _normalize_text(value: str, max_length: int) -> str:
+    """Strip accents and unsupported characters, then truncate."""
+    ascii_value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode()
+    ascii_value = re.sub(r"[^A-Za-z0-9 .\-]", "", ascii_value).strip()
+    return ascii_value[:max_length]
+
+
+def _format_amount(amount: float | Decimal) -> str:
+    """Format an amount with two decimals, as required by field 54."""
+    value = f"{Decimal(str(amount)).quantize(Decimal('0.01'))}"
+    if not _AMOUNT_PATTERN.match(value) or Decimal(value) <= 0:
+        raise BRCodeError(f"Invalid transaction amount: {amount}")
+    return value
+
+
+def build(
+    merchant_name: str,
+    merchant_city: str,
+    key: Optional[str] = None,
+    url: Optional[str] = None,
+    amount: Optional[float | Decimal] = None,
+    txid: str = "***",
+    description: Optional[str] = None,
+) -> str:
+    """
+    Build a PIX BR Code.
+
+    Pass ``key`` for a static code or ``url`` (payload location from a PSP,
+    without scheme) for a dynamic one.
+
+    Args:
+        merchant_name: Receiver name (normalized, max 25 characters)
+        merchant_city: Receiver city (normalized, max 15 characters)
+        key: PIX key (static codes)
+        url: Payload location (dynamic codes)
+        amount: Fixed amount (optional for static codes)
+        txid: Transaction ID, alphanumeric up to 25 chars or ``***``
+        description: Free text shown to the payer (static codes)
+
+    Returns:
+        Copy-and-paste PIX code
+
+    Raises:
+        BRCodeError: If the arguments cannot form a valid code
+    """
+    if bool(key) == bool(url):
+        raise BRCodeError("Provide exactly one of key (static) or url (dynamic)")
+    if not _TXID_PATTERN.match(txid):
+        raise BRCodeError(f"Invalid txid: {txid}")
+
+    name = _normalize_text(merchant_name, MAX_NAME_LENGTH)
+    city = _normalize_text(merchant_city, MAX_CITY_LENGTH)
+    if not name or not city:
+        raise BRCodeError("Merchant name and city are required")
+
+    account = _tlv(SUB_GUI, PIX_GUI)
+    if key:
+        account += _tlv(SUB_KEY, key)
+        if description:
+            account += _tlv(SUB_DESCRIPTION, _normalize_text(description, 72))
+    else:
+        account += _tlv(SUB_URL, url)
+
+    parts = [
+        _tlv(ID_PAYLOAD_FORMAT, "01"),
+        _tlv(ID_POINT_OF_INITIATION, DYNAMIC_INITIATION if url else STATIC_INITIATION),
+        _tlv(ID_MERCHANT_ACCOUNT_PIX, account),
+        _tlv(ID_MERCHANT_CATEGORY, "0000"),
+        _tlv(ID_CURRENCY, CURRENCY_BRL),
+    ]
+    if amount is not None:
+        parts.append(_tlv(ID_AMOUNT, _format_amount(amount)))
+    parts += [
+        _tlv(ID_COUNTRY, "BR"),
+        _tlv(ID_MERCHANT_NAME, name),
+        _tlv(ID_MERCHANT_CITY, city),
+        _tlv(ID_ADDITIONAL_DATA, _tlv(SUB_TXID, txid)),
+    ]
+
+    payload = "".join(parts)
+    return payload + _crc_field(payload)
+
+
+def make_txid(value: str) -> str:
+    """
+    Derive a valid txid (alphanumeric, max 25 characters) from any string.
+
+    Args:
+        value: Source value, e.g. a request ID
+
+    Returns:
+        txid
+    """
+    txid = re.sub(r"[^A-Za-z0-9]", "", value)[-MAX_TXID_LENGTH:]
+    return txid or "***"
@@ -0,0 +1,53 @@
+"""Raw request body helpers for endpoints that validate lazily."""
+import json
+from typing import Any, TypeVar
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+async def read_json_body(request: Request) -> Any:
+    """
+    Decode a JSON request body without model validation.
+
+    Args:
+        request: FastAPI request
+
+    Returns:
+        Decoded JSON value
+
+    Raises:
+        RequestValidationError: If the body is not valid JSON (422, as if
+            the body had been declared as a parameter)
+    """
+    try:
+        return json.loads(await request.body())
+    except ValueError as e:
+        raise RequestValidationError(
+            [{"type": "json_invalid", "loc": ("body",), "msg": str(e), "input": None}]
+        ) from e
+
+
+def validate_body(model: type[ModelT], payload: Any) -> ModelT:
+    """
+    Validate a decoded body against a model.
+
+    Args:
+        model: Pydantic model
+        payload: Decoded JSON value
+
+    Returns:
+        Model instance
+
+    Raises:
+        RequestValidationError: If validation fails (422)
+    """
+    try:
+        return model.model_validate(payload)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        ) from e
@@ -0,0 +1,37 @@
+"""QR code rendering.
+
+Pure functions only: they run inside worker processes, so they must be
+importable top-level callables with picklable arguments.
+"""
+import io
+
+
+def render_qr_png(data: str, box_size: int = 8, border: int = 2) -> bytes:
+    """
+    Render ``data`` as a black-on-white QR code PNG.
+
+    Uses the pure-Python PNG writer, so Pillow is not required.
+
+    Args:
+        data: Text to encode (e.g. a PIX copy-and-paste code)
+        box_size: Pixels per module
+        border: Quiet zone width in modules
+
+    Returns:
+        PNG bytes
+    """
+    import qrcode
+    from qrcode.image.pure import PyPNGImage
+
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_M,
+        box_size=box_size,
+        border=border,
+        image_factory=PyPNGImage,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    buffer = io.BytesIO()
+    qr.make_image().save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,24 @@
+"""Fixtures for tests that need the Postgres database (DB_* settings)."""
+from typing import Iterator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from src.core.database import SessionLocal
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    """Session on the configured database; skips when it is unreachable."""
+    session = SessionLocal()
+    try:
+        session.execute(text("SELECT 1"))
+    except OperationalError:
+        session.close()
+        pytest.skip("Postgres is not available")
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,124 @@
+"""Concurrent approval webhooks for the same payment are applied once."""
+import asyncio
+import threading
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.core.database import SessionLocal
+from src.models.client import Client
+from src.models.payment import Payment
+from src.services import webhook_processor as processor_module
+from src.services.summary_service import summary_service
+
+CONCURRENT_WEBHOOKS = 6
+
+
+@pytest.fixture
+def pending_payment(db: Session):
+    """A pending payment of a client in a condo used only by this test."""
+    suffix = uuid.uuid4().hex[:10]
+    client = Client(
+        name="Cliente Concorrência",
+        phone=f"5599{int(suffix, 16) % 10**9:09d}",
+        condo=f"Condo Teste {suffix}",
+        block="A",
+        apartment="1",
+    )
+    db.add(client)
+    db.flush()
+    payment = Payment(
+        request_id=f"req_test_{suffix}",
+        client_id=client.id,
+        month_ref=datetime.utcnow().strftime("%Y-%m"),
+        amount=Decimal("90.00"),
+        status="pending",
+        mp_payment_id=f"mp_test_{suffix}",
+        external_reference=f"ext_test_{suffix}",
+    )
+    db.add(payment)
+    db.flush()
+    summary_service.record_created(db, client.condo, payment)
+    db.commit()
+
+    yield payment
+
+    db.rollback()
+    db.execute(
+        text("DELETE FROM outbox WHERE payload->>'payment_id' = :id"),
+        {"id": str(payment.id)},
+    )
+    db.execute(text("DELETE FROM monthly_summaries WHERE condo = :condo"), {"condo": client.condo})
+    db.execute(text("DELETE FROM clients WHERE id = :id"), {"id": client.id})
+    db.commit()
+
+
+def test_concurrent_approvals_count_once(
+    db: Session,
+    pending_payment: Payment,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Every notification reads "pending" from Mercado Pago at the same time."""
+    # Plain values: the fixture's session must not be used from the threads
+    payment_id = pending_payment.id
+    mp_payment_id = pending_payment.mp_payment_id
+    condo = pending_payment.client.condo
+    month_ref = pending_payment.month_ref
+    db.rollback()
+
+    barrier = threading.Barrier(CONCURRENT_WEBHOOKS, timeout=30)
+
+    async def approved(payment_id: str, request_id: str | None = None) -> dict:
+        # Release all notifications into the database together
+        await asyncio.to_thread(barrier.wait)
+        return {"id": payment_id, "status": "approved", "status_detail": "accredited"}
+
+    monkeypatch.setattr(processor_module.mercadopago_service, "get_payment", approved)
+    processor = processor_module.WebhookProcessor()
+    errors: list[BaseException] = []
+
+    def notify(index: int) -> None:
+        session = SessionLocal()
+        try:
+            asyncio.run(
+                processor.process_payment_notification(
+                    db=session,
+                    mp_payment_id=mp_payment_id,
+                    notification_id=f"concurrent-{uuid.uuid4().hex}-{index}",
+                )
+            )
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=notify, args=(i,)) for i in range(CONCURRENT_WEBHOOKS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert errors == []
+    summary = db.execute(
+        text(
+            "SELECT paid_count, paid_amount, pending_count FROM monthly_summaries "
+            "WHERE condo = :condo AND month_ref = :month_ref"
+        ),
+        {"condo": condo, "month_ref": month_ref},
+    ).one()
+    assert summary.paid_count == 1
+    assert summary.paid_amount == Decimal("90.00")
+    assert summary.pending_count == 0
+
+    confirmations = db.execute(
+        text(
+            "SELECT count(*) FROM outbox WHERE kind = 'payment_confirmation' "
+            "AND payload->>'payment_id' = :id"
+        ),
+        {"id": str(payment_id)},
+    ).scalar_one()
+    assert confirmations == 1
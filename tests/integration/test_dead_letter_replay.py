@@ -0,0 +1,58 @@
+"""Replay leaves out the dead-letter kinds it is told to skip."""
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.services.dead_letters import dead_letters
+
+SOURCE = "test"
+
+
+@pytest.fixture
+def letters(db: Session):
+    """A message and a PIX generation dead letter of a test-only source."""
+    suffix = uuid.uuid4().hex[:10]
+    for kind in ("message", "generate_pix"):
+        dead_letters.record(SOURCE, f"{kind}-{suffix}", {"kind": kind}, "boom")
+    ids = dict(
+        db.execute(
+            text("SELECT payload->>'kind', id FROM dead_letters WHERE source = :source AND event_key LIKE :key"),
+            {"source": SOURCE, "key": f"%-{suffix}"},
+        ).all()
+    )
+
+    yield ids
+
+    db.execute(text("DELETE FROM dead_letters WHERE id = ANY(:ids)"), {"ids": list(ids.values())})
+    db.commit()
+
+
+def test_excluded_kinds_stay_pending(
+    db: Session,
+    letters: dict[str, int],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Only the PIX generation is replayed; the message is left pending."""
+    replayed: list[str] = []
+
+    async def handler(payload: dict) -> None:
+        replayed.append(payload["kind"])
+
+    monkeypatch.setitem(dead_letters.handlers, SOURCE, handler)
+
+    results = asyncio.run(
+        dead_letters.replay(SOURCE, list(letters.values()), exclude_kinds=("message",))
+    )
+
+    assert replayed == ["generate_pix"]
+    assert [result["id"] for result in results] == [letters["generate_pix"]]
+    statuses = dict(
+        db.execute(
+            text("SELECT id, status FROM dead_letters WHERE id = ANY(:ids)"),
+            {"ids": list(letters.values())},
+        ).all()
+    )
+    assert statuses == {letters["message"]: "pending", letters["generate_pix"]: "resolved"}
@@ -0,0 +1,94 @@
+"""Concurrent requests recording the same Mercado Pago charge insert it once."""
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.core.database import SessionLocal
+from src.models.client import Client
+from src.schemas.payment import PaymentCreate
+from src.services.payment_service import payment_service
+
+CONCURRENT_REQUESTS = 6
+
+
+@pytest.fixture
+def client(db: Session):
+    """A client in a condo used only by this test."""
+    suffix = uuid.uuid4().hex[:10]
+    client = Client(
+        name="Cliente Duplicidade",
+        phone=f"5598{int(suffix, 16) % 10**9:09d}",
+        condo=f"Condo Teste {suffix}",
+        block="A",
+        apartment="1",
+    )
+    db.add(client)
+    db.commit()
+
+    yield client
+
+    db.rollback()
+    db.execute(text("DELETE FROM monthly_summaries WHERE condo = :condo"), {"condo": client.condo})
+    db.execute(text("DELETE FROM clients WHERE id = :id"), {"id": client.id})
+    db.commit()
+
+
+def test_concurrent_charges_recorded_once(db: Session, client: Client) -> None:
+    """Every request got the same charge back from the idempotency key."""
+    # Plain values: the fixture's session must not be used from the threads
+    client_id = client.id
+    condo = client.condo
+    month_ref = datetime.utcnow().strftime("%Y-%m")
+    mp_payment_id = f"mp_test_{uuid.uuid4().hex[:10]}"
+    db.rollback()
+
+    barrier = threading.Barrier(CONCURRENT_REQUESTS, timeout=30)
+    results: list[tuple[int, bool]] = []
+    errors: list[BaseException] = []
+
+    def record(index: int) -> None:
+        session = SessionLocal()
+        try:
+            barrier.wait()
+            payment, created = payment_service.record_charge(
+                session,
+                PaymentCreate(
+                    client_id=client_id,
+                    month_ref=month_ref,
+                    amount=90.0,
+                    external_reference=f"ext_test_{mp_payment_id}",
+                ),
+                f"req_{mp_payment_id}_{index}",
+                mp_payment_id=mp_payment_id,
+                pix_code="000201",
+                pix_expires_at=datetime.now(timezone.utc) + timedelta(hours=24),
+            )
+            results.append((payment.id, created))
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=record, args=(i,)) for i in range(CONCURRENT_REQUESTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert errors == []
+    assert len(results) == CONCURRENT_REQUESTS
+    assert len({payment_id for payment_id, _ in results}) == 1
+    assert sum(created for _, created in results) == 1
+
+    pending = db.execute(
+        text(
+            "SELECT pending_count FROM monthly_summaries "
+            "WHERE condo = :condo AND month_ref = :month_ref"
+        ),
+        {"condo": condo, "month_ref": month_ref},
+    ).scalar_one()
+    assert pending == 1
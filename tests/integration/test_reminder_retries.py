@@ -0,0 +1,129 @@
+"""Failed reminders wait for their backoff; 429s slow the campaign down."""
+import asyncio
+import uuid
+from collections import Counter
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models.client import Client
+from src.services import reminder_campaign as campaign_module
+from src.services.reminder_campaign import ReminderCampaign
+
+MONTH_REF = "2019-05"
+
+
+@pytest.fixture
+def clients(db: Session):
+    """Three clients of a condo used only by this test, by outcome."""
+    suffix = uuid.uuid4().hex[:10]
+    condo = f"Condo Teste {suffix}"
+    created = {}
+    for index, outcome in enumerate(("sent", "error", "throttled")):
+        client = Client(
+            name=f"Cliente {outcome}",
+            phone=f"55970{index}{int(suffix, 16) % 10**7:07d}",
+            condo=condo,
+            block="A",
+            apartment=str(index),
+        )
+        db.add(client)
+        db.flush()
+        created[client.phone] = (client.id, outcome)
+    db.commit()
+
+    yield condo, created
+
+    db.rollback()
+    db.execute(text("DELETE FROM clients WHERE condo = :condo"), {"condo": condo})
+    db.commit()
+
+
+def http_error(status: int) -> httpx.HTTPStatusError:
+    """Error raised by raise_for_status for this status."""
+    request = httpx.Request("POST", "https://graph.facebook.com/messages")
+    response = httpx.Response(status, headers={"Retry-After": "0"}, request=request)
+    return httpx.HTTPStatusError(f"{status}", request=request, response=response)
+
+
+def make_campaign(batch_size: int) -> ReminderCampaign:
+    """Campaign without rate limit and with a long backoff."""
+    campaign = ReminderCampaign()
+    campaign.rate = 0
+    campaign.batch_size = batch_size
+    campaign.retry_base = 300.0
+    campaign.max_attempts = 3
+    return campaign
+
+
+def test_failures_are_not_retried_in_the_same_run(
+    db: Session,
+    clients: tuple[str, dict],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Each client is tried once; errors back off, 429s keep their attempt."""
+    condo, created = clients
+    calls: Counter[str] = Counter()
+
+    async def send(to: str, **kwargs) -> dict:
+        calls[to] += 1
+        outcome = created[to][1]
+        if outcome == "error":
+            raise http_error(500)
+        if outcome == "throttled":
+            raise http_error(429)
+        return {"messages": [{"id": f"wamid.{to}"}]}
+
+    monkeypatch.setattr(campaign_module.whatsapp_service, "send_template_message", send)
+
+    # One client per batch, so the run would reach failed rows again
+    totals = asyncio.run(make_campaign(batch_size=1).run(MONTH_REF, condo=condo))
+
+    assert set(calls.values()) == {1}
+    assert totals["sent"] == 1
+    assert totals["failed"] == 2
+    assert totals["throttled"] == 1
+
+    rows = db.execute(
+        text(
+            "SELECT c.phone, d.status, d.attempts, d.available_at > now() + interval '200 seconds' "
+            "FROM reminder_deliveries d JOIN clients c ON c.id = d.client_id "
+            "WHERE c.condo = :condo AND d.month_ref = :month_ref"
+        ),
+        {"condo": condo, "month_ref": MONTH_REF},
+    ).all()
+    by_outcome = {created[phone][1]: (status, attempts, delayed) for phone, status, attempts, delayed in rows}
+    assert by_outcome["sent"][:2] == ("sent", 1)
+    assert by_outcome["error"] == ("failed", 1, True)
+    assert by_outcome["throttled"] == ("failed", 0, True)
+
+
+def test_batch_rejected_with_429_stops_the_run(
+    db: Session,
+    clients: tuple[str, dict],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """When every send of a batch gets 429 no further batch is claimed."""
+    condo, _ = clients
+    calls: list[str] = []
+
+    async def send(to: str, **kwargs) -> dict:
+        calls.append(to)
+        raise http_error(429)
+
+    monkeypatch.setattr(campaign_module.whatsapp_service, "send_template_message", send)
+
+    totals = asyncio.run(make_campaign(batch_size=1).run(MONTH_REF, condo=condo))
+
+    assert len(calls) == 1
+    assert totals["throttled"] == 1
+    pending = db.execute(
+        text(
+            "SELECT count(*) FROM reminder_deliveries d JOIN clients c ON c.id = d.client_id "
+            "WHERE c.condo = :condo AND d.month_ref = :month_ref AND d.status = 'pending'"
+        ),
+        {"condo": condo, "month_ref": MONTH_REF},
+    ).scalar_one()
+    assert pending == 2
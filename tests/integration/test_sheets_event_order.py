@@ -0,0 +1,137 @@
+"""A sheet update processed before its row is appended is retried, not lost."""
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Callable
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models.outbox import OutboxEvent
+from src.services import pix_handler, webhook_processor  # noqa: F401 - register the sheets handlers
+from src.services.outbox import outbox_relay
+from src.services.sheets_service import sheets_service
+
+
+class FakeRequest:
+    """googleapiclient request stand-in; runs its action on execute()."""
+
+    def __init__(self, action: Callable[[], dict]) -> None:
+        self.action = action
+
+    def execute(self, **kwargs: Any) -> dict:
+        return self.action()
+
+
+class FakeValues:
+    """``spreadsheets().values()`` over an in-memory list of rows."""
+
+    def __init__(self, rows: list[list[Any]]) -> None:
+        self.rows = rows
+
+    def get(self, **kwargs: Any) -> FakeRequest:
+        return FakeRequest(lambda: {"values": [list(row) for row in self.rows]})
+
+    def append(self, body: dict, **kwargs: Any) -> FakeRequest:
+        return FakeRequest(lambda: self.rows.extend(list(row) for row in body["values"]) or {})
+
+    def batchUpdate(self, body: dict, **kwargs: Any) -> FakeRequest:  # noqa: N802 - API name
+        def update() -> dict:
+            for change in body["data"]:
+                cell = change["range"].split("!")[1]
+                column, row = ord(cell[0]) - ord("A"), int(cell[1:]) - 1
+                self.rows[row] += [""] * (column + 1 - len(self.rows[row]))
+                self.rows[row][column] = change["values"][0][0]
+            return {}
+
+        return FakeRequest(update)
+
+
+class FakeSheets:
+    """Just enough of the Sheets API for append and update by request_id."""
+
+    def __init__(self) -> None:
+        self.rows: list[list[Any]] = [["request_id"]]
+
+    def spreadsheets(self) -> "FakeSheets":
+        return self
+
+    def values(self) -> FakeValues:
+        return FakeValues(self.rows)
+
+
+@pytest.fixture
+def sheet(monkeypatch: pytest.MonkeyPatch) -> FakeSheets:
+    """In-memory sheet behind the global Sheets service."""
+    fake = FakeSheets()
+    monkeypatch.setattr(sheets_service, "_get_service", lambda: fake)
+    monkeypatch.setattr(sheets_service, "_execute", lambda request: request.execute())
+    return fake
+
+
+def process(db: Session, event: OutboxEvent) -> str:
+    """Run one event as a relay batch would and record its outcome."""
+    db.refresh(event)
+    attempts = event.attempts + 1
+    db.execute(text("UPDATE outbox SET attempts = :attempts WHERE id = :id"), {"attempts": attempts, "id": event.id})
+    db.commit()
+
+    outcome, error = asyncio.run(outbox_relay._handle(event.id, event.kind, event.payload))
+    if outcome == "succeeded":
+        outbox_relay._complete([event.id], [])
+    else:
+        outbox_relay._complete([], [(event.id, attempts, error or outcome)])
+    return outcome
+
+
+def test_update_before_append_is_retried(db: Session, sheet: FakeSheets) -> None:
+    """The update fails while the row is missing and applies after the append."""
+    request_id = f"req_test_{uuid.uuid4().hex[:10]}"
+    append = OutboxEvent(
+        kind="sheets_append",
+        payload={
+            "request_id": request_id,
+            "name": "Cliente Planilha",
+            "phone": "5511900000000",
+            "condo": "Condo Teste",
+            "block": "A",
+            "apartment": "1",
+            "month_ref": "2019-06",
+            "amount": 90.0,
+            "status": "pending",
+            "mp_payment_id": None,
+            "tracking_request_id": request_id,
+        },
+    )
+    update = OutboxEvent(
+        kind="sheets_update",
+        payload={
+            "request_id_value": request_id,
+            "status": "approved",
+            "paid_at": datetime(2019, 6, 10, 12, 30).isoformat(),
+            "tracking_request_id": request_id,
+        },
+    )
+    db.add_all([append, update])
+    db.commit()
+
+    try:
+        assert process(db, update) == "failed"
+        db.refresh(update)
+        assert update.status == "pending"
+        assert "not found" in update.last_error
+
+        assert process(db, append) == "succeeded"
+        assert process(db, update) == "succeeded"
+
+        db.refresh(update)
+        assert update.status == "done"
+        row = sheet.rows[1]
+        assert row[0] == request_id
+        assert row[8] == "approved"
+        assert row[10] == "2019-06-10 12:30:00"
+    finally:
+        db.rollback()
+        db.execute(text("DELETE FROM outbox WHERE id IN (:a, :u)"), {"a": append.id, "u": update.id})
+        db.commit()
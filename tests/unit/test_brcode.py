@@ -0,0 +1,187 @@
+"""Tests for PIX BR Code parsing, validation and generation."""
+from decimal import Decimal
+
+import pytest
+
+from src.services import pix_handler
+from src.utils import brcode
+from src.utils.brcode import BRCodeError
+
+# Example static code from the Banco Central BR Code manual
+SPEC_EXAMPLE = (
+    "00020126580014br.gov.bcb.pix0136123e4567-e12b-12d1-a456-426655440000"
+    "5204000053039865802BR5913Fulano de Tal6008BRASILIA62070503***63041D3D"
+)
+
+
+def with_crc(payload_without_crc: str) -> str:
+    """Append a correct CRC field, to test checks that come after it."""
+    return payload_without_crc + brcode._crc_field(payload_without_crc)
+
+
+def test_crc16_check_value() -> None:
+    """CRC-16/CCITT-FALSE check value for "123456789"."""
+    assert brcode.crc16(b"123456789") == 0x29B1
+
+
+def test_parse_spec_example() -> None:
+    """The manual's example parses with its key, name, city and txid."""
+    code = brcode.parse(SPEC_EXAMPLE)
+
+    assert code.key == "123e4567-e12b-12d1-a456-426655440000"
+    assert code.merchant_name == "Fulano de Tal"
+    assert code.merchant_city == "BRASILIA"
+    assert code.txid == "***"
+    assert code.amount is None
+    assert not code.is_dynamic
+
+
+def test_parse_accepts_lowercase_crc() -> None:
+    """The CRC is compared case-insensitively."""
+    assert brcode.is_valid(SPEC_EXAMPLE[:-4] + SPEC_EXAMPLE[-4:].lower())
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        SPEC_EXAMPLE[:-4] + "0000",
+        SPEC_EXAMPLE.replace("Fulano", "Ciclano"),
+        SPEC_EXAMPLE[:-8],
+        "",
+    ],
+    ids=["wrong-crc", "altered-field", "no-crc-field", "empty"],
+)
+def test_parse_rejects_bad_crc(payload: str) -> None:
+    """Codes whose CRC is missing or does not match are rejected."""
+    with pytest.raises(BRCodeError):
+        brcode.parse(payload)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        # Truncated field (length says 13, value has 5)
+        with_crc("000201" "5913Fulano"),
+        # Payload format indicator not first
+        with_crc("5802BR" "000201"),
+        # Not a PIX merchant account
+        with_crc(
+            "000201" "26180014br.gov.bcb.xyz" "52040000" "5303986"
+            "5802BR" "5906Fulano" "6008BRASILIA"
+        ),
+        # Wrong currency
+        with_crc(
+            "000201" "26220014br.gov.bcb.pix0100" "52040000" "5303840"
+            "5802BR" "5906Fulano" "6008BRASILIA"
+        ),
+        # Missing merchant name
+        with_crc(
+            "000201" "26240014br.gov.bcb.pix0102ab" "52040000" "5303986"
+            "5802BR" "6008BRASILIA"
+        ),
+        # Non-positive amount
+        with_crc(
+            "000201" "26240014br.gov.bcb.pix0102ab" "52040000" "5303986"
+            "54040.00" "5802BR" "5906Fulano" "6008BRASILIA"
+        ),
+    ],
+    ids=["truncated", "format-not-first", "not-pix", "currency", "no-name", "zero-amount"],
+)
+def test_parse_rejects_invalid_fields(payload: str) -> None:
+    """Codes with a valid CRC but invalid contents are rejected."""
+    with pytest.raises(BRCodeError):
+        brcode.parse(payload)
+
+
+def test_build_parse_round_trip_static() -> None:
+    """A built static code parses back to the same values."""
+    payload = brcode.build(
+        merchant_name="Condomínio São João",
+        merchant_city="São Paulo",
+        key="pagamentos@example.com",
+        amount=90,
+        txid=brcode.make_txid("req_2026_10_19_4b228d70"),
+        description="Mensalidade",
+    )
+    code = brcode.parse(payload)
+
+    assert code.key == "pagamentos@example.com"
+    assert code.amount == Decimal("90.00")
+    assert code.merchant_name == "Condominio Sao Joao"
+    assert code.merchant_city == "Sao Paulo"
+    assert code.txid == "req20261019" + "4b228d70"
+    assert code.fields[brcode.ID_POINT_OF_INITIATION] == brcode.STATIC_INITIATION
+    assert code.payload == payload
+
+
+def test_build_parse_round_trip_dynamic() -> None:
+    """A built dynamic code keeps its payload URL."""
+    code = brcode.parse(
+        brcode.build(
+            merchant_name="Fulano",
+            merchant_city="Brasilia",
+            url="pix.example.com/qr/v2/abc123",
+        )
+    )
+
+    assert code.is_dynamic
+    assert code.url == "pix.example.com/qr/v2/abc123"
+    assert code.fields[brcode.ID_POINT_OF_INITIATION] == brcode.DYNAMIC_INITIATION
+
+
+def test_build_truncates_name_and_city() -> None:
+    """Merchant name and city are cut to 25 and 15 characters."""
+    code = brcode.parse(
+        brcode.build(
+            merchant_name="Associação dos Moradores do Residencial Flores",
+            merchant_city="São José dos Campos",
+            key="chave",
+        )
+    )
+
+    assert len(code.merchant_name) == brcode.MAX_NAME_LENGTH
+    assert code.merchant_name == "Associacao dos Moradores "
+    assert code.merchant_city == "Sao Jose dos Ca"
+
+
+def test_make_txid_limits() -> None:
+    """txids keep only alphanumerics, at most 25, and never end up empty."""
+    assert brcode.make_txid("a-b_c" * 10) == ("abc" * 10)[-brcode.MAX_TXID_LENGTH:]
+    assert brcode.make_txid("---") == "***"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"merchant_name": "Fulano", "merchant_city": "Brasilia"},
+        {"merchant_name": "Fulano", "merchant_city": "Brasilia", "key": "k", "url": "u"},
+        {"merchant_name": "", "merchant_city": "Brasilia", "key": "chave"},
+        {"merchant_name": "Fulano", "merchant_city": "", "key": "chave"},
+        {"merchant_name": "Fulano", "merchant_city": "Brasilia", "key": "chave", "txid": "a" * 26},
+        {"merchant_name": "Fulano", "merchant_city": "Brasilia", "key": "chave", "txid": "a-b"},
+        {"merchant_name": "Fulano", "merchant_city": "Brasilia", "key": "chave", "amount": 0},
+        {"merchant_name": "Fulano", "merchant_city": "Brasilia", "key": "k" * 100},
+    ],
+    ids=[
+        "no-key-or-url", "key-and-url", "no-name", "no-city",
+        "txid-too-long", "txid-symbols", "zero-amount", "key-too-long",
+    ],
+)
+def test_build_rejects_invalid_arguments(kwargs: dict) -> None:
+    """Arguments that cannot form a valid code raise BRCodeError."""
+    with pytest.raises(BRCodeError):
+        brcode.build(**kwargs)
+
+
+def test_fallback_key_without_merchant_fails_at_startup(monkeypatch: pytest.MonkeyPatch) -> None:
+    """PIX_FALLBACK_KEY without merchant name/city stops the app."""
+    monkeypatch.setattr(pix_handler.settings, "pix_fallback_key", "pagamentos@example.com")
+    monkeypatch.setattr(pix_handler.settings, "pix_merchant_name", "")
+    monkeypatch.setattr(pix_handler.settings, "pix_merchant_city", "")
+
+    with pytest.raises(RuntimeError, match="PIX_MERCHANT_NAME"):
+        pix_handler.check_local_pix_config()
+
+    monkeypatch.setattr(pix_handler.settings, "pix_merchant_name", "Condominio Flores")
+    monkeypatch.setattr(pix_handler.settings, "pix_merchant_city", "Sao Paulo")
+    pix_handler.check_local_pix_config()
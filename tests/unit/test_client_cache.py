@@ -0,0 +1,27 @@
+"""Tests for the in-process client cache."""
+from src.models.client import Client
+from src.services.client_cache import ClientCache
+
+
+def make_client(phone: str) -> Client:
+    """Client with the given stored phone."""
+    return Client(id=1, name="Maria", phone=phone, condo="Flores", block="A", apartment="1")
+
+
+def test_hit_only_for_the_stored_spelling() -> None:
+    """Lookups match the database query: other spellings of the number miss."""
+    cache = ClientCache(max_size=10, ttl_seconds=60)
+    cache.put(make_client("5511988887777"))
+
+    assert cache.get("5511988887777")["id"] == 1
+    assert cache.get("+55 (11) 98888-7777") is None
+
+
+def test_invalidate_drops_the_stored_phone() -> None:
+    """Invalidating by the stored phone removes its entry."""
+    cache = ClientCache(max_size=10, ttl_seconds=60)
+    cache.put(make_client("5511988887777"))
+
+    cache.invalidate("5511988887777")
+
+    assert cache.get("5511988887777") is None
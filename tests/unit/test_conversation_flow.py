@@ -0,0 +1,188 @@
+"""Tests for the onboarding flow parser and the confirmation step."""
+import asyncio
+from typing import Optional
+
+import pytest
+
+from src.services import conversation_handler as handler_module
+from src.services.conversation_flow import onboarding_flow
+from src.services.conversation_handler import ConversationHandler
+
+NAME_ONLY = {"name": "João Silva"}
+UP_TO_CONDO = {"name": "João Silva", "condo": "Condomínio Flores"}
+
+
+@pytest.mark.parametrize(
+    ("text", "data", "step", "accepted", "rejected"),
+    [
+        # The request's example, answered at the first question
+        (
+            "João, Condo X, bloco B, apto 101, plano 2",
+            {},
+            "COLLECT_NAME",
+            {"name": "João", "condo": "Condo X", "block": "B", "apartment": "101", "plan": "2"},
+            set(),
+        ),
+        # Before the first question only labeled segments count
+        (
+            "João, Condo X, bloco B, apto 101, plano 2",
+            {},
+            None,
+            {"condo": "Condo X", "block": "B", "apartment": "101", "plan": "2"},
+            set(),
+        ),
+        ("Olá, meu nome é João Silva", {}, None, {"name": "João Silva"}, set()),
+        ("Oi, tudo bem?", {}, None, {}, set()),
+        # Unlabeled segments next to labeled ones are dropped
+        ("Nome: Maria Souza, 2", {}, "COLLECT_NAME", {"name": "Maria Souza"}, set()),
+        ("Olá, meu nome é João Silva", {}, "COLLECT_NAME", {"name": "João Silva"}, set()),
+        (
+            "Residencial Flores, Jardim América",
+            NAME_ONLY,
+            "COLLECT_CONDO",
+            {"condo": "Residencial Flores"},
+            set(),
+        ),
+        # Fewer segments than missing fields and no label: one answer, as typed
+        ("Silva, João Pedro", {}, "COLLECT_NAME", {"name": "Silva, João Pedro"}, set()),
+        (
+            "Jardim América, Quadra 3",
+            NAME_ONLY,
+            "COLLECT_CONDO",
+            {"condo": "Jardim América, Quadra 3"},
+            set(),
+        ),
+        ("  Maria  ", {}, "COLLECT_NAME", {"name": "Maria"}, set()),
+        # One segment per missing field, in order
+        (
+            "B, 101, 3",
+            UP_TO_CONDO,
+            "COLLECT_BLOCK",
+            {"block": "B", "apartment": "101", "plan": "3"},
+            set(),
+        ),
+        (
+            "Torre 2; ap 31\n1",
+            UP_TO_CONDO,
+            "COLLECT_BLOCK",
+            {"block": "2", "apartment": "31", "plan": "1"},
+            set(),
+        ),
+        # A label out of place makes it a labeled message
+        ("apto 101, B, 3", UP_TO_CONDO, "COLLECT_BLOCK", {"apartment": "101"}, set()),
+        # Invalid answers are reported
+        ("Jo", {}, "COLLECT_NAME", {}, {"name"}),
+        ("plano 5", UP_TO_CONDO, "COLLECT_BLOCK", {}, {"plan"}),
+        ("B, 101, 7", UP_TO_CONDO, "COLLECT_BLOCK", {"block": "B", "apartment": "101"}, {"plan"}),
+        ("", {}, "COLLECT_NAME", {}, {"name"}),
+    ],
+)
+def test_parse(
+    text: str,
+    data: dict,
+    step: Optional[str],
+    accepted: dict,
+    rejected: set,
+) -> None:
+    """Answers found in a message, by the step being asked."""
+    current = onboarding_flow.step(step) if step else None
+
+    assert onboarding_flow.parse(text, data, current) == (accepted, rejected)
+
+
+def test_next_step_is_first_missing_field() -> None:
+    """Filled fields are skipped; None once everything is filled."""
+    assert onboarding_flow.next_step({}).name == "COLLECT_NAME"
+    assert onboarding_flow.next_step({**NAME_ONLY, "block": "B"}).name == "COLLECT_CONDO"
+    full = {**UP_TO_CONDO, "block": "B", "apartment": "101", "plan": "2"}
+    assert onboarding_flow.next_step(full) is None
+
+
+@pytest.fixture
+def sent(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Texts the handler sends, instead of calling WhatsApp."""
+    messages: list[str] = []
+
+    async def send_text_message(phone: str, text: str, request_id: Optional[str] = None) -> dict:
+        messages.append(text)
+        return {}
+
+    async def mark_message_as_read(message_id: str, request_id: Optional[str] = None) -> dict:
+        return {}
+
+    monkeypatch.setattr(handler_module.whatsapp_service, "send_text_message", send_text_message)
+    monkeypatch.setattr(handler_module.whatsapp_service, "mark_message_as_read", mark_message_as_read)
+    monkeypatch.setattr(handler_module, "conversation_states", {})
+    return messages
+
+
+def converse(handler: ConversationHandler, *texts: str) -> list[dict]:
+    """Send messages from one phone and return the handler's results."""
+
+    async def run() -> list[dict]:
+        return [
+            await handler.handle_message("5511988887777", text, f"wamid.{index}")
+            for index, text in enumerate(texts)
+        ]
+
+    return asyncio.run(run())
+
+
+def test_pix_is_generated_only_after_confirmation(sent: list[str]) -> None:
+    """All fields in one message are echoed back; "sim" generates the PIX."""
+    results = converse(
+        ConversationHandler(),
+        "Oi",
+        "João Silva, Condomínio Flores, bloco B, apto 101, plano 2",
+        "Sim",
+    )
+
+    assert [result["action"] for result in results] == ["collect_name", "confirm_data", "generate_pix"]
+    assert "Nome: João Silva" in sent[1]
+    assert "Condomínio: Condomínio Flores" in sent[1]
+    assert "Plano: 2 (R$ 90.00)" in sent[1]
+    assert results[2]["data"] == {
+        "phone": "5511988887777",
+        "name": "João Silva",
+        "condo": "Condomínio Flores",
+        "block": "B",
+        "apartment": "101",
+        "plan": "2",
+        "amount": 90.0,
+    }
+
+
+def test_confirmation_accepts_corrections_and_restart(sent: list[str]) -> None:
+    """Labeled answers correct a field; "não" starts the questions over."""
+    handler = ConversationHandler()
+    results = converse(
+        handler,
+        "Oi",
+        "João Silva, Condomínio Flores, bloco B, apto 101, plano 2",
+        "bloco C",
+        "talvez",
+        "Não",
+    )
+
+    assert [result["action"] for result in results] == [
+        "collect_name", "confirm_data", "confirm_data", "confirm_data", "collect_name",
+    ]
+    assert "Bloco/torre: C" in sent[2]
+    assert handler.get_state("5511988887777").data == {}
+
+
+def test_one_answer_per_message_generates_pix_directly(sent: list[str]) -> None:
+    """Answering the questions one by one needs no confirmation."""
+    results = converse(
+        ConversationHandler(),
+        "Oi",
+        "João Silva",
+        "Condomínio Flores",
+        "B",
+        "101",
+        "2",
+    )
+
+    assert [result["action"] for result in results][-1] == "generate_pix"
+    assert "confirm_data" not in [result["action"] for result in results]
+    assert results[-1]["data"]["amount"] == 90.0
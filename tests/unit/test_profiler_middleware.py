@@ -0,0 +1,56 @@
+"""Tests for the on-demand request profiler middleware."""
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.config import settings
+from src.core.middleware import ProfilerMiddleware, RequestIDMiddleware
+
+
+@pytest.fixture
+def client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    """App with a single route behind the request ID and profiler middleware."""
+    monkeypatch.setattr(settings, "admin_secret", "s3cret")
+    monkeypatch.setattr(settings, "profiling_output_dir", str(tmp_path / "profiles"))
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    app.add_middleware(ProfilerMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+    return TestClient(app)
+
+
+def test_non_ascii_secret_is_rejected_without_error(client: TestClient) -> None:
+    """A non-ASCII header value is just a wrong secret, not a server error."""
+    response = client.get("/ping", headers={"X-Profile-Secret": "sêcret".encode()})
+
+    assert response.status_code == 200
+    assert "X-Profile-File" not in response.headers
+
+
+def test_wrong_secret_is_not_profiled(client: TestClient) -> None:
+    """Requests with the wrong secret run without the profiler."""
+    response = client.get("/ping", headers={"X-Profile-Secret": "wrong"})
+
+    assert response.status_code == 200
+    assert "X-Profile-File" not in response.headers
+
+
+def test_profile_stays_in_output_dir(client: TestClient, tmp_path: Path) -> None:
+    """A client-supplied request ID cannot move the profile out of its directory."""
+    response = client.get(
+        "/ping",
+        headers={"X-Profile-Secret": "s3cret", "X-Request-ID": "../../escape"},
+    )
+
+    assert response.status_code == 200
+    name = response.headers["X-Profile-File"]
+    assert name == "______escape.collapsed"
+    assert (tmp_path / "profiles" / name).is_file()
+    assert not (tmp_path / "escape.collapsed").exists()
@@ -0,0 +1,87 @@
+"""Tests for webhook traffic recording."""
+import json
+import time
+from pathlib import Path
+
+from src.core import recording
+from src.core.recording import PhoneAnonymizer, TrafficRecorder, read_recording
+
+PHONE = "5511987654321"
+
+
+def whatsapp_message(text: str) -> dict:
+    """WhatsApp webhook body with one text message from PHONE."""
+    return {
+        "entry": [
+            {
+                "changes": [
+                    {
+                        "value": {
+                            "contacts": [{"wa_id": PHONE}],
+                            "messages": [
+                                {
+                                    "from": PHONE,
+                                    "id": "wamid.HBgNNTUxMTk4NzY1NDMyMRUCABIYFjNFQjA",
+                                    "timestamp": "1760850000",
+                                    "text": {"body": text},
+                                }
+                            ],
+                        }
+                    }
+                ]
+            }
+        ]
+    }
+
+
+def test_phones_in_message_text_are_replaced() -> None:
+    """A phone typed in text.body gets the same pseudonym as the sender."""
+    anonymizer = PhoneAnonymizer("salt")
+    body = anonymizer.payload(whatsapp_message(f"Meu outro número é {PHONE}, obrigado"))
+
+    message = body["entry"][0]["changes"][0]["value"]["messages"][0]
+    pseudonym = anonymizer.phone(PHONE)
+    assert PHONE not in json.dumps(body)
+    assert message["from"] == pseudonym
+    assert message["text"]["body"] == f"Meu outro número é {pseudonym}, obrigado"
+
+
+def test_ids_and_timestamps_are_kept() -> None:
+    """Digit runs in identifier and time fields are not taken for phones."""
+    anonymizer = PhoneAnonymizer("salt")
+    notification = {"action": "payment.updated", "data": {"id": "12345678901"}, "user_id": "1234567890"}
+
+    assert anonymizer.payload(notification) == notification
+    message = anonymizer.payload(whatsapp_message("oi"))["entry"][0]["changes"][0]["value"]["messages"][0]
+    assert message["timestamp"] == "1760850000"
+
+
+def test_records_are_written_off_the_caller(tmp_path: Path, monkeypatch) -> None:
+    """record() only queues; the writer flushes within the interval and on close."""
+    monkeypatch.setattr(recording, "FLUSH_INTERVAL_SECONDS", 0.05)
+    recorder = TrafficRecorder(str(tmp_path), "salt")
+    body = json.dumps(whatsapp_message(f"ligue {PHONE}")).encode()
+
+    for index in range(3):
+        recorder.record(1000.0 + index, 0.5, "POST", "/webhooks/whatsapp/", 200, body)
+
+    deadline = time.monotonic() + 5
+    while recorder.path is None or len(read_recording(recorder.path)) < 3:
+        assert time.monotonic() < deadline, "records were not flushed"
+        time.sleep(0.02)
+
+    recorder.record(1003.0, 0.5, "POST", "/webhooks/mercadopago/", None, b"not json")
+    recorder.close()
+
+    records = read_recording(recorder.path)
+    assert [record["ts"] for record in records] == [1000.0, 1001.0, 1002.0, 1003.0]
+    assert PHONE not in json.dumps(records)
+    assert records[-1] == {
+        "ts": 1003.0,
+        "gap": 0.5,
+        "method": "POST",
+        "path": "/webhooks/mercadopago/",
+        "status": None,
+        "json": False,
+        "body": "not json",
+    }